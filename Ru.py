@@ -1,575 +1,135 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from datetime import datetime, timedelta
+import zlib
+import argparse
+import contextlib
+import json
+import os
+import time
 import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from result_cache import ResultCache, source_version
+from bank_registry import BankRegistry, load_registry
+from banking_events import EventTable, load_events
+from financial_kernel import FLOW_COLUMNS, PERIODS_PER_YEAR, horizon_kernel
+from rendering import RenderOptions, render_figures
+import instrumentation
+from instrumentation import span, traced
 warnings.filterwarnings('ignore')
 
+# matplotlib et pyarrow ne sont importés que par les chemins de code qui en
+# ont besoin : une exécution sans graphiques démarre sans eux
+
+# Version du code, incluse dans les clés du cache de résultats : le script et
+# les modules qui produisent les valeurs mises en cache
+CODE_VERSION = source_version(__file__, *(os.path.join(os.path.dirname(os.path.abspath(__file__)), module)
+                                         for module in ('bank_registry.py', 'banking_events.py', 'financial_kernel.py')))
+
 class ReunionBankFinanceAnalyzer:
-    def __init__(self, bank_name):
-        self.bank = bank_name
+    def __init__(self, bank_name, seed=None, cache=None, registry=None, events=None, freq='Y'):
+        # Registre des banques (data/banks.json) : les alias sont ramenés au nom canonique
+        self.registry = registry or load_registry()
+        self.bank = self.registry.resolve(bank_name) or bank_name
+        # Scénario d'événements économiques (data/evenements_reunion.csv par défaut)
+        self.events = events or load_events()
         self.colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#F9A602', '#6A0572', 
                       '#AB83A1', '#5CAB7D', '#2A9D8F', '#E76F51', '#264653']
         
         self.start_year = 2002
         self.end_year = 2025
         
+        # Fréquence des données : annuelle (Y), trimestrielle (Q) ou mensuelle (M)
+        if freq not in PERIODS_PER_YEAR:
+            raise ValueError(f"Fréquence non prise en charge: {freq} (Y, Q ou M)")
+        self.freq = freq
+        
         # Configuration spécifique à chaque banque réunionnaise
         self.config = self._get_bank_config()
         
+        # Graine maîtresse (None = flux global np.random) et cache de résultats optionnel
+        self.seed = seed
+        self.cache = cache
+        self.rng = self._make_rng()
+    
+    def _make_rng(self):
+        """Générateur de la banque, dérivé de la graine maîtresse et du nom de la banque"""
+        if self.seed is None:
+            return np.random
+        spawn_key = (zlib.crc32(self.bank.encode('utf-8')),)
+        return np.random.default_rng(np.random.SeedSequence(self.seed, spawn_key=spawn_key))
+        
     def _get_bank_config(self):
-        """Retourne la configuration spécifique pour chaque banque réunionnaise"""
-        configs = {
-            "Crédit Agricole de la Réunion": {
-                "assets_base": 8500,
-                "revenue_base": 450,
-                "type": "cooperative",
-                "specialites": ["agriculture", "pmie", "particuliers", "immobilier"],
-                "marche": ["local", "regional"]
-            },
-            "Banque de la Réunion": {
-                "assets_base": 4200,
-                "revenue_base": 280,
-                "type": "commerciale",
-                "specialites": ["entreprises", "professionnels", "credit_bail"],
-                "marche": ["local", "dom"]
-            },
-            "Société Générale Réunion": {
-                "assets_base": 6800,
-                "revenue_base": 380,
-                "type": "commerciale",
-                "specialites": ["grands_comptes", "banque_privee", "international"],
-                "marche": ["local", "national", "international"]
-            },
-            "BNP Paribas Réunion": {
-                "assets_base": 7200,
-                "revenue_base": 410,
-                "type": "commerciale",
-                "specialites": ["corporates", "banque_investissement", "marches"],
-                "marche": ["local", "national", "international"]
-            },
-            "Caisse d'Epargne Réunion": {
-                "assets_base": 3500,
-                "revenue_base": 220,
-                "type": "mutualiste",
-                "specialites": ["epargne", "habitat", "social"],
-                "marche": ["local", "regional"]
-            },
-            "Banque Française Commerciale Océan Indien": {
-                "assets_base": 2800,
-                "revenue_base": 180,
-                "type": "commerciale",
-                "specialites": ["commerce", "tourisme", "professions_liberales"],
-                "marche": ["regional", "ocean_indien"]
-            },
-            # Configuration par défaut pour les autres banques
-            "default": {
-                "assets_base": 1500,
-                "revenue_base": 120,
-                "type": "commerciale",
-                "specialites": ["particuliers", "petites_entreprises"],
-                "marche": ["local"]
-            }
-        }
-        
-        return configs.get(self.bank, configs["default"])
+        """Retourne la configuration spécifique de la banque (registre, ou configuration par défaut)"""
+        return self.registry.finance_config(self.bank)
     
     def generate_financial_data(self):
         """Génère des données financières pour la banque"""
+        # Sans graine les données ne sont pas reproductibles : pas de cache
+        if self.cache is None or self.seed is None:
+            return self._generate_financial_data()
+        
+        key = self.cache.key(self.bank, 'financials', self.start_year, self.end_year,
+                             {'freq': self.freq, 'events': self.events.version,
+                              'registry': self.registry.version}, self.seed, CODE_VERSION)
+        return self.cache.get_or_compute(key, self._generate_financial_data)
+    
+    @traced('financials.generate')
+    def _generate_financial_data(self):
+        """Simule la série complète (à la fréquence self.freq) à partir d'un générateur réinitialisé"""
         print(f"🏦 Génération des données financières pour {self.bank}...")
+        self.rng = self._make_rng()
         
         # Créer une base de données annuelle
-        dates = pd.date_range(start=f'{self.start_year}-01-01', 
-                             end=f'{self.end_year}-12-31', freq='Y')
-        
-        data = {'Annee': [date.year for date in dates]}
-        
-        # Données de base de la banque
-        data['Total_Actifs'] = self._simulate_total_assets(dates)
-        data['Fonds_Propres'] = self._simulate_equity(dates)
-        data['Depots_Clients'] = self._simulate_customer_deposits(dates)
-        data['Credits_Clients'] = self._simulate_customer_loans(dates)
-        
-        # Compte de résultat
-        data['Produit_Net_Bancaire'] = self._simulate_net_banking_income(dates)
-        data['Resultat_Net'] = self._simulate_net_income(dates)
-        data['Charges_Exploitation'] = self._simulate_operating_costs(dates)
-        data['Dotations_Provisions'] = self._simulate_provisions(dates)
-        data['Impots'] = self._simulate_taxes(dates)
-        
-        # Indicateurs de rentabilité
-        data['ROE'] = self._simulate_roe(dates)
-        data['ROA'] = self._simulate_roa(dates)
-        data['Marge_Interet'] = self._simulate_interest_margin(dates)
-        data['Cout_Risque'] = self._simulate_cost_of_risk(dates)
-        
-        # Indicateurs de solidité
-        data['Ratio_CET1'] = self._simulate_cet1_ratio(dates)
-        data['Ratio_Liquidite'] = self._simulate_liquidity_ratio(dates)
-        data['Ratio_Solvabilite'] = self._simulate_solvency_ratio(dates)
-        data['Creances_Douteuses'] = self._simulate_npl(dates)
-        
-        # Répartition du crédit par secteur (spécifique à la Réunion)
-        data['Credits_Particuliers'] = self._simulate_retail_loans(dates)
-        data['Credits_Entreprises'] = self._simulate_corporate_loans(dates)
-        data['Credits_Immobilier'] = self._simulate_real_estate_loans(dates)
-        data['Credits_Agriculture'] = self._simulate_agriculture_loans(dates)
-        data['Credits_Tourisme'] = self._simulate_tourism_loans(dates)
-        data['Credits_Commerce'] = self._simulate_commerce_loans(dates)
-        data['Credits_EC'] = self._simulate_energy_climate_loans(dates)
-        
-        df = pd.DataFrame(data)
+        years = np.arange(self.start_year, self.end_year + 1)
+        
+        # Tous les indicateurs d'un coup : bruit (année × indicateur) en un seul tirage,
+        # croissances et régimes (crises, fiscalité, réglementation) en matrices
+        with span('financials.kernel'):
+            kernel = horizon_kernel(self.start_year, self.end_year)
+            scale, growth = kernel.parameters(self.config)
+            values = kernel.simulate(scale, growth, kernel.noise(self.rng))
         
         # Ajouter des tendances spécifiques au secteur bancaire réunionnais
-        self._add_banking_trends(df)
+        values = self._add_banking_trends(years, values, kernel.columns)
+        
+        # Sous-périodes : les flux se somment au total annuel, encours et ratios finissent l'année à la valeur annuelle
+        periods = PERIODS_PER_YEAR[self.freq]
+        if periods == 1:
+            df = pd.DataFrame(values, columns=list(kernel.columns))
+            df.insert(0, 'Annee', years)
+        else:
+            with span('financials.disaggregate', freq=self.freq):
+                noise = self.rng.standard_normal((len(years), periods, len(kernel.columns)))
+                values = kernel.disaggregate(values, growth, noise).reshape(-1, len(kernel.columns))
+            df = pd.DataFrame(values, columns=list(kernel.columns))
+            df.insert(0, 'Annee', np.repeat(years, periods))
+            df.insert(0, 'Date', kernel.period_ends(periods))
+        instrumentation.count('financial_rows', len(df))
         
         return df
     
-    def _simulate_total_assets(self, dates):
-        """Simule le total des actifs de la banque"""
-        base_assets = self.config["assets_base"]
-        
-        assets = []
-        for i, date in enumerate(dates):
-            # Croissance variable selon le type de banque
-            if self.config["type"] == "cooperative":
-                growth_rate = 0.065  # Croissance forte pour les banques coopératives
-            elif self.config["type"] == "mutualiste":
-                growth_rate = 0.055
-            else:
-                growth_rate = 0.048  # Croissance pour les banques commerciales
-                
-            growth = 1 + growth_rate * i
-            noise = np.random.normal(1, 0.06)
-            assets.append(base_assets * growth * noise)
-        
-        return assets
-    
-    def _simulate_equity(self, dates):
-        """Simule les fonds propres"""
-        base_equity = self.config["assets_base"] * 0.085  # Ratio fonds propres/actifs
-        
-        equity = []
-        for i, date in enumerate(dates):
-            growth = 1 + 0.052 * i
-            noise = np.random.normal(1, 0.05)
-            equity.append(base_equity * growth * noise)
-        
-        return equity
-    
-    def _simulate_customer_deposits(self, dates):
-        """Simule les dépôts clients"""
-        base_deposits = self.config["assets_base"] * 0.65  # Part des dépôts dans les ressources
-        
-        deposits = []
-        for i, date in enumerate(dates):
-            growth = 1 + 0.045 * i
-            noise = np.random.normal(1, 0.04)
-            deposits.append(base_deposits * growth * noise)
-        
-        return deposits
-    
-    def _simulate_customer_loans(self, dates):
-        """Simule les crédits clients"""
-        base_loans = self.config["assets_base"] * 0.58  # Part des crédits dans les emplois
-        
-        loans = []
-        for i, date in enumerate(dates):
-            growth = 1 + 0.055 * i
-            noise = np.random.normal(1, 0.07)
-            loans.append(base_loans * growth * noise)
-        
-        return loans
-    
-    def _simulate_net_banking_income(self, dates):
-        """Simule le produit net bancaire"""
-        base_pnb = self.config["revenue_base"]
-        
-        pnb = []
-        for i, date in enumerate(dates):
-            if self.config["type"] == "cooperative":
-                growth_rate = 0.058
-            elif self.config["type"] == "mutualiste":
-                growth_rate = 0.052
-            else:
-                growth_rate = 0.048
-                
-            growth = 1 + growth_rate * i
-            noise = np.random.normal(1, 0.08)
-            pnb.append(base_pnb * growth * noise)
-        
-        return pnb
-    
-    def _simulate_net_income(self, dates):
-        """Simule le résultat net"""
-        base_income = self.config["revenue_base"] * 0.22  # Marge nette
-        
-        income = []
-        for i, date in enumerate(dates):
-            year = date.year
-            # Impact des crises sur la rentabilité
-            if year in [2008, 2009, 2020, 2021]:
-                crisis_multiplier = 0.75
-            else:
-                crisis_multiplier = 1.0
-                
-            growth = 1 + 0.045 * i
-            noise = np.random.normal(1, 0.12)
-            income.append(base_income * growth * crisis_multiplier * noise)
-        
-        return income
-    
-    def _simulate_operating_costs(self, dates):
-        """Simule les charges d'exploitation"""
-        base_costs = self.config["revenue_base"] * 0.62  # Ratio de charge
-        
-        costs = []
-        for i, date in enumerate(dates):
-            growth = 1 + 0.042 * i
-            noise = np.random.normal(1, 0.05)
-            costs.append(base_costs * growth * noise)
-        
-        return costs
-    
-    def _simulate_provisions(self, dates):
-        """Simule les dotations aux provisions"""
-        base_provisions = self.config["revenue_base"] * 0.08
-        
-        provisions = []
-        for i, date in enumerate(dates):
-            year = date.year
-            # Augmentation des provisions en période de crise
-            if year in [2008, 2009, 2020, 2021]:
-                crisis_multiplier = 1.8
-            else:
-                crisis_multiplier = 1.0
-                
-            growth = 1 + 0.035 * i
-            noise = np.random.normal(1, 0.20)
-            provisions.append(base_provisions * growth * crisis_multiplier * noise)
-        
-        return provisions
-    
-    def _simulate_taxes(self, dates):
-        """Simule les impôts"""
-        base_taxes = self.config["revenue_base"] * 0.05
-        
-        taxes = []
-        for i, date in enumerate(dates):
-            year = date.year
-            # Évolutions fiscales
-            if year >= 2018:
-                tax_rate = 1.15  # Hausse de la fiscalité
-            else:
-                tax_rate = 1.0
-                
-            growth = 1 + 0.04 * i
-            noise = np.random.normal(1, 0.10)
-            taxes.append(base_taxes * growth * tax_rate * noise)
-        
-        return taxes
-    
-    def _simulate_roe(self, dates):
-        """Simule le Return on Equity"""
-        roe_values = []
-        for i, date in enumerate(dates):
-            base_roe = 0.125  # ROE de base
-            
-            year = date.year
-            if year in [2008, 2009, 2020, 2021]:
-                crisis_impact = 0.65  # Baisse forte en crise
-            else:
-                crisis_impact = 1.0
-            
-            improvement = 1 + 0.002 * i  # Amélioration lente
-            noise = np.random.normal(1, 0.08)
-            roe_values.append(base_roe * crisis_impact * improvement * noise)
-        
-        return roe_values
-    
-    def _simulate_roa(self, dates):
-        """Simule le Return on Assets"""
-        roa_values = []
-        for i, date in enumerate(dates):
-            base_roa = 0.0085  # ROA de base
-            
-            year = date.year
-            if year in [2008, 2009, 2020, 2021]:
-                crisis_impact = 0.60
-            else:
-                crisis_impact = 1.0
-            
-            improvement = 1 + 0.0015 * i
-            noise = np.random.normal(1, 0.07)
-            roa_values.append(base_roa * crisis_impact * improvement * noise)
-        
-        return roa_values
-    
-    def _simulate_interest_margin(self, dates):
-        """Simule la marge d'intérêt nette"""
-        margins = []
-        for i, date in enumerate(dates):
-            base_margin = 0.018  # Marge de base
-            
-            year = date.year
-            if year >= 2015:
-                compression = 0.92  # Compression des marges due aux taux bas
-            else:
-                compression = 1.0
-            
-            noise = np.random.normal(1, 0.05)
-            margins.append(base_margin * compression * noise)
-        
-        return margins
-    
-    def _simulate_cost_of_risk(self, dates):
-        """Simule le coût du risque"""
-        costs = []
-        for i, date in enumerate(dates):
-            base_cost = 0.0040  # Coût de base
-            
-            year = date.year
-            if year in [2008, 2009, 2020, 2021]:
-                crisis_multiplier = 2.5  # Forte hausse en crise
-            else:
-                crisis_multiplier = 1.0
-            
-            noise = np.random.normal(1, 0.15)
-            costs.append(base_cost * crisis_multiplier * noise)
-        
-        return costs
-    
-    def _simulate_cet1_ratio(self, dates):
-        """Simule le ratio CET1"""
-        ratios = []
-        for i, date in enumerate(dates):
-            base_ratio = 0.125  # Ratio de base
-            
-            year = date.year
-            if year >= 2014:
-                regulatory_impact = 1.12  # Renforcement réglementaire
-            else:
-                regulatory_impact = 1.0
-            
-            improvement = 1 + 0.008 * i
-            noise = np.random.normal(1, 0.04)
-            ratios.append(base_ratio * regulatory_impact * improvement * noise)
-        
-        return ratios
-    
-    def _simulate_liquidity_ratio(self, dates):
-        """Simule le ratio de liquidité"""
-        ratios = []
-        for i, date in enumerate(dates):
-            base_ratio = 1.15  # Ratio LCR de base
-            
-            year = date.year
-            if year >= 2015:
-                regulatory_impact = 1.08  # Renforcement Bâle III
-            else:
-                regulatory_impact = 1.0
-            
-            noise = np.random.normal(1, 0.03)
-            ratios.append(base_ratio * regulatory_impact * noise)
-        
-        return ratios
-    
-    def _simulate_solvency_ratio(self, dates):
-        """Simule le ratio de solvabilité"""
-        ratios = []
-        for i, date in enumerate(dates):
-            base_ratio = 0.145  # Ratio de base
-            
-            year = date.year
-            if year >= 2014:
-                regulatory_impact = 1.10
-            else:
-                regulatory_impact = 1.0
-            
-            improvement = 1 + 0.006 * i
-            noise = np.random.normal(1, 0.04)
-            ratios.append(base_ratio * regulatory_impact * improvement * noise)
-        
-        return ratios
-    
-    def _simulate_npl(self, dates):
-        """Simule les créances douteuses"""
-        npl_values = []
-        for i, date in enumerate(dates):
-            base_npl = 0.032  # Taux de base
-            
-            year = date.year
-            if year in [2008, 2009, 2020, 2021]:
-                crisis_multiplier = 1.9  # Forte hausse en crise
-            else:
-                crisis_multiplier = 1.0
-            
-            improvement = 1 - 0.005 * i  # Amélioration progressive
-            noise = np.random.normal(1, 0.12)
-            npl_values.append(base_npl * crisis_multiplier * improvement * noise)
-        
-        return npl_values
-    
-    def _simulate_retail_loans(self, dates):
-        """Simule les crédits aux particuliers"""
-        base_loans = self.config["assets_base"] * 0.25
-        
-        # Ajustement selon les spécialités
-        multiplier = 1.4 if "particuliers" in self.config["specialites"] else 0.8
-        
-        loans = []
-        for i, date in enumerate(dates):
-            growth = 1 + 0.05 * i
-            noise = np.random.normal(1, 0.08)
-            loans.append(base_loans * growth * multiplier * noise)
-        
-        return loans
-    
-    def _simulate_corporate_loans(self, dates):
-        """Simule les crédits aux entreprises"""
-        base_loans = self.config["assets_base"] * 0.20
-        
-        multiplier = 1.5 if "entreprises" in self.config["specialites"] else 0.9
-        
-        loans = []
-        for i, date in enumerate(dates):
-            growth = 1 + 0.048 * i
-            noise = np.random.normal(1, 0.10)
-            loans.append(base_loans * growth * multiplier * noise)
-        
-        return loans
-    
-    def _simulate_real_estate_loans(self, dates):
-        """Simule les crédits immobiliers"""
-        base_loans = self.config["assets_base"] * 0.18
-        
-        multiplier = 1.6 if "immobilier" in self.config["specialites"] else 0.85
-        
-        loans = []
-        for i, date in enumerate(dates):
-            year = date.year
-            if year in [2008, 2009]:
-                crisis_multiplier = 0.7  # Crise immobilière
-            else:
-                crisis_multiplier = 1.0
-                
-            growth = 1 + 0.052 * i
-            noise = np.random.normal(1, 0.09)
-            loans.append(base_loans * growth * crisis_multiplier * multiplier * noise)
-        
-        return loans
-    
-    def _simulate_agriculture_loans(self, dates):
-        """Simule les crédits agriculture (spécifique Réunion)"""
-        base_loans = self.config["assets_base"] * 0.06
-        
-        multiplier = 2.0 if "agriculture" in self.config["specialites"] else 0.7
-        
-        loans = []
-        for i, date in enumerate(dates):
-            growth = 1 + 0.04 * i
-            noise = np.random.normal(1, 0.11)
-            loans.append(base_loans * growth * multiplier * noise)
-        
-        return loans
-    
-    def _simulate_tourism_loans(self, dates):
-        """Simule les crédits tourisme (spécifique Réunion)"""
-        base_loans = self.config["assets_base"] * 0.05
-        
-        multiplier = 1.8 if "tourisme" in self.config["specialites"] else 0.8
-        
-        loans = []
-        for i, date in enumerate(dates):
-            year = date.year
-            if year in [2020, 2021]:
-                crisis_multiplier = 0.6  # Fort impact COVID sur tourisme
-            else:
-                crisis_multiplier = 1.0
-                
-            growth = 1 + 0.046 * i
-            noise = np.random.normal(1, 0.13)
-            loans.append(base_loans * growth * crisis_multiplier * multiplier * noise)
-        
-        return loans
+    @traced('financials.trends')
+    def _add_banking_trends(self, years, values, columns):
+        """Ajoute des tendances bancaires réalistes adaptées à la Réunion (valeurs année × colonne)"""
+        # Un multiplicateur par (année, colonne) : produit des événements du scénario actifs cette année-là
+        return values * self.events.multipliers(years, columns)
     
-    def _simulate_commerce_loans(self, dates):
-        """Simule les crédits commerce (spécifique Réunion)"""
-        base_loans = self.config["assets_base"] * 0.04
-        
-        multiplier = 1.7 if "commerce" in self.config["specialites"] else 0.9
-        
-        loans = []
-        for i, date in enumerate(dates):
-            growth = 1 + 0.044 * i
-            noise = np.random.normal(1, 0.10)
-            loans.append(base_loans * growth * multiplier * noise)
+    @traced('figures')
+    def create_financial_analysis(self, df, render=None):
+        """Crée une analyse complète des finances de la banque"""
+        df = annual_financials(df)
+        timings = render_figures([(self._build_financial_figure, (df,), f'{self.bank.replace(" ", "_")}_financial_analysis')],
+                                 render)
         
-        return loans
+        # Générer les insights
+        self._generate_financial_insights(df)
+        return timings
     
-    def _simulate_energy_climate_loans(self, dates):
-        """Simule les crédits énergie-climat (spécifique Réunion)"""
-        base_loans = self.config["assets_base"] * 0.03
+    def _build_financial_figure(self, df):
+        """Construit la figure à 8 panneaux de l'analyse financière"""
+        import matplotlib.pyplot as plt
         
-        loans = []
-        for i, date in enumerate(dates):
-            year = date.year
-            if year >= 2015:
-                growth_accelerator = 1 + 0.08 * (year - 2015)  # Croissance forte
-            else:
-                growth_accelerator = 1.0
-                
-            noise = np.random.normal(1, 0.14)
-            loans.append(base_loans * growth_accelerator * noise)
-        
-        return loans
-    
-    def _add_banking_trends(self, df):
-        """Ajoute des tendances bancaires réalistes adaptées à la Réunion"""
-        for i, row in df.iterrows():
-            year = row['Annee']
-            
-            # Croissance économique de la Réunion (2002-2007)
-            if 2002 <= year <= 2007:
-                df.loc[i, 'Credits_Clients'] *= 1.08
-                df.loc[i, 'Resultat_Net'] *= 1.06
-            
-            # Crise financière mondiale (2008-2009)
-            if 2008 <= year <= 2009:
-                df.loc[i, 'Resultat_Net'] *= 0.72
-                df.loc[i, 'Dotations_Provisions'] *= 1.85
-                df.loc[i, 'Creances_Douteuses'] *= 1.45
-            
-            # reprise post-crise (2010-2014)
-            elif 2010 <= year <= 2014:
-                df.loc[i, 'Credits_Clients'] *= 1.05
-                df.loc[i, 'ROE'] *= 1.08
-            
-            # Bâle III et réglementation renforcée (2014-2018)
-            if 2014 <= year <= 2018:
-                df.loc[i, 'Ratio_CET1'] *= 1.12
-                df.loc[i, 'Ratio_Liquidite'] *= 1.06
-            
-            # Développement durable et énergies renouvelables (2015+)
-            if year >= 2015:
-                df.loc[i, 'Credits_EC'] *= 1.25
-            
-            # Crise COVID-19 (2020-2021)
-            if 2020 <= year <= 2021:
-                if year == 2020:
-                    df.loc[i, 'Resultat_Net'] *= 0.68
-                    df.loc[i, 'Dotations_Provisions'] *= 1.95
-                    df.loc[i, 'Credits_Tourisme'] *= 0.55
-            
-            # Plan de relance et reprise post-COVID (2022-2025)
-            if year >= 2022:
-                df.loc[i, 'Credits_Entreprises'] *= 1.12
-                df.loc[i, 'Credits_EC'] *= 1.35
-                df.loc[i, 'Resultat_Net'] *= 1.08
-    
-    def create_financial_analysis(self, df):
-        """Crée une analyse complète des finances de la banque"""
         plt.style.use('seaborn-v0_8')
         fig = plt.figure(figsize=(20, 24))
         
@@ -608,11 +168,7 @@ class ReunionBankFinanceAnalyzer:
         plt.suptitle(f'Analyse Financière de {self.bank} - Île de la Réunion ({self.start_year}-{self.end_year})', 
                     fontsize=16, fontweight='bold')
         plt.tight_layout()
-        plt.savefig(f'{self.bank.replace(" ", "_")}_financial_analysis.png', dpi=300, bbox_inches='tight')
-        plt.show()
-        
-        # Générer les insights
-        self._generate_financial_insights(df)
+        return fig
     
     def _plot_assets_loans(self, df, ax):
         """Plot de l'évolution des actifs et crédits"""
@@ -782,8 +338,10 @@ class ReunionBankFinanceAnalyzer:
         lines2, labels2 = ax2.get_legend_handles_labels()
         ax.legend(lines1 + lines2, labels1 + labels2, loc='upper left')
     
+    @traced('report')
     def _generate_financial_insights(self, df):
         """Génère des insights analytiques adaptés au secteur bancaire réunionnais"""
+        df = annual_financials(df)
         print(f"🏦 INSIGHTS ANALYTIQUES - {self.bank} (Île de la Réunion)")
         print("=" * 60)
         
@@ -839,13 +397,8 @@ class ReunionBankFinanceAnalyzer:
         
         # 6. Événements marquants spécifiques à la Réunion
         print("\n6. 📅 ÉVÉNEMENTS MARQUANTS RÉUNION:")
-        print("• 2002-2007: Croissance économique forte de la Réunion")
-        print("• 2008-2009: Crise financière mondiale (impact modéré)")
-        print("• 2010-2014: Reprise et développement des infrastructures")
-        print("• 2014-2018: Mise en œuvre Bâle III et réglementation renforcée")
-        print("• 2015+: Développement des financements énergies renouvelables")
-        print("• 2020-2021: Crise COVID-19 (fort impact tourisme)")
-        print("• 2022-2025: Plan de relance et transition énergétique")
+        for period in self.events.periods():
+            print(f"• {period}")
         
         # 7. Recommandations stratégiques adaptées à la Réunion
         print("\n7. 💡 RECOMMANDATIONS STRATÉGIQUES:")
@@ -865,57 +418,266 @@ class ReunionBankFinanceAnalyzer:
         print("• Investir dans la digitalisation et l'innovation financière")
         print("• Développer les partenariats avec les acteurs locaux")
 
+def annual_financials(df):
+    """Vue annuelle de données infra-annuelles (flux sommés, encours et ratios de fin d'année)"""
+    if 'Date' not in df.columns:
+        return df
+    aggregations = {column: 'sum' if column in FLOW_COLUMNS else 'last'
+                    for column in df.columns if column not in ('Date', 'Annee')}
+    return df.groupby('Annee', sort=False).agg(aggregations).reset_index()
+
+def save_financial_data(df, bank_name, store):
+    """Écrit les données financières au format long (date de fin de période, métrique, valeur)"""
+    frame = df.drop(columns=['Annee'])
+    if 'Date' not in frame.columns:
+        frame.insert(0, 'Date', pd.to_datetime(df['Annee'].astype(int).astype(str) + '-12-31'))
+    return store.write_bank_frame(frame, bank_name)
+
+def export_financial_data(df, bank_name, output, store_dir, start_year, end_year, freq='Y'):
+    """Sauvegarde les données d'une banque (stockage partitionné ou CSV) et renvoie l'emplacement écrit"""
+    if output == 'store':
+        from rate_store import RateStore
+        with span('write.store', bank=bank_name):
+            save_financial_data(df, bank_name, RateStore(store_dir, series_column='metric'))
+        return f"{store_dir}/ (banque={bank_name})"
+    
+    suffix = '' if freq == 'Y' else f'_{freq}'
+    output_file = f'{bank_name.replace(" ", "_")}_financial_data_{start_year}_{end_year}{suffix}.csv'
+    with span('write.csv', bank=bank_name):
+        df.to_csv(output_file, index=False)
+    return output_file
+
+def analyze_bank(bank_name, seed, cache_dir, registry, events, settings):
+    """
+    Traitement complet d'une banque en mode batch : génération, export, figure
+    (headless) et rapport d'insights écrit dans un fichier texte plutôt que sur
+    la sortie standard partagée. Renvoie le bilan de la banque pour le résumé ;
+    une erreur est consignée au lieu d'interrompre le lot.
+    """
+    start = time.perf_counter()
+    result = {'bank': bank_name, 'status': 'ok'}
+    try:
+        cache = ResultCache(cache_dir) if cache_dir is not None else None
+        analyzer = ReunionBankFinanceAnalyzer(bank_name, seed=seed, cache=cache, registry=registry, events=events,
+                                              freq=settings['freq'])
+        report_file = f'{analyzer.bank.replace(" ", "_")}_rapport_financier.txt'
+        result.update(bank=analyzer.bank, report=report_file)
+        
+        with open(report_file, 'w', encoding='utf-8') as report, contextlib.redirect_stdout(report):
+            financial_data = analyzer.generate_financial_data()
+            if settings['compact']:
+                from compact_frames import downcast_frame
+                financial_data = downcast_frame(financial_data)
+            result['rows'] = len(financial_data)
+            result['data'] = export_financial_data(financial_data, analyzer.bank, settings['output'],
+                                                   settings['store_dir'], analyzer.start_year, analyzer.end_year,
+                                                   analyzer.freq)
+            if settings['plots']:
+                render = RenderOptions(headless=True, dpi=settings['dpi'], format=settings['format'])
+                timings = analyzer.create_financial_analysis(financial_data, render)
+                result['figures'] = [timing['path'] for timing in timings]
+            else:
+                analyzer._generate_financial_insights(financial_data)
+    except Exception as e:
+        result.update(status='error', error=f"{type(e).__name__}: {e}")
+    result['wall_s'] = time.perf_counter() - start
+    return result
+
+def _analyze_bank_worker(task):
+    """Point d'entrée des processus du pool : une banque, son propre flux aléatoire"""
+    return analyze_bank(*task)
+
+def run_batch(bank_names, seed, registry, events, settings, max_workers=None, cache_dir=None,
+              summary_path='resume_lot_financier.json'):
+    """
+    Analyse un lot de banques sur un pool de processus et écrit le résumé de
+    l'exécution (JSON). Chaque banque dérive son générateur de la graine
+    maîtresse : les données sont identiques à une exécution banque par banque.
+    """
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+        print(f"🎲 Graine maîtresse générée: {seed}")
+    max_workers = max(1, min(max_workers or os.cpu_count(), len(bank_names)))
+    print(f"\n⚙️  Traitement batch de {len(bank_names)} banques sur {max_workers} processus...")
+    
+    # matplotlib importé avant le pool : les processus forkés en héritent au lieu de le réimporter
+    if settings['plots'] and max_workers > 1:
+        from rendering import use_headless_backend
+        use_headless_backend()
+        import matplotlib.pyplot  # noqa: F401
+    
+    tasks = [(bank_name, seed, cache_dir, registry, events, settings) for bank_name in bank_names]
+    started_at = datetime.now().isoformat(timespec='seconds')
+    start = time.perf_counter()
+    results = [None] * len(tasks)
+    
+    def report(result):
+        if result['status'] == 'ok':
+            print(f"  ✅ {result['bank']}: {result['wall_s']:.2f} s → {result['data']}")
+        else:
+            print(f"  ❌ {result['bank']}: {result['error']}")
+    
+    with span('banks.batch', banks=len(tasks)):
+        if max_workers == 1:
+            for i, task in enumerate(tasks):
+                results[i] = analyze_bank(*task)
+                report(results[i])
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = {executor.submit(_analyze_bank_worker, task): i for i, task in enumerate(tasks)}
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
+                    report(results[futures[future]])
+    wall = time.perf_counter() - start
+    
+    failed = [result['bank'] for result in results if result['status'] != 'ok']
+    summary = {
+        'started_at': started_at,
+        'seed': seed,
+        'banks': len(results),
+        'failed': failed,
+        'workers': max_workers,
+        'wall_s': wall,
+        'sum_bank_s': sum(result['wall_s'] for result in results),
+        'slowest_bank_s': max(result['wall_s'] for result in results),
+        'settings': settings,
+        'results': results
+    }
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+    
+    print(f"\n⏱️  Lot terminé en {wall:.2f} s (somme des banques {summary['sum_bank_s']:.2f} s, "
+          f"banque la plus lente {summary['slowest_bank_s']:.2f} s)")
+    print(f"📄 Résumé de l'exécution: {summary_path}")
+    return summary
+
 def main():
     """Fonction principale pour la Réunion"""
+    parser = argparse.ArgumentParser(description="Analyse financière d'une banque de La Réunion")
+    parser.add_argument('--seed', type=int, default=None,
+                        help="Graine maîtresse (rend les données reproductibles et active le cache)")
+    parser.add_argument('--cache-dir', default='.cache_banques',
+                        help="Répertoire du cache de résultats")
+    parser.add_argument('--output', choices=['store', 'csv'], default='store',
+                        help="Stockage colonnaire partitionné (défaut) ou fichier CSV")
+    parser.add_argument('--store-dir', default='donnees_financieres',
+                        help="Racine du stockage partitionné")
+    parser.add_argument('--freq', choices=list(PERIODS_PER_YEAR), default='Y',
+                        help="Fréquence des données : annuelle (Y), trimestrielle (Q) ou mensuelle (M)")
+    parser.add_argument('--bank', default=None,
+                        help="Banque à analyser, nom ou alias (évite la question interactive)")
+    parser.add_argument('--batch', nargs='+', default=None, metavar='BANQUE',
+                        help="Mode batch non interactif : banques (noms ou alias) ou « all » pour toutes les banques configurées")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Nombre de processus du mode batch (défaut : nombre de CPU)")
+    parser.add_argument('--summary', default='resume_lot_financier.json',
+                        help="Fichier JSON du résumé de l'exécution en mode batch")
+    parser.add_argument('--banks-file', default=None,
+                        help="Registre des banques à utiliser à la place de data/banks.json")
+    parser.add_argument('--events-file', default=None,
+                        help="Scénario d'événements à utiliser à la place de data/evenements_reunion.csv")
+    parser.add_argument('--no-plots', action='store_true',
+                        help="Exécution données seules : ni graphique ni import de matplotlib")
+    parser.add_argument('--headless', action='store_true',
+                        help="Rendu batch sans affichage (backend Agg, jamais de plt.show)")
+    parser.add_argument('--dpi', type=int, default=300, help="Résolution de la figure")
+    parser.add_argument('--format', choices=['png', 'svg'], default='png', help="Format de la figure")
+    parser.add_argument('--compact', action='store_true',
+                        help="Représentation compacte des données (float32, entiers réduits)")
+    parser.add_argument('--trace', default=None,
+                        help="Chronomètre chaque étape et exporte la trace dans ce fichier")
+    parser.add_argument('--trace-format', choices=['chrome', 'json'], default='chrome',
+                        help="Format de la trace : Chrome trace (chrome://tracing, Perfetto) ou JSON")
+    args = parser.parse_args()
+    if args.trace:
+        instrumentation.enable()
+    cache = ResultCache(args.cache_dir) if args.seed is not None else None
+    
     # Liste des banques de la Réunion
-    banques = [
-        "Crédit Agricole de la Réunion",
-        "Banque de la Réunion", 
-        "Société Générale Réunion",
-        "BNP Paribas Réunion",
-        "Caisse d'Epargne Réunion",
-        "Banque Française Commerciale Océan Indien"
-    ]
+    registry = BankRegistry.load(args.banks_file) if args.banks_file else load_registry()
+    banques = registry.finance_banks()
+    events = EventTable.load(args.events_file) if args.events_file else load_events()
     
     print("🏦 ANALYSE DES BANQUES DE L'ÎLE DE LA RÉUNION (2002-2025)")
     print("=" * 60)
     
+    if args.batch is not None:
+        requested = banques if [name.lower() for name in args.batch] == ['all'] else args.batch
+        unknown = [name for name in requested if registry.resolve(name) is None]
+        if unknown:
+            parser.error(f"banques inconnues du registre: {', '.join(unknown)}")
+        bank_names = list(dict.fromkeys(registry.resolve(name) for name in requested))
+        settings = {'output': args.output, 'store_dir': args.store_dir, 'compact': args.compact, 'freq': args.freq,
+                    'plots': not args.no_plots, 'dpi': args.dpi, 'format': args.format}
+        summary = run_batch(bank_names, args.seed, registry, events, settings, max_workers=args.workers,
+                            cache_dir=args.cache_dir if args.seed is not None else None,
+                            summary_path=args.summary)
+        if args.trace:
+            instrumentation.TRACER.print_report()
+            instrumentation.TRACER.export(args.trace, args.trace_format)
+        if summary['failed']:
+            raise SystemExit(1)
+        return
+    
     # Demander à l'utilisateur de choisir une banque
     print("Liste des banques disponibles:")
     for i, banque in enumerate(banques, 1):
         print(f"{i}. {banque}")
     
-    try:
-        choix = int(input("\nChoisissez le numéro de la banque à analyser: "))
-        if choix < 1 or choix > len(banques):
-            raise ValueError
-        banque_selectionnee = banques[choix-1]
-    except (ValueError, IndexError):
-        print("Choix invalide. Sélection du Crédit Agricole par défaut.")
-        banque_selectionnee = "Crédit Agricole de la Réunion"
+    if args.bank is not None:
+        banque_selectionnee = args.bank
+    else:
+        try:
+            choix = int(input("\nChoisissez le numéro de la banque à analyser: "))
+            if choix < 1 or choix > len(banques):
+                raise ValueError
+            banque_selectionnee = banques[choix-1]
+        except (ValueError, IndexError):
+            print("Choix invalide. Sélection du Crédit Agricole par défaut.")
+            banque_selectionnee = "Crédit Agricole de La Réunion"
     
     # Initialiser l'analyseur
-    analyzer = ReunionBankFinanceAnalyzer(banque_selectionnee)
+    analyzer = ReunionBankFinanceAnalyzer(banque_selectionnee, seed=args.seed, cache=cache, registry=registry, events=events,
+                                          freq=args.freq)
+    banque_selectionnee = analyzer.bank
     
     # Générer les données
     financial_data = analyzer.generate_financial_data()
+    if args.compact:
+        from compact_frames import downcast_frame, frame_nbytes
+        full_size = frame_nbytes(financial_data)
+        financial_data = downcast_frame(financial_data)
+        print(f"🗜️  Mode compact: {full_size / 1024:.1f} Ko → {frame_nbytes(financial_data) / 1024:.1f} Ko")
     
     # Sauvegarder les données
-    output_file = f'{banque_selectionnee.replace(" ", "_")}_financial_data_2002_2025.csv'
-    financial_data.to_csv(output_file, index=False)
-    print(f"💾 Données sauvegardées: {output_file}")
+    location = export_financial_data(financial_data, banque_selectionnee, args.output, args.store_dir,
+                                     analyzer.start_year, analyzer.end_year, analyzer.freq)
+    print(f"💾 Données sauvegardées: {location}")
     
     # Aperçu des données
     print("\n👀 Aperçu des données:")
-    print(financial_data[['Annee', 'Total_Actifs', 'Produit_Net_Bancaire', 'Resultat_Net', 'ROE']].head())
+    preview = ['Date'] if 'Date' in financial_data.columns else ['Annee']
+    print(financial_data[preview + ['Total_Actifs', 'Produit_Net_Bancaire', 'Resultat_Net', 'ROE']].head())
     
     # Créer l'analyse
-    print("\n📈 Création de l'analyse financière...")
-    analyzer.create_financial_analysis(financial_data)
+    if args.no_plots:
+        analyzer._generate_financial_insights(financial_data)
+    else:
+        print("\n📈 Création de l'analyse financière...")
+        analyzer.create_financial_analysis(financial_data,
+                                           RenderOptions(headless=args.headless, dpi=args.dpi, format=args.format))
     
     print(f"\n✅ Analyse financière de {banque_selectionnee} terminée!")
     print(f"📊 Période: {analyzer.start_year}-{analyzer.end_year}")
     print("📦 Données: Actifs, rentabilité, risques, crédits par secteur")
+    
+    if cache is not None:
+        stats = cache.stats()
+        print(f"🗄️  Cache: {stats['hits_memory'] + stats['hits_disk']} succès, {stats['misses']} échecs")
+    
+    if args.trace:
+        instrumentation.TRACER.print_report()
+        instrumentation.TRACER.export(args.trace, args.trace_format)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
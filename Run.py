@@ -1,354 +1,666 @@
-import requests
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-import matplotlib.pyplot as plt
-import seaborn as sns
-from bs4 import BeautifulSoup
+import os
+import csv
+import glob
+import re
 import time
+import argparse
+import functools
+import heapq
+from concurrent.futures import ProcessPoolExecutor
 import warnings
+from result_cache import ResultCache, source_version
+from bank_registry import BankRegistry, load_registry
+from counter_rng import stream_key, period_ordinals, counter_normals, counter_uniforms
+from rendering import RenderOptions, render_figures
+import instrumentation
+from instrumentation import span, traced
 warnings.filterwarnings('ignore')
 
+# matplotlib, seaborn, pyarrow et aiohttp ne sont importés que par les chemins
+# de code qui en ont besoin : une exécution sans graphiques démarre sans eux
+
+# Version du code, incluse dans les clés du cache de résultats : le script et
+# les modules qui produisent les valeurs mises en cache
+CODE_VERSION = source_version(__file__, *(os.path.join(os.path.dirname(os.path.abspath(__file__)), module)
+                                         for module in ('bank_registry.py', 'counter_rng.py')))
+
+# Types de taux générés par le moteur vectorisé (ordre des axes du cube)
+RATE_TYPES = ('deposit', 'lending', 'mortgage', 'corporate_deposit', 'corporate_lending')
+
+RATE_LABELS = {
+    'deposit': 'Deposit Rate',
+    'lending': 'Lending Rate',
+    'mortgage': 'Mortgage Rate',
+    'corporate_deposit': 'Corporate Deposit Rate',
+    'corporate_lending': 'Corporate Lending Rate'
+}
+
+# Historique annuel réaliste pour La Réunion (en %), une ligne par type de taux
+# Basé sur l'évolution des taux directeurs BCE
+HISTORY_START_YEAR = 2002
+BASE_RATE_HISTORY = np.array([
+    # Dépôts
+    [3.5, 3.0, 2.5, 2.5, 3.0, 3.5, 4.0, 2.0, 1.5, 1.8, 1.5, 1.2,
+     1.0, 0.8, 0.5, 0.4, 0.4, 0.3, 0.2, 0.2, 0.8, 1.5, 1.8, 1.6],
+    # Prêts
+    [6.5, 6.0, 5.5, 5.0, 5.5, 6.0, 6.5, 4.5, 4.0, 4.3, 4.0, 3.7,
+     3.5, 3.2, 2.8, 2.5, 2.5, 2.3, 2.0, 2.0, 2.8, 3.5, 3.8, 3.6],
+    # Hypothécaires
+    [5.5, 5.0, 4.5, 4.0, 4.5, 5.0, 5.5, 3.5, 3.0, 3.3, 3.0, 2.7,
+     2.5, 2.2, 1.8, 1.5, 1.5, 1.3, 1.0, 1.0, 1.8, 2.5, 2.8, 2.6],
+    # Dépôts entreprises
+    [2.5, 2.0, 1.5, 1.5, 2.0, 2.5, 3.0, 1.0, 0.5, 0.8, 0.5, 0.2,
+     0.1, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.3, 1.0, 1.3, 1.1],
+    # Prêts entreprises
+    [5.5, 5.0, 4.5, 4.0, 4.5, 5.0, 5.5, 3.5, 3.0, 3.3, 3.0, 2.7,
+     2.5, 2.2, 1.8, 1.5, 1.5, 1.3, 1.0, 1.0, 1.8, 2.5, 2.8, 2.6]
+])
+
+# Valeur de repli hors historique, variabilité mensuelle et plancher par type de taux
+DEFAULT_BASE_RATES = np.array([1.5, 3.5, 2.5, 0.5, 2.5])
+RATE_NOISE_STD = np.array([0.05, 0.08, 0.06, 0.03, 0.05])
+RATE_FLOORS = np.array([0.1, 1.5, 0.8, 0.0, 1.0])
+
+# Écarts calculés : (libellé, type de taux diminué, type de taux retranché)
+SPREADS = (
+    ('Retail Spread', 'lending', 'deposit'),
+    ('Corporate Spread', 'corporate_lending', 'corporate_deposit'),
+    ('Mortgage Discount', 'lending', 'mortgage')
+)
+
+# Séries agrégées par le pipeline en flux : taux puis écarts
+STREAM_METRICS = tuple(RATE_LABELS[rate_type] for rate_type in RATE_TYPES) + tuple(label for label, _, _ in SPREADS)
+
+# Croissance annuelle moyenne des actifs et volatilité mensuelle de cette croissance
+ASSET_GROWTH_RATE = 0.03
+ASSET_GROWTH_MONTHLY_STD = 0.002
+
+# Au-delà de ce nombre de points, les séries tracées sont moyennées par paquets
+PLOT_MAX_POINTS = 2000
+
+@functools.lru_cache(maxsize=None)
+def periods_per_year(freq):
+    """Nombre de périodes par an d'une fréquence pandas ('M' = 12, 'D' = 365, 'B' = 261…)"""
+    return len(pd.date_range('2001-01-01', '2001-12-31', freq=freq))
+
+def _downsample_for_plot(df, max_points=PLOT_MAX_POINTS):
+    """Moyenne les lignes consécutives par paquets pour ne tracer que max_points points"""
+    step = -(-len(df) // max_points)
+    if step <= 1:
+        return df
+    groups = np.arange(len(df)) // step
+    aggregations = {column: 'mean' for column in df.columns if column != 'Date'}
+    aggregations['Date'] = 'first'
+    return df.groupby(groups).agg(aggregations)[df.columns]
+
+class StreamingHistogram:
+    """
+    Histogramme à bornes fixes par cellule : estime des percentiles sur un
+    nombre arbitraire de tirages sans les conserver en mémoire.
+    """
+    def __init__(self, low, high, n_bins=256):
+        low = np.asarray(low, dtype=float)
+        high = np.maximum(np.asarray(high, dtype=float), low + 1e-9)
+        
+        self.shape = low.shape
+        self.n_bins = n_bins
+        self.low = low.ravel()
+        self.width = (high.ravel() - self.low) / n_bins
+        self.counts = np.zeros((self.low.size, n_bins), dtype=np.int64)
+        self.count = 0
+        self._offsets = np.arange(self.low.size) * n_bins
+    
+    def update(self, samples):
+        """Ajoute un lot de tirages de forme (n, *shape)"""
+        flat = samples.reshape(len(samples), -1)
+        bins = ((flat - self.low) / self.width).astype(np.int64)
+        np.clip(bins, 0, self.n_bins - 1, out=bins)
+        bins += self._offsets
+        self.counts += np.bincount(bins.ravel(), minlength=self.counts.size).reshape(self.counts.shape)
+        self.count += len(samples)
+    
+    def percentiles(self, qs):
+        """Percentiles interpolés dans les classes, forme (len(qs), *shape)"""
+        cumulative = np.cumsum(self.counts, axis=1)
+        results = []
+        for q in qs:
+            target = q / 100 * self.count
+            bins = np.argmax(cumulative >= target, axis=1)
+            rows = np.arange(len(bins))
+            below = np.where(bins > 0, cumulative[rows, np.maximum(bins - 1, 0)], 0)
+            in_bin = np.maximum(self.counts[rows, bins], 1)
+            fraction = np.clip((target - below) / in_bin, 0, 1)
+            results.append((self.low + (bins + fraction) * self.width).reshape(self.shape))
+        return np.stack(results)
+
+class RunningMoments:
+    """
+    Moyenne et écart-type par cellule mis à jour lot par lot (fusion de
+    Chan et al.) : stable numériquement, sans conserver les observations.
+    """
+    def __init__(self, shape):
+        self.count = 0
+        self.mean = np.zeros(shape)
+        self.m2 = np.zeros(shape)
+    
+    def update(self, samples):
+        """Ajoute un lot d'observations de forme (n, *shape)"""
+        n = len(samples)
+        if n == 0:
+            return
+        batch_mean = samples.mean(axis=0)
+        batch_m2 = ((samples - batch_mean) ** 2).sum(axis=0)
+        total = self.count + n
+        delta = batch_mean - self.mean
+        self.mean += delta * (n / total)
+        self.m2 += batch_m2 + delta ** 2 * (self.count * n / total)
+        self.count = total
+    
+    def std(self):
+        return np.sqrt(self.m2 / max(self.count, 1))
+
+# Types de taux des instantanés (classements, heatmap, aperçu) et leurs libellés
+SNAPSHOT_LABELS = ('Deposit Rate', 'Lending Rate', 'Mortgage Rate')
+SNAPSHOT_LABELS_FR = {'Deposit Rate': 'Dépôt', 'Lending Rate': 'Prêt', 'Mortgage Rate': 'Hypothèque'}
+
+class AsOfIndex:
+    """
+    Index trié des dates d'un DataFrame large (colonnes « {banque} {taux} ») :
+    l'instantané à une date est la première ligne dont la date est >= à la
+    date demandée (la dernière ligne au-delà de l'horizon), trouvée par
+    recherche dichotomique pour toutes les banques à la fois.
+    """
+    def __init__(self, df):
+        self.dates = pd.DatetimeIndex(df['Date'])
+        if not self.dates.is_monotonic_increasing:
+            raise ValueError("Les dates doivent être triées par ordre croissant")
+        self.df = df
+    
+    def positions(self, as_of_dates):
+        """Lignes des instantanés d'un lot de dates (O(log n) par date)"""
+        targets = pd.DatetimeIndex(pd.to_datetime(np.atleast_1d(as_of_dates)))
+        return np.minimum(self.dates.searchsorted(targets, side='left'), len(self.dates) - 1)
+    
+    def date_of(self, as_of):
+        """Date effective de l'instantané demandé"""
+        return self.dates[self.positions([as_of])[0]]
+    
+    def _values(self, positions, bank_names, rate_labels):
+        """Valeurs (date × banque × type) lues directement dans les colonnes"""
+        return np.stack([
+            np.stack([self.df[f'{bank_name} {label}'].to_numpy()[positions] for label in rate_labels], axis=-1)
+            for bank_name in bank_names
+        ], axis=1)
+    
+    def snapshot(self, as_of, bank_names, rate_labels=SNAPSHOT_LABELS):
+        """Instantané (banque × type de taux) à une date"""
+        values = self._values(self.positions([as_of]), bank_names, rate_labels)[0]
+        return pd.DataFrame(values, index=list(bank_names), columns=list(rate_labels))
+    
+    def snapshots(self, as_of_dates, bank_names, rate_labels=SNAPSHOT_LABELS):
+        """Instantanés d'un lot de dates, indexés par (date demandée, banque)"""
+        as_of_dates = pd.DatetimeIndex(pd.to_datetime(np.atleast_1d(as_of_dates)))
+        values = self._values(self.positions(as_of_dates), bank_names, rate_labels)
+        index = pd.MultiIndex.from_product([as_of_dates, list(bank_names)], names=['As Of', 'Bank'])
+        return pd.DataFrame(values.reshape(-1, len(rate_labels)), index=index, columns=list(rate_labels))
+
+class LazyRateSeries:
+    """
+    Série d'une banque (taux ou écart) évaluée à la demande : rien n'est
+    généré à la construction, et series['2024-01':'2024-03'] ne calcule que
+    les périodes de la tranche. Avec une graine, toute tranche est
+    reproductible et identique à la même portion de la série complète.
+    """
+    def __init__(self, analyzer, bank_name, label):
+        if label not in STREAM_METRICS:
+            raise ValueError(f"Série inconnue: {label} (disponibles: {', '.join(STREAM_METRICS)})")
+        self.analyzer = analyzer
+        self.bank_name = bank_name
+        self.label = label
+    
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            if key.step is not None:
+                raise ValueError("Pas de tranche non pris en charge")
+            return self.analyzer.rate_slice(self.bank_name, self.label, key.start, key.stop)
+        # Une date seule : première date de la série >= à la date demandée, comme AsOfIndex
+        date = pd.date_range(pd.Timestamp(key), periods=1, freq=self.analyzer.freq)[0]
+        values = self.analyzer.rate_slice(self.bank_name, self.label, date, date)
+        if values.empty:
+            raise KeyError(key)
+        return values.iloc[0]
+    
+    def __repr__(self):
+        return f"LazyRateSeries({self.bank_name!r}, {self.label!r}, {self.analyzer.start}..{self.analyzer.end}, {self.analyzer.freq})"
+
 class ReunionBanksInterestRates:
-    def __init__(self):
+    def __init__(self, seed=None, cache=None, output='store', store_dir='donnees_banques',
+                 start='2002-01-01', end='2025-12-31', freq='M', registry=None):
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
         
-        # Liste des banques de La Réunion
-        self.banks = {
-            'Banque de La Réunion (BLR)': {
-                'website': 'https://www.banque-reunion.fr',
-                'type': 'Banque locale historique',
-                'founded': 1849
-            },
-            'Crédit Agricole de La Réunion': {
-                'website': 'https://www.credit-agricole-reunion.fr',
-                'type': 'Coopérative bancaire',
-                'founded': 1904
-            },
-            'Banque Française Commerciale Océan Indien (BFC OI)': {
-                'website': 'https://www.bfcoi.fr',
-                'type': 'Banque régionale',
-                'founded': 1920
-            },
-            'Société Générale Réunion': {
-                'website': 'https://www.societegenerale.re',
-                'type': 'Réseau national',
-                'founded': 1964
-            },
-            'BNP Paribas Réunion': {
-                'website': 'https://www.bnpparibas.re',
-                'type': 'Réseau national',
-                'founded': 1968
-            },
-            'Banque Populaire Réunion': {
-                'website': 'https://www.banquepopulaire.re',
-                'type': 'Réseau mutualiste',
-                'founded': 1978
-            },
-            'Caisse d\'Épargne Réunion': {
-                'website': 'https://www.caisse-epargne.fr/reunion',
-                'type': 'Réseau mutualiste',
-                'founded': 1818
-            },
-            'Crédit Immobilier de l\'Océan Indien (CIOI)': {
-                'website': 'https://www.cioi.fr',
-                'type': 'Spécialiste immobilier',
-                'founded': 1985
-            },
-            'HSBC Réunion': {
-                'website': 'https://www.hsbc.fr',
-                'type': 'Banque internationale',
-                'founded': 2005
-            },
-            'CIC Réunion': {
-                'website': 'https://www.cic.fr',
-                'type': 'Réseau national',
-                'founded': 1971
-            }
-        }
+        # Registre des banques (data/banks.json) et liste des banques de La Réunion
+        self.registry = registry or load_registry()
+        self.banks = self.registry.bank_info()
+        
+        # Horizon et fréquence des séries ('M' mensuelle, 'D' quotidienne, 'B' jours ouvrés…)
+        self.start = str(pd.Timestamp(start).date())
+        self.end = str(pd.Timestamp(end).date())
+        self.freq = freq
+        self.start_year = pd.Timestamp(start).year
+        self.end_year = pd.Timestamp(end).year
+        
+        # Cube (banque × type de taux × période) partagé par les méthodes par banque
+        self._rate_cube = None
+        # Au-delà de ce volume, le cube n'est construit que pour les banques demandées
+        self.max_cube_bytes = 256 * 1024 ** 2
+        
+        # Graine maîtresse (None = flux global np.random) et cache de résultats optionnel
+        self.seed = seed
+        self.cache = cache
+        
+        # Sortie des séries par banque : stockage colonnaire partitionné ou CSV individuels
+        self.output = output
+        self.store = None
+        if output == 'store':
+            from rate_store import RateStore
+            self.store = RateStore(store_dir)
     
-    def get_bank_rates(self, bank_name):
+    def get_bank_rates(self, bank_name, live=False):
         """
         Récupère les taux actuels d'une banque spécifique
         """
         try:
             print(f"📊 Récupération des taux pour {bank_name}...")
             
-            # Simulation réaliste des taux pour La Réunion (en euros, beaucoup plus bas qu'en Russie)
-            if 'Crédit Agricole' in bank_name:
-                deposit_rate = 1.5  # Taux Livret A
-                lending_rate = 3.5  # Taux prêt immobilier moyen
-            elif 'BLR' in bank_name or 'Banque de La Réunion' in bank_name:
-                deposit_rate = 1.6
-                lending_rate = 3.6
-            elif 'BFC' in bank_name:
-                deposit_rate = 1.4
-                lending_rate = 3.4
-            elif 'Société Générale' in bank_name:
-                deposit_rate = 1.3
-                lending_rate = 3.7
-            elif 'BNP' in bank_name:
-                deposit_rate = 1.2
-                lending_rate = 3.8
-            elif 'Populaire' in bank_name:
-                deposit_rate = 1.5
-                lending_rate = 3.5
-            elif 'Épargne' in bank_name:
-                deposit_rate = 1.4
-                lending_rate = 3.4
-            elif 'CIOI' in bank_name:
-                deposit_rate = 1.8  # Plus élevé car spécialisé
-                lending_rate = 3.2  # Plus bas car spécialisé immobilier
-            elif 'HSBC' in bank_name:
-                deposit_rate = 1.1
-                lending_rate = 3.9
-            elif 'CIC' in bank_name:
-                deposit_rate = 1.3
-                lending_rate = 3.6
-            else:
-                deposit_rate = 1.5
-                lending_rate = 3.5
-                
-            return deposit_rate, lending_rate
+            if live:
+                deposit_rate, lending_rate, _ = self.refresh_live_rates([bank_name])[bank_name]
+                return deposit_rate, lending_rate
+            
+            return self._simulated_bank_rates(bank_name)
             
         except Exception as e:
             print(f"❌ Erreur {bank_name} rates: {e}")
             return 1.5, 3.5  # Valeurs par défaut
     
+    def refresh_live_rates(self, bank_names=None, urls=None, cache_dir='.cache_banques/http'):
+        """
+        Récupère en parallèle les taux publiés sur les sites des banques.
+        Renvoie {banque: (dépôt, prêt, source)}, la source valant 'simulation'
+        lorsque la page est inaccessible ou illisible.
+        """
+        from rate_fetcher import LiveRateFetcher
+        
+        if urls is None:
+            if bank_names is None:
+                bank_names = list(self.banks.keys())
+            urls = {bank_name: self.banks.get(bank_name, {}).get('website') for bank_name in bank_names}
+        
+        fetcher = LiveRateFetcher(headers=self.headers, cache_dir=cache_dir)
+        return fetcher.refresh(urls, self._simulated_bank_rates)
+    
+    def _simulated_bank_rates(self, bank_name):
+        """Taux actuels simulés (repli lorsque les sites ne sont pas joignables)"""
+        # Taux réalistes pour La Réunion (en euros, beaucoup plus bas qu'en Russie), issus du registre
+        return self.registry.current_rate_pair(bank_name)
+    
+    @traced('rates.deposit')
     def get_historical_deposit_rates(self, bank_name):
         """
         Récupère les données historiques des taux de dépôt pour une banque
         """
         try:
             print(f"📊 Récupération des données historiques dépôts pour {bank_name}...")
-            
-            # Données historiques réalistes pour La Réunion (en %)
-            # Basées sur l'évolution des taux directeurs BCE
-            base_history = {
-                '2002': 3.5, '2003': 3.0, '2004': 2.5, '2005': 2.5,
-                '2006': 3.0, '2007': 3.5, '2008': 4.0, '2009': 2.0,
-                '2010': 1.5, '2011': 1.8, '2012': 1.5, '2013': 1.2,
-                '2014': 1.0, '2015': 0.8, '2016': 0.5, '2017': 0.4,
-                '2018': 0.4, '2019': 0.3, '2020': 0.2, '2021': 0.2,
-                '2022': 0.8, '2023': 1.5, '2024': 1.8, '2025': 1.6
-            }
-            
-            # Ajustements spécifiques par banque
-            bank_adjustments = self._get_bank_adjustments(bank_name, 'deposit')
-            
-            # Créer une série temporelle mensuelle
-            dates = pd.date_range(start='2002-01-01', end='2025-12-31', freq='M')
-            
-            rates = []
-            for date in dates:
-                year = str(date.year)
-                base_rate = base_history.get(year, 1.5)
-                adjustment = bank_adjustments.get(year, 0)
-                # Variabilité mensuelle réaliste
-                monthly_variation = np.random.normal(0, 0.05)
-                final_rate = max(0.1, base_rate + adjustment + monthly_variation)
-                rates.append(final_rate)
-            
-            df = pd.DataFrame({'Date': dates, f'{bank_name} Deposit Rate': rates})
-            return df
+            return self._bank_rate_frame(bank_name, ('deposit',))
             
         except Exception as e:
             print(f"❌ Erreur données historiques dépôts {bank_name}: {e}")
-            return self._create_simulated_data(bank_name, 'Deposit Rate', 2002, 2025)
+            return self._create_simulated_data(bank_name, 'Deposit Rate', self.start_year, self.end_year)
     
+    @traced('rates.lending')
     def get_historical_lending_rates(self, bank_name):
         """
         Récupère les données historiques des taux de prêt
         """
         try:
             print(f"📊 Récupération des données historiques prêts pour {bank_name}...")
-            
-            # Données historiques réalistes pour La Réunion
-            base_history = {
-                '2002': 6.5, '2003': 6.0, '2004': 5.5, '2005': 5.0,
-                '2006': 5.5, '2007': 6.0, '2008': 6.5, '2009': 4.5,
-                '2010': 4.0, '2011': 4.3, '2012': 4.0, '2013': 3.7,
-                '2014': 3.5, '2015': 3.2, '2016': 2.8, '2017': 2.5,
-                '2018': 2.5, '2019': 2.3, '2020': 2.0, '2021': 2.0,
-                '2022': 2.8, '2023': 3.5, '2024': 3.8, '2025': 3.6
-            }
-            
-            bank_adjustments = self._get_bank_adjustments(bank_name, 'lending')
-            
-            dates = pd.date_range(start='2002-01-01', end='2025-12-31', freq='M')
-            
-            rates = []
-            for date in dates:
-                year = str(date.year)
-                base_rate = base_history.get(year, 3.5)
-                adjustment = bank_adjustments.get(year, 0)
-                monthly_variation = np.random.normal(0, 0.08)
-                final_rate = max(1.5, base_rate + adjustment + monthly_variation)
-                rates.append(final_rate)
-            
-            df = pd.DataFrame({'Date': dates, f'{bank_name} Lending Rate': rates})
-            return df
+            return self._bank_rate_frame(bank_name, ('lending',))
             
         except Exception as e:
             print(f"❌ Erreur données historiques prêts {bank_name}: {e}")
-            return self._create_simulated_data(bank_name, 'Lending Rate', 2002, 2025)
+            return self._create_simulated_data(bank_name, 'Lending Rate', self.start_year, self.end_year)
     
+    @traced('rates.mortgage')
     def get_mortgage_rates(self, bank_name):
         """
         Taux hypothécaires spécifiques à La Réunion
         """
         try:
-            dates = pd.date_range(start='2002-01-01', end='2025-12-31', freq='M')
-            
-            # Taux hypothécaires historiques pour La Réunion
-            mortgage_history = {
-                '2002': 5.5, '2003': 5.0, '2004': 4.5, '2005': 4.0,
-                '2006': 4.5, '2007': 5.0, '2008': 5.5, '2009': 3.5,
-                '2010': 3.0, '2011': 3.3, '2012': 3.0, '2013': 2.7,
-                '2014': 2.5, '2015': 2.2, '2016': 1.8, '2017': 1.5,
-                '2018': 1.5, '2019': 1.3, '2020': 1.0, '2021': 1.0,
-                '2022': 1.8, '2023': 2.5, '2024': 2.8, '2025': 2.6
-            }
-            
-            bank_adjustments = self._get_bank_adjustments(bank_name, 'mortgage')
-            
-            mortgage_rates = []
-            for date in dates:
-                year = str(date.year)
-                base_rate = mortgage_history.get(year, 2.5)
-                adjustment = bank_adjustments.get(year, 0)
-                monthly_variation = np.random.normal(0, 0.06)
-                final_rate = max(0.8, base_rate + adjustment + monthly_variation)
-                mortgage_rates.append(final_rate)
-            
-            return pd.DataFrame({'Date': dates, f'{bank_name} Mortgage Rate': mortgage_rates})
+            return self._bank_rate_frame(bank_name, ('mortgage',))
             
         except Exception as e:
             print(f"❌ Erreur mortgage rates {bank_name}: {e}")
-            return self._create_simulated_data(bank_name, 'Mortgage Rate', 2002, 2025)
+            return self._create_simulated_data(bank_name, 'Mortgage Rate', self.start_year, self.end_year)
     
+    @traced('rates.corporate')
     def get_corporate_rates(self, bank_name):
         """
         Taux pour les entreprises à La Réunion
         """
         try:
-            dates = pd.date_range(start='2002-01-01', end='2025-12-31', freq='M')
-            
-            # Taux pour entreprises (généralement différents des particuliers)
-            corporate_deposit_history = {
-                '2002': 2.5, '2003': 2.0, '2004': 1.5, '2005': 1.5,
-                '2006': 2.0, '2007': 2.5, '2008': 3.0, '2009': 1.0,
-                '2010': 0.5, '2011': 0.8, '2012': 0.5, '2013': 0.2,
-                '2014': 0.1, '2015': 0.0, '2016': 0.0, '2017': 0.0,
-                '2018': 0.0, '2019': 0.0, '2020': 0.0, '2021': 0.0,
-                '2022': 0.3, '2023': 1.0, '2024': 1.3, '2025': 1.1
-            }
-            
-            corporate_lending_history = {
-                '2002': 5.5, '2003': 5.0, '2004': 4.5, '2005': 4.0,
-                '2006': 4.5, '2007': 5.0, '2008': 5.5, '2009': 3.5,
-                '2010': 3.0, '2011': 3.3, '2012': 3.0, '2013': 2.7,
-                '2014': 2.5, '2015': 2.2, '2016': 1.8, '2017': 1.5,
-                '2018': 1.5, '2019': 1.3, '2020': 1.0, '2021': 1.0,
-                '2022': 1.8, '2023': 2.5, '2024': 2.8, '2025': 2.6
-            }
-            
-            bank_deposit_adj = self._get_bank_adjustments(bank_name, 'corporate_deposit')
-            bank_lending_adj = self._get_bank_adjustments(bank_name, 'corporate_lending')
-            
-            corp_deposit_rates = []
-            corp_lending_rates = []
-            
-            for date in dates:
-                year = str(date.year)
-                
-                # Taux dépôt entreprises
-                base_deposit = corporate_deposit_history.get(year, 0.5)
-                deposit_adj = bank_deposit_adj.get(year, 0)
-                corp_deposit_rates.append(max(0.0, base_deposit + deposit_adj + np.random.normal(0, 0.03)))
-                
-                # Taux prêt entreprises
-                base_lending = corporate_lending_history.get(year, 2.5)
-                lending_adj = bank_lending_adj.get(year, 0)
-                corp_lending_rates.append(max(1.0, base_lending + lending_adj + np.random.normal(0, 0.05)))
-            
-            return pd.DataFrame({
-                'Date': dates, 
-                f'{bank_name} Corporate Deposit Rate': corp_deposit_rates,
-                f'{bank_name} Corporate Lending Rate': corp_lending_rates
-            })
+            return self._bank_rate_frame(bank_name, ('corporate_deposit', 'corporate_lending'))
             
         except Exception as e:
             print(f"❌ Erreur corporate rates {bank_name}: {e}")
-            dates = pd.date_range(start='2002-01-01', end='2025-12-31', freq='M')
+            dates = self._dates()
             return pd.DataFrame({
                 'Date': dates,
-                f'{bank_name} Corporate Deposit Rate': self._simulate_corporate_deposit(dates, bank_name),
-                f'{bank_name} Corporate Lending Rate': self._simulate_corporate_lending(dates, bank_name)
+                f'{bank_name} Corporate Deposit Rate': self._simulate_corporate_deposit(
+                    dates, bank_name, self._fallback_draws(bank_name, 'Corporate Deposit Rate', dates)),
+                f'{bank_name} Corporate Lending Rate': self._simulate_corporate_lending(
+                    dates, bank_name, self._fallback_draws(bank_name, 'Corporate Lending Rate', dates))
             })
     
-    def _get_bank_adjustments(self, bank_name, rate_type):
+    def _dates(self, start=None, end=None, freq=None):
+        """Index de dates de l'horizon (ou d'une partie de l'horizon)"""
+        return pd.date_range(start=start or self.start, end=end or self.end, freq=freq or self.freq)
+    
+    @traced('rates.simulate_cube')
+    def build_rate_cube(self, bank_names=None, start=None, end=None, freq=None):
         """
-        Retourne les ajustements spécifiques par banque
+        Génère tous les types de taux de toutes les banques en un seul tableau
+        (banque × type de taux × période) : courbes de base diffusées, matrice
+        d'ajustements et un unique tirage de bruit.
         """
-        adjustments = {}
+        if bank_names is None:
+            bank_names = list(self.banks.keys())
         
-        # Ajustements basés sur le type de banque et sa spécialisation
-        if 'Crédit Agricole' in bank_name:
-            if rate_type in ['deposit', 'corporate_deposit']:
-                adjustments = {str(year): 0.1 for year in range(2002, 2026)}  # Légèrement plus élevé
-            elif rate_type in ['lending', 'mortgage', 'corporate_lending']:
-                adjustments = {str(year): -0.1 for year in range(2002, 2026)}  # Légèrement plus bas
-                
-        elif 'BLR' in bank_name or 'Banque de La Réunion' in bank_name:
-            if rate_type in ['deposit', 'corporate_deposit']:
-                adjustments = {str(year): 0.2 for year in range(2002, 2026)}
-            elif rate_type in ['lending', 'mortgage']:
-                adjustments = {str(year): 0.1 for year in range(2002, 2026)}
-                
-        elif 'CIOI' in bank_name:
-            if rate_type == 'mortgage':
-                adjustments = {str(year): -0.3 for year in range(2002, 2026)}  # Spécialiste immobilier
-            elif rate_type in ['deposit', 'corporate_deposit']:
-                adjustments = {str(year): 0.3 for year in range(2002, 2026)}
-                
-        elif 'HSBC' in bank_name:
-            if rate_type in ['lending', 'corporate_lending']:
-                adjustments = {str(year): 0.2 for year in range(2002, 2026)}  # Plus cher
-            elif rate_type in ['deposit', 'corporate_deposit']:
-                adjustments = {str(year): -0.1 for year in range(2002, 2026)}  # Moins rémunérateur
-                
-        return adjustments
+        dates = self._dates(start, end, freq)
+        values = self._simulate_rate_cube(bank_names, dates)
+        
+        self._rate_cube = {
+            'banks': list(bank_names),
+            'index': {bank_name: i for i, bank_name in enumerate(bank_names)},
+            'dates': dates,
+            'values': list(values)  # Une matrice (type × période) par banque
+        }
+        return dates, values
+    
+    def iter_rate_chunks(self, bank_names=None, max_chunk_bytes=64 * 1024 ** 2):
+        """
+        Générateur du cube par blocs de périodes consécutives : chaque bloc
+        (dates, valeurs banque × type × période) tient dans max_chunk_bytes.
+        Avec une graine, la concaténation des blocs est identique au cube complet.
+        """
+        if bank_names is None:
+            bank_names = list(self.banks.keys())
+        
+        dates = self._dates()
+        # Moyenne, bruit et résultat coexistent pendant la génération d'un bloc
+        chunk_periods = max(1, max_chunk_bytes // (3 * 8 * len(bank_names) * len(RATE_TYPES)))
+        for start in range(0, len(dates), chunk_periods):
+            chunk_dates = dates[start:start + chunk_periods]
+            yield chunk_dates, self._simulate_rate_cube(bank_names, chunk_dates)
+    
+    def iter_bank_chunks(self, bank_names, max_chunk_bytes=64 * 1024 ** 2,
+                         bytes_per_period=3 * 8 * len(RATE_TYPES)):
+        """
+        Générateur du cube par groupes de banques : chaque groupe (banques,
+        valeurs banque × type × période) couvre tout l'horizon et tient dans
+        max_chunk_bytes. Avec une graine, chaque banque a les mêmes séries que
+        dans le cube complet.
+        """
+        dates = self._dates()
+        chunk_banks = max(1, max_chunk_bytes // (bytes_per_period * len(dates)))
+        for start in range(0, len(bank_names), chunk_banks):
+            group = bank_names[start:start + chunk_banks]
+            yield group, self._simulate_rate_cube(group, dates)
+    
+    def iter_bank_frames(self, bank_name, max_chunk_bytes=16 * 1024 ** 2):
+        """
+        Séries complètes d'une banque (taux, actifs, écarts) en DataFrames
+        larges successifs de taille bornée, pour écrire ou agréger de longs
+        historiques quotidiens sans les matérialiser en entier.
+        """
+        assets = self._get_base_assets(bank_name)
+        first = True
+        for dates, values in self.iter_rate_chunks([bank_name], max_chunk_bytes):
+            growth = self._asset_growth(bank_name, dates)
+            if first:
+                growth[0] = 0.0
+                first = False
+            asset_values = assets * np.cumprod(1 + growth)
+            assets = asset_values[-1]
+            yield self._rate_rows(bank_name, dates, values[0], asset_values)
+    
+    def _rate_rows(self, bank_name, dates, values, asset_values):
+        """DataFrame large d'une banque : taux (type × période), actifs et écarts calculés"""
+        columns = {'Date': dates}
+        for t, rate_type in enumerate(RATE_TYPES):
+            columns[f'{bank_name} {RATE_LABELS[rate_type]}'] = values[t]
+        columns[f'{bank_name} Assets (M€)'] = asset_values
+        
+        for label, minuend, subtrahend in SPREADS:
+            columns[f'{bank_name} {label}'] = values[RATE_TYPES.index(minuend)] - values[RATE_TYPES.index(subtrahend)]
+        return pd.DataFrame(columns)
+    
+    def _simulate_rate_cube(self, bank_names, dates):
+        """Tire le bruit de toutes les périodes en un seul appel et applique les planchers par type"""
+        mean = self._rate_mean_cube(bank_names, dates)
+        if self.seed is None:
+            noise = np.random.standard_normal(mean.shape)
+        else:
+            # Bruit à compteur : une période ne dépend que de la banque et de sa date, pas
+            # des autres banques ni des périodes générées avant elle
+            noise = np.stack([self._counter_noise(bank_name, 'rates', dates, len(RATE_TYPES)).T
+                              for bank_name in bank_names])
+        noise *= RATE_NOISE_STD[None, :, None]
+        noise += mean
+        return np.maximum(noise, RATE_FLOORS[None, :, None], out=noise)
+    
+    def series(self, bank_name, label):
+        """Série paresseuse d'une banque : series('BNP Paribas Réunion', 'Mortgage Rate')['2024-01':'2024-03']"""
+        return LazyRateSeries(self, self.registry.resolve(bank_name) or bank_name, label)
+    
+    def rate_slice(self, bank_name, label, start=None, end=None):
+        """
+        Valeurs d'une série (taux ou écart) d'une banque sur [start, end], bornes
+        incluses et limitées à l'horizon. Les dates partielles couvrent toute
+        leur période ('2024-03' va jusqu'au 31 mars). Coût proportionnel à la tranche.
+        """
+        start = max(self._slice_bound(start, 'start'), pd.Timestamp(self.start)) if start is not None else pd.Timestamp(self.start)
+        end = min(self._slice_bound(end, 'end'), pd.Timestamp(self.end)) if end is not None else pd.Timestamp(self.end)
+        dates = self._dates(start, end) if start <= end else pd.DatetimeIndex([])
+        
+        values = self._with_spreads(self._simulate_rate_cube([bank_name], dates))[0]
+        return pd.Series(values[STREAM_METRICS.index(label)], index=dates, name=f'{bank_name} {label}')
+    
+    @staticmethod
+    def _slice_bound(value, side):
+        """Borne d'une tranche : une chaîne désigne toute sa période (année, mois ou jour)"""
+        if isinstance(value, str):
+            period = pd.Period(value)
+            return (period.start_time if side == 'start' else period.end_time).normalize()
+        return pd.Timestamp(value)
+    
+    def _counter_noise(self, bank_name, stream, dates, n_values):
+        """Tirages normaux (période × n_values) d'un flux, clés (graine, banque, flux), compteur = période"""
+        key = stream_key(self.seed, bank_name, stream)
+        return counter_normals(key, period_ordinals(dates, self.freq), n_values)
+    
+    def _rate_mean_cube(self, bank_names, dates):
+        """Taux attendus (banque × type × période) avant variabilité mensuelle"""
+        base_curves = self._base_rate_curves(dates)
+        
+        # Ajustements (banque × type) du registre, identiques pour toutes les années
+        adjustments = self.registry.adjustment_matrix(bank_names, RATE_TYPES)
+        
+        return base_curves[None, :, :] + adjustments[:, :, None]
+    
+    @staticmethod
+    def _base_rate_curves(dates):
+        """Courbes de base (type × période) avec valeur de repli hors historique"""
+        unique_years, year_index = np.unique(np.asarray(dates.year), return_inverse=True)
+        offsets = unique_years - HISTORY_START_YEAR
+        known = (offsets >= 0) & (offsets < BASE_RATE_HISTORY.shape[1])
+        base_curves = np.where(
+            known[None, :],
+            BASE_RATE_HISTORY[:, np.clip(offsets, 0, BASE_RATE_HISTORY.shape[1] - 1)],
+            DEFAULT_BASE_RATES[:, None]
+        )
+        return base_curves[:, year_index]
+    
+    def _metric_bounds(self, dates, width=6):
+        """
+        Bornes (série × période) des taux et des écarts pour toute banque du
+        registre ou synthétique : base ± ajustements extrêmes ± width écarts-types.
+        """
+        base_curves = self._base_rate_curves(dates)
+        low_adjustment, high_adjustment = self.registry.adjustment_range(RATE_TYPES)
+        floors = RATE_FLOORS[:, None]
+        low = np.maximum(base_curves + (low_adjustment - width * RATE_NOISE_STD)[:, None], floors)
+        high = np.maximum(base_curves + (high_adjustment + width * RATE_NOISE_STD)[:, None], floors)
+        
+        spread_low = [low[RATE_TYPES.index(a)] - high[RATE_TYPES.index(b)] for _, a, b in SPREADS]
+        spread_high = [high[RATE_TYPES.index(a)] - low[RATE_TYPES.index(b)] for _, a, b in SPREADS]
+        return np.vstack([low] + spread_low), np.vstack([high] + spread_high)
+    
+    def _bank_rate_frame(self, bank_name, rate_types):
+        """Vue d'une banque sur le cube de taux, générée à la demande"""
+        if self._rate_cube is None:
+            # Cube de tout l'univers s'il reste raisonnable, sinon de la seule banque demandée
+            cube_bytes = len(self.banks) * len(RATE_TYPES) * len(self._dates()) * 8
+            self.build_rate_cube(None if cube_bytes <= self.max_cube_bytes else [bank_name])
+        if bank_name not in self._rate_cube['index']:
+            self._extend_rate_cube([bank_name])
+        
+        cube = self._rate_cube
+        values = cube['values'][cube['index'][bank_name]]
+        data = {'Date': cube['dates']}
+        for rate_type in rate_types:
+            data[f'{bank_name} {RATE_LABELS[rate_type]}'] = values[RATE_TYPES.index(rate_type)]
+        return pd.DataFrame(data)
+    
+    @traced('rates.simulate_cube')
+    def _extend_rate_cube(self, bank_names):
+        """Ajoute des banques au cube existant sans retirer les séries déjà générées"""
+        cube = self._rate_cube
+        new_values = self._simulate_rate_cube(bank_names, cube['dates'])
+        for bank_name, values in zip(bank_names, new_values):
+            cube['index'][bank_name] = len(cube['banks'])
+            cube['banks'].append(bank_name)
+            cube['values'].append(values)
+    
+    @traced('monte_carlo')
+    def simulate_rate_paths(self, bank_names, n_paths=10000, chunk_size=None, seed=None,
+                            ranking_date='2024-01-01', percentiles=(5, 50, 95),
+                            max_chunk_bytes=64 * 1024 ** 2):
+        """
+        Mode Monte Carlo : simule n_paths trajectoires par banque par lots de
+        taille bornée et renvoie les bandes de percentiles mensuelles ainsi que
+        la probabilité pour chaque banque d'être première en dépôt et en prêt.
+        Les trajectoires restent mensuelles quelle que soit la fréquence des séries.
+        """
+        print(f"🎲 Simulation Monte Carlo de {n_paths} trajectoires pour {len(bank_names)} banques...")
+        
+        rng = np.random.default_rng(seed)
+        dates = self._dates(freq='M')
+        mean = self._rate_mean_cube(bank_names, dates)
+        noise_std = RATE_NOISE_STD[None, :, None]
+        floors = RATE_FLOORS[None, :, None]
+        
+        # Le volume d'un lot ne dépend que de chunk_size, jamais de n_paths
+        if chunk_size is None:
+            chunk_size = max(1, max_chunk_bytes // (mean.size * 8))
+        
+        histogram = StreamingHistogram(
+            np.maximum(mean - 6 * noise_std, floors),
+            np.maximum(mean + 6 * noise_std, floors)
+        )
+        ranking_index = min(dates.searchsorted(pd.Timestamp(ranking_date)), len(dates) - 1)
+        deposit = RATE_TYPES.index('deposit')
+        lending = RATE_TYPES.index('lending')
+        first_deposit = np.zeros(len(bank_names), dtype=np.int64)
+        first_lending = np.zeros(len(bank_names), dtype=np.int64)
+        
+        remaining = n_paths
+        while remaining > 0:
+            n = min(chunk_size, remaining)
+            paths = rng.standard_normal((n,) + mean.shape)
+            paths *= noise_std
+            paths += mean
+            np.maximum(paths, floors, out=paths)
+            
+            histogram.update(paths)
+            first_deposit += np.bincount(paths[:, :, deposit, ranking_index].argmax(axis=1),
+                                         minlength=len(bank_names))
+            first_lending += np.bincount(paths[:, :, lending, ranking_index].argmin(axis=1),
+                                         minlength=len(bank_names))
+            remaining -= n
+        
+        bands = {'Date': dates}
+        quantiles = histogram.percentiles(percentiles)
+        for b, bank_name in enumerate(bank_names):
+            for t, rate_type in enumerate(RATE_TYPES):
+                for q, percentile in enumerate(percentiles):
+                    bands[f'{bank_name} {RATE_LABELS[rate_type]} P{percentile}'] = quantiles[q, b, t]
+        
+        rank_probabilities = pd.DataFrame({
+            'First Deposit Probability': first_deposit / n_paths,
+            'First Lending Probability': first_lending / n_paths
+        }, index=list(bank_names))
+        
+        return {
+            'n_paths': n_paths,
+            'ranking_date': dates[ranking_index],
+            'bands': pd.DataFrame(bands),
+            'rank_probabilities': rank_probabilities
+        }
     
     def _create_simulated_data(self, bank_name, rate_type, start_year, end_year):
         """Crée des données simulées réalistes pour La Réunion"""
         dates = pd.date_range(
             start=datetime(start_year, 1, 1),
             end=datetime(end_year, 12, 31),
-            freq='M'
+            freq=self.freq
         )
+        draws = self._fallback_draws(bank_name, rate_type, dates)
         
         if 'Deposit' in rate_type and 'Corporate' not in rate_type:
-            rates = self._simulate_deposit_rates(dates, bank_name)
+            rates = self._simulate_deposit_rates(dates, bank_name, draws)
         elif 'Lending' in rate_type and 'Corporate' not in rate_type:
-            rates = self._simulate_lending_rates(dates, bank_name)
+            rates = self._simulate_lending_rates(dates, bank_name, draws)
         elif 'Mortgage' in rate_type:
-            rates = self._simulate_mortgage_rates(dates, bank_name)
+            rates = self._simulate_mortgage_rates(dates, bank_name, draws)
         elif 'Corporate Deposit' in rate_type:
-            rates = self._simulate_corporate_deposit(dates, bank_name)
+            rates = self._simulate_corporate_deposit(dates, bank_name, draws)
         elif 'Corporate Lending' in rate_type:
-            rates = self._simulate_corporate_lending(dates, bank_name)
+            rates = self._simulate_corporate_lending(dates, bank_name, draws)
         else:
-            rates = np.random.uniform(0.5, 5.0, len(dates))
+            rates = 0.5 + 4.5 * draws[:, 1]
         
         return pd.DataFrame({'Date': dates, f'{bank_name} {rate_type}': rates})
     
-    def _simulate_deposit_rates(self, dates, bank_name):
+    def _fallback_draws(self, bank_name, rate_type, dates):
+        """
+        Tirages (période × 3) des données de repli : un normal N(0, 1) et deux
+        uniformes [0, 1). Avec une graine, flux à compteur (graine, banque,
+        série) comme le chemin principal ; sinon flux global np.random.
+        """
+        if self.seed is None:
+            return np.column_stack([np.random.standard_normal(len(dates)), np.random.random_sample((len(dates), 2))])
+        key = stream_key(self.seed, bank_name, f'{rate_type} spreads')
+        uniforms = counter_uniforms(key, period_ordinals(dates, self.freq), 2)
+        return np.column_stack([self._counter_noise(bank_name, rate_type, dates, 1), uniforms])
+    
+    def _simulate_deposit_rates(self, dates, bank_name, draws):
         """Simulation réaliste des taux de dépôt à La Réunion"""
         rates = []
-        for date in dates:
+        for date, shock in zip(dates, draws[:, 0]):
             year = date.year
             # Historique des taux de dépôt basé sur BCE
             if 2002 <= year <= 2004:
@@ -372,85 +684,84 @@ class ReunionBanksInterestRates:
                 
             # Ajustement banque
             adjustment = self._get_bank_adjustment_value(bank_name, 'deposit')
-            rates.append(max(0.1, rate + adjustment + np.random.normal(0, 0.05)))
+            rates.append(max(0.1, rate + adjustment + 0.05 * shock))
         return rates
     
-    def _simulate_lending_rates(self, dates, bank_name):
+    def _simulate_lending_rates(self, dates, bank_name, draws):
         """Simulation réaliste des taux de prêt à La Réunion"""
-        deposit_rates = self._simulate_deposit_rates(dates, bank_name)
+        deposit_rates = self._simulate_deposit_rates(dates, bank_name, draws)
         # Spread typique de 2-3% à La Réunion
-        return [r + np.random.uniform(2.0, 3.0) for r in deposit_rates]
+        return [r + 2.0 + u for r, u in zip(deposit_rates, draws[:, 1])]
     
-    def _simulate_mortgage_rates(self, dates, bank_name):
+    def _simulate_mortgage_rates(self, dates, bank_name, draws):
         """Simulation des taux hypothécaires à La Réunion"""
-        lending_rates = self._simulate_lending_rates(dates, bank_name)
+        lending_rates = self._simulate_lending_rates(dates, bank_name, draws)
         # Taux hypothécaire généralement inférieur au prêt classique
-        return [r - np.random.uniform(0.5, 1.0) for r in lending_rates]
+        return [r - (0.5 + 0.5 * u) for r, u in zip(lending_rates, draws[:, 2])]
     
-    def _simulate_corporate_deposit(self, dates, bank_name):
+    def _simulate_corporate_deposit(self, dates, bank_name, draws):
         """Simulation des taux dépôt entreprises"""
-        retail_deposit = self._simulate_deposit_rates(dates, bank_name)
+        retail_deposit = self._simulate_deposit_rates(dates, bank_name, draws)
         # Taux entreprises généralement plus bas
-        return [r - np.random.uniform(0.5, 1.0) for r in retail_deposit]
+        return [r - (0.5 + 0.5 * u) for r, u in zip(retail_deposit, draws[:, 2])]
     
-    def _simulate_corporate_lending(self, dates, bank_name):
+    def _simulate_corporate_lending(self, dates, bank_name, draws):
         """Simulation des taux prêt entreprises"""
-        retail_lending = self._simulate_lending_rates(dates, bank_name)
+        retail_lending = self._simulate_lending_rates(dates, bank_name, draws)
         # Taux entreprises similaires ou légèrement inférieurs
-        return [r - np.random.uniform(0.0, 0.5) for r in retail_lending]
+        return [r - 0.5 * u for r, u in zip(retail_lending, draws[:, 2])]
     
     def _get_bank_adjustment_value(self, bank_name, rate_type):
         """Retourne un ajustement numérique pour une banque"""
-        adjustments = self._get_bank_adjustments(bank_name, rate_type)
-        if adjustments:
-            return list(adjustments.values())[0]  # Prend la première valeur
-        return 0.0
+        return self.registry.adjustment(bank_name, rate_type)
     
+    @traced('rates.assets')
     def get_bank_assets(self, bank_name):
         """
         Actifs des banques de La Réunion (estimation)
         """
         try:
-            dates = pd.date_range(start='2002-01-01', end='2025-12-31', freq='M')
-            
-            # Actifs historiques approximatifs (en millions d'euros)
-            base_assets = {
-                'Crédit Agricole de La Réunion': 8000,
-                'Banque de La Réunion (BLR)': 3500,
-                'Banque Française Commerciale Océan Indien (BFC OI)': 2500,
-                'Société Générale Réunion': 4500,
-                'BNP Paribas Réunion': 4000,
-                'Banque Populaire Réunion': 3000,
-                'Caisse d\'Épargne Réunion': 3500,
-                'Crédit Immobilier de l\'Océan Indien (CIOI)': 1200,
-                'HSBC Réunion': 1500,
-                'CIC Réunion': 2000
-            }
+            dates = self._dates()
+            base_value = self._get_base_assets(bank_name)
             
-            base_value = base_assets.get(bank_name, 2000)
+            # Croissance réaliste pour La Réunion : 3% par an en moyenne,
+            # composée période par période à partir de la valeur initiale
+            growth = self._asset_growth(bank_name, dates)
+            growth[0] = 0.0
+            assets = base_value * np.cumprod(1 + growth)
             
-            monthly_assets = []
-            for i, date in enumerate(dates):
-                # Croissance réaliste pour La Réunion
-                years_from_start = (date.year - 2002) + (date.month - 1) / 12
-                growth_rate = 0.03  # 3% par an en moyenne
-                monthly_growth = np.random.normal(growth_rate/12, 0.002)
-                
-                if i == 0:
-                    asset_value = base_value
-                else:
-                    asset_value = monthly_assets[-1] * (1 + monthly_growth)
-                monthly_assets.append(asset_value)
-            
-            return pd.DataFrame({'Date': dates, f'{bank_name} Assets (M€)': monthly_assets})
+            return pd.DataFrame({'Date': dates, f'{bank_name} Assets (M€)': assets})
             
         except Exception as e:
             print(f"❌ Erreur assets data {bank_name}: {e}")
-            return self._create_simulated_data(bank_name, 'Assets (M€)', 2002, 2025)
+            return self._create_simulated_data(bank_name, 'Assets (M€)', self.start_year, self.end_year)
+    
+    def _asset_growth(self, bank_name, dates):
+        """Taux de croissance des actifs par période, mis à l'échelle de la fréquence"""
+        periods = periods_per_year(self.freq)
+        if self.seed is None:
+            shocks = np.random.standard_normal(len(dates))
+        else:
+            shocks = self._counter_noise(bank_name, 'assets', dates, 1)[:, 0]
+        return ASSET_GROWTH_RATE / periods + ASSET_GROWTH_MONTHLY_STD * np.sqrt(12 / periods) * shocks
+    
+    def _get_base_assets(self, bank_name):
+        """Actifs initiaux d'une banque (en millions d'euros)"""
+        return self.registry.base_asset_value(bank_name)
     
     def get_all_bank_rates(self, bank_name):
         """Récupère tous les taux d'une banque spécifique"""
-        print(f"🚀 Début de la récupération des taux pour {bank_name} (2002-2025)...")
+        # Sans graine les séries ne sont pas reproductibles : pas de cache
+        if self.cache is None or self.seed is None:
+            return self._generate_all_bank_rates(bank_name)
+        
+        key = self.cache.key(bank_name, 'rates', self.start, self.end,
+                             {'freq': self.freq, 'registry': self.registry.version}, self.seed, CODE_VERSION)
+        return self.cache.get_or_compute(key, lambda: self._generate_all_bank_rates(bank_name))
+    
+    def _generate_all_bank_rates(self, bank_name):
+        """Génère et assemble tous les taux d'une banque"""
+        print(f"🚀 Début de la récupération des taux pour {bank_name} ({self.start_year}-{self.end_year})...")
         
         # Récupérer toutes les données
         deposit_rate = self.get_historical_deposit_rates(bank_name)
@@ -459,26 +770,64 @@ class ReunionBanksInterestRates:
         corporate_rates = self.get_corporate_rates(bank_name)
         assets = self.get_bank_assets(bank_name)
         
-        # Fusionner les données
-        all_data = deposit_rate
-        for df in [lending_rate, mortgage_rate, corporate_rates, assets]:
-            all_data = pd.merge(all_data, df, on='Date', how='outer')
-        
-        # Nettoyer et interpoler
-        all_data = all_data.sort_values('Date')
-        all_data = all_data.set_index('Date')
-        all_data = all_data.interpolate(method='time')
-        all_data = all_data.reset_index()
+        # Assembler les colonnes sur l'index de dates partagé
+        dates, columns = self._align_columns([deposit_rate, lending_rate, mortgage_rate, corporate_rates, assets])
         
         # Ajouter des indicateurs calculés
-        all_data[f'{bank_name} Retail Spread'] = all_data[f'{bank_name} Lending Rate'] - all_data[f'{bank_name} Deposit Rate']
-        all_data[f'{bank_name} Corporate Spread'] = all_data[f'{bank_name} Corporate Lending Rate'] - all_data[f'{bank_name} Corporate Deposit Rate']
-        all_data[f'{bank_name} Mortgage Discount'] = all_data[f'{bank_name} Lending Rate'] - all_data[f'{bank_name} Mortgage Rate']
+        for label, minuend, subtrahend in SPREADS:
+            columns[f'{bank_name} {label}'] = (columns[f'{bank_name} {RATE_LABELS[minuend]}']
+                                               - columns[f'{bank_name} {RATE_LABELS[subtrahend]}'])
+        
+        all_data = pd.DataFrame({'Date': dates, **columns})
         
         return all_data
     
-    def create_comparative_analysis(self, selected_banks=None):
-        """Crée une analyse comparative de toutes les banques"""
+    @traced('rates.merge')
+    def _align_columns(self, frames):
+        """
+        Aligne des séries sur un index de dates unique alloué une seule fois.
+        Les colonnes déjà alignées sont reprises telles quelles ; l'interpolation
+        temporelle n'a lieu que si une source présente réellement des trous.
+        """
+        dates = pd.DatetimeIndex(frames[0]['Date'])
+        for df in frames[1:]:
+            if not self._has_dates(df, dates):
+                dates = dates.union(pd.DatetimeIndex(df['Date']))
+        
+        columns = {}
+        has_gaps = False
+        for df in frames:
+            if self._has_dates(df, dates):
+                for column in df.columns.drop('Date'):
+                    columns[column] = df[column].to_numpy()
+            else:
+                reindexed = df.set_index('Date').reindex(dates)
+                for column in reindexed.columns:
+                    columns[column] = reindexed[column].to_numpy()
+                has_gaps = True
+        
+        has_gaps = has_gaps or any(np.isnan(values).any() for values in columns.values())
+        if has_gaps:
+            with span('rates.interpolate'):
+                filled = pd.DataFrame(columns, index=dates).interpolate(method='time')
+                columns = {column: filled[column].to_numpy() for column in filled.columns}
+        
+        return dates, columns
+    
+    @staticmethod
+    def _has_dates(df, dates):
+        """Vrai si la colonne Date du DataFrame est exactement l'index donné"""
+        return len(df) == len(dates) and np.array_equal(df['Date'].to_numpy(), dates.to_numpy())
+    
+    def create_comparative_analysis(self, selected_banks=None, monte_carlo_paths=None, seed=None,
+                                    parallel=False, max_workers=None, incremental=False, end=None,
+                                    render=None, plots=True, report_year=2024, rolling_window=None,
+                                    compact=False):
+        """
+        Crée une analyse comparative de toutes les banques. En mode compact,
+        le second élément renvoyé est un CompactRates au lieu du dictionnaire
+        de DataFrames par banque.
+        """
         if selected_banks is None:
             selected_banks = list(self.banks.keys())[:6]  # Limiter à 6 banques pour la lisibilité
         
@@ -488,136 +837,501 @@ class ReunionBanksInterestRates:
         all_banks_data = {}
         
         # Récupérer les données pour chaque banque sélectionnée
-        for bank_name in selected_banks:
-            print(f"\n📊 Traitement de {bank_name}...")
-            bank_data = self.get_all_bank_rates(bank_name)
-            all_banks_data[bank_name] = bank_data
-            
-            # Sauvegarder individuellement
-            filename = f"{bank_name.replace(' ', '_').replace('(', '').replace(')', '')}_rates_2002_2025.csv"
-            bank_data.to_csv(filename, index=False)
-            print(f"💾 Fichier sauvegardé: {filename}")
+        if compact:
+            all_banks_data = self.compact_rates(selected_banks)
+            for bank_name in selected_banks:
+                with span('bank', bank=bank_name):
+                    filename = self._write_bank_frame(all_banks_data.bank_frame(bank_name), bank_name)
+                print(f"💾 Fichier sauvegardé: {filename}")
+        elif parallel:
+            with span('banks.parallel', banks=len(selected_banks)):
+                all_banks_data = self._process_banks_parallel(selected_banks, max_workers, incremental, end)
+        else:
+            for bank_name in selected_banks:
+                print(f"\n📊 Traitement de {bank_name}...")
+                with span('bank', bank=bank_name):
+                    bank_data, filename = self._process_bank(bank_name, incremental, end)
+                all_banks_data[bank_name] = bank_data
+                print(f"💾 Fichier sauvegardé: {filename}")
         
         # Créer un DataFrame combiné pour l'analyse comparative
-        comparative_data = self._create_comparative_dataframe(all_banks_data, selected_banks)
+        if compact:
+            comparative_data = all_banks_data.wide_frame(SNAPSHOT_LABELS)
+        else:
+            comparative_data = self._create_comparative_dataframe(all_banks_data, selected_banks)
+        as_of_index = AsOfIndex(comparative_data)
         
         # Générer les visualisations comparatives
-        self._create_comparative_visualizations(comparative_data, selected_banks)
+        if plots:
+            self._create_comparative_visualizations(comparative_data, selected_banks, render,
+                                                    report_year, as_of_index)
+        
+        # Probabilités de classement sur plusieurs trajectoires (optionnel)
+        monte_carlo = None
+        if monte_carlo_paths:
+            monte_carlo = self.simulate_rate_paths(selected_banks, n_paths=monte_carlo_paths,
+                                                   seed=seed if seed is not None else self.seed,
+                                                   ranking_date=f'{report_year}-01-01')
         
         # Générer le rapport comparatif
-        self._generate_comparative_report(comparative_data, selected_banks)
+        self._generate_comparative_report(comparative_data, selected_banks, monte_carlo,
+                                          report_year, as_of_index)
+        
+        # Suivi glissant (volatilités, écarts au médian, corrélations) optionnel
+        if rolling_window:
+            self._print_rolling_report(self.rolling_analytics(selected_banks, window=rolling_window))
         
         return comparative_data, all_banks_data
     
+    @traced('stream')
+    def create_streaming_analysis(self, bank_names=None, synthetic_banks=0, write=True, report_year=2024,
+                                  max_chunk_bytes=64 * 1024 ** 2, percentiles=(5, 50, 95), n_bins=64, top_k=10):
+        """
+        Pipeline en flux pour de très grands univers (10 000 banques et plus) :
+        les banques traversent génération → écarts → écriture → agrégation par
+        groupes de taille bornée, et seuls les agrégats inter-banques sont
+        conservés (moyenne, écart-type, percentiles par période, classements
+        à la date de référence). La mémoire ne dépend pas du nombre de banques.
+        """
+        if bank_names is None:
+            bank_names = list(self.banks.keys())
+        bank_names = list(bank_names)
+        if synthetic_banks:
+            bank_names += self.add_synthetic_banks(synthetic_banks)
+        
+        print(f"🌊 ANALYSE EN FLUX DE {len(bank_names)} BANQUES ({self.start_year}-{self.end_year}, fréquence {self.freq})")
+        print("=" * 60)
+        
+        dates = self._dates()
+        ranking_index = min(dates.searchsorted(pd.Timestamp(f'{report_year}-01-01')), len(dates) - 1)
+        deposit = RATE_TYPES.index('deposit')
+        lending = RATE_TYPES.index('lending')
+        
+        # Agrégats en ligne : moments et histogrammes (série × période), total des actifs, meilleurs classements
+        moments = RunningMoments((len(STREAM_METRICS), len(dates)))
+        histogram = StreamingHistogram(*self._metric_bounds(dates), n_bins=n_bins)
+        total_assets = np.zeros(len(dates))
+        best_deposit, best_lending = [], []
+        
+        # Par banque et par période : moyenne et bruit du cube, séries agrégées et temporaires de l'histogramme
+        bytes_per_period = 8 * (2 * len(RATE_TYPES) + 3 * len(STREAM_METRICS))
+        for group, values in self.iter_bank_chunks(bank_names, max_chunk_bytes, bytes_per_period):
+            with span('stream.chunk', banks=len(group)):
+                # Écarts dérivés pour tout le groupe
+                metrics = self._with_spreads(values)
+                
+                # Actifs et écriture, banque par banque (un seul DataFrame en mémoire)
+                for b, bank_name in enumerate(group):
+                    growth = self._asset_growth(bank_name, dates)
+                    growth[0] = 0.0
+                    assets = self._get_base_assets(bank_name) * np.cumprod(1 + growth)
+                    total_assets += assets
+                    if write:
+                        self._write_bank_frame(self._rate_rows(bank_name, dates, values[b], assets), bank_name)
+                    instrumentation.count('banks')
+                
+                # Agrégation inter-banques du groupe
+                moments.update(metrics)
+                histogram.update(metrics)
+                best_deposit = heapq.nlargest(top_k, best_deposit + list(zip(metrics[:, deposit, ranking_index], group)))
+                best_lending = heapq.nsmallest(top_k, best_lending + list(zip(metrics[:, lending, ranking_index], group)))
+            print(f"  ✓ {moments.count}/{len(bank_names)} banques traitées")
+        
+        summary = {'Date': dates}
+        quantiles = histogram.percentiles(percentiles)
+        std = moments.std()
+        for m, metric in enumerate(STREAM_METRICS):
+            summary[f'{metric} Mean'] = moments.mean[m]
+            summary[f'{metric} Std'] = std[m]
+            for q, percentile in enumerate(percentiles):
+                summary[f'{metric} P{percentile}'] = quantiles[q, m]
+        summary['Total Assets (M€)'] = total_assets
+        summary = pd.DataFrame(summary)
+        
+        if write:
+            suffix = '' if self.freq == 'M' else f'_{self.freq}'
+            filename = f"synthese_flux_{self.start_year}_{self.end_year}{suffix}.csv"
+            summary.to_csv(filename, index=False)
+            print(f"💾 Synthèse sauvegardée: {filename}")
+        
+        result = {
+            'n_banks': moments.count,
+            'ranking_date': dates[ranking_index],
+            'summary': summary,
+            'deposit_ranking': [(bank_name, float(rate)) for rate, bank_name in best_deposit],
+            'lending_ranking': [(bank_name, float(rate)) for rate, bank_name in best_lending]
+        }
+        self._print_streaming_report(result, percentiles)
+        return result
+    
+    @staticmethod
+    def _with_spreads(values):
+        """Cube (banque × type × période) complété des écarts : séries STREAM_METRICS"""
+        return np.concatenate([values] + [(values[:, RATE_TYPES.index(a)] - values[:, RATE_TYPES.index(b)])[:, None]
+                                          for _, a, b in SPREADS], axis=1)
+    
+    @traced('rates.compact')
+    def compact_rates(self, bank_names=None, max_chunk_bytes=64 * 1024 ** 2):
+        """
+        Mode compact : taux et actifs des banques dans un seul tableau float32
+        (série × banque × période) sur un index de dates partagé, rempli groupe
+        par groupe sans jamais matérialiser le cube en float64. Les écarts sont
+        calculés à la demande.
+        """
+        from compact_frames import CompactRates
+        
+        bank_names = list(bank_names) if bank_names is not None else list(self.banks.keys())
+        dates = self._dates()
+        labels = tuple(RATE_LABELS[rate_type] for rate_type in RATE_TYPES) + ('Assets (M€)',)
+        values = np.empty((len(labels), len(bank_names), len(dates)), dtype=np.float32)
+        
+        start = 0
+        for group, chunk in self.iter_bank_chunks(bank_names, max_chunk_bytes):
+            values[:len(RATE_TYPES), start:start + len(group)] = chunk.transpose(1, 0, 2)
+            for b, bank_name in enumerate(group, start):
+                growth = self._asset_growth(bank_name, dates)
+                growth[0] = 0.0
+                values[-1, b] = self._get_base_assets(bank_name) * np.cumprod(1 + growth)
+            start += len(group)
+        
+        spreads = {label: (RATE_LABELS[minuend], RATE_LABELS[subtrahend]) for label, minuend, subtrahend in SPREADS}
+        return CompactRates(dates, bank_names, labels, values, spreads)
+    
+    def _cube_values(self, bank_names):
+        """Dates et tableau (banque × type × période) des banques demandées, tirés du cube partagé"""
+        if self._rate_cube is None:
+            self.build_rate_cube(bank_names)
+        missing = [bank_name for bank_name in bank_names if bank_name not in self._rate_cube['index']]
+        if missing:
+            self._extend_rate_cube(missing)
+        cube = self._rate_cube
+        return cube['dates'], np.stack([cube['values'][cube['index'][bank_name]] for bank_name in bank_names])
+    
+    @traced('rolling')
+    def rolling_analytics(self, bank_names, window=12, correlation_series='Deposit Rate',
+                          correlation_window=None, correlation_step=None):
+        """
+        Suivi glissant de toutes les banques à la fois, pour chaque taux et
+        chaque écart (STREAM_METRICS) : moyenne et volatilité (écart-type des
+        variations) sur window périodes, écart au médian inter-banques en
+        écarts-types, et matrices de corrélation entre banques des variations
+        de correlation_series, une fenêtre toutes les correlation_step périodes.
+        """
+        from rolling_analytics import rolling_mean, rolling_volatility, median_zscores, rolling_correlation
+        
+        bank_names = list(bank_names)
+        dates, values = self._cube_values(bank_names)
+        metrics = self._with_spreads(values)
+        
+        correlation_window = correlation_window or window
+        series = metrics[:, STREAM_METRICS.index(correlation_series)]
+        ends, correlations = rolling_correlation(np.diff(series, axis=-1), correlation_window,
+                                                 step=correlation_step or correlation_window)
+        
+        return {
+            'dates': dates,
+            'banks': bank_names,
+            'metrics': STREAM_METRICS,
+            'mean': rolling_mean(metrics, window),
+            'volatility': rolling_volatility(metrics, window),
+            'zscore': median_zscores(metrics, axis=0),
+            'correlation_series': correlation_series,
+            'correlation_dates': dates[ends + 1],  # Variations : la fenêtre se termine à la période suivante
+            'correlation': correlations
+        }
+    
+    def _print_rolling_report(self, rolling, top=3):
+        """Volatilités récentes, écarts au médian et banques les plus corrélées"""
+        from rolling_analytics import most_correlated_pairs
+        
+        print(f"\n📈 SUIVI GLISSANT AU {rolling['dates'][-1].date()}:")
+        for label in ('Deposit Rate', 'Lending Rate', 'Retail Spread'):
+            m = rolling['metrics'].index(label)
+            volatility = rolling['volatility'][:, m, -1]
+            zscores = rolling['zscore'][:, m, -1]
+            outlier = int(np.nanargmax(np.abs(zscores))) if np.isfinite(zscores).any() else 0
+            print(f"  {label}: volatilité médiane {np.nanmedian(volatility):.3f} pt, "
+                  f"plus grand écart au médian {rolling['banks'][outlier]} ({zscores[outlier]:+.2f} σ)")
+        
+        if len(rolling['correlation']):
+            print(f"\n🔗 CORRÉLATIONS ({rolling['correlation_series']}, fenêtre au {rolling['correlation_dates'][-1].date()}):")
+            for bank_a, bank_b, correlation in most_correlated_pairs(rolling['correlation'][-1], rolling['banks'], top):
+                print(f"  {bank_a} ↔ {bank_b}: {correlation:+.2f}")
+    
+    def _print_streaming_report(self, result, percentiles):
+        """Rapport des agrégats du pipeline en flux à la date de référence"""
+        row = result['summary'].iloc[result['summary']['Date'].searchsorted(result['ranking_date'])]
+        print(f"\n📊 SYNTHÈSE DE {result['n_banks']} BANQUES AU {result['ranking_date'].date()}:")
+        for metric in ('Deposit Rate', 'Lending Rate', 'Retail Spread'):
+            bands = ', '.join(f"P{percentile} {row[f'{metric} P{percentile}']:.2f}%" for percentile in percentiles)
+            print(f"  {metric}: moyenne {row[f'{metric} Mean']:.2f}% (σ {row[f'{metric} Std']:.2f}), {bands}")
+        print(f"  Actifs cumulés: {row['Total Assets (M€)']:,.0f} M€")
+        
+        print("\n🏆 MEILLEURS TAUX DE DÉPÔT:")
+        for i, (bank, rate) in enumerate(result['deposit_ranking'], 1):
+            print(f"  {i}. {bank}: {rate:.2f}%")
+        print("\n🏆 MEILLEURS TAUX DE PRÊT (plus bas = mieux):")
+        for i, (bank, rate) in enumerate(result['lending_ranking'], 1):
+            print(f"  {i}. {bank}: {rate:.2f}%")
+    
+    def _process_bank(self, bank_name, incremental=False, end=None):
+        """Génère les taux d'une banque et les sauvegarde (stockage partitionné ou CSV)"""
+        instrumentation.count('banks')
+        if self.output == 'store':
+            destination = f"{self.store.root} (banque={bank_name})"
+            if incremental and self.store.last_row(bank_name) is not None:
+                self.update_bank_store(bank_name, end=end or self.end)
+                return self.store.read_bank_frame(bank_name), destination
+            
+            bank_data = self.get_all_bank_rates(bank_name)
+            return bank_data, self._write_bank_frame(bank_data, bank_name)
+        
+        filename = self._bank_filename(bank_name)
+        existing = self._existing_bank_csv(bank_name) if incremental else None
+        if existing is not None:
+            previous, previous_end_year = existing
+            self.update_bank_csv(bank_name, end=end or self.end, filename=previous)
+            # Le fichier complété prend le nom de son nouvel horizon
+            if previous_end_year < self.end_year:
+                os.replace(previous, filename)
+                print(f"🔁 {previous} renommé en {filename}")
+            else:
+                filename = previous
+            return pd.read_csv(filename, parse_dates=['Date']), filename
+        
+        bank_data = self.get_all_bank_rates(bank_name)
+        return bank_data, self._write_bank_frame(bank_data, bank_name)
+    
+    def _write_bank_frame(self, bank_data, bank_name):
+        """Écrit les séries complètes d'une banque et renvoie leur destination"""
+        if self.output == 'store':
+            with span('write.store', bank=bank_name):
+                self.store.write_bank_frame(bank_data, bank_name)
+            return f"{self.store.root} (banque={bank_name})"
+        
+        filename = self._bank_filename(bank_name)
+        with span('write.csv', bank=bank_name):
+            bank_data.to_csv(filename, index=False)
+        return filename
+    
+    def _bank_filename(self, bank_name, end_year=None):
+        """Nom du fichier CSV individuel d'une banque (horizon, et fréquence si non mensuelle)"""
+        suffix = '' if self.freq == 'M' else f'_{self.freq}'
+        return (f"{bank_name.replace(' ', '_').replace('(', '').replace(')', '')}"
+                f"_rates_{self.start_year}_{end_year or self.end_year}{suffix}.csv")
+    
+    def _existing_bank_csv(self, bank_name):
+        """
+        Fichier CSV existant d'une banque pour la même année de départ et la même
+        fréquence, quelle que soit son année de fin : (chemin, année de fin) du
+        plus récent, ou None. Permet au mode incrémental de compléter le fichier
+        d'une exécution précédente lorsque --end a changé.
+        """
+        head, tail = self._bank_filename(bank_name, end_year='*').split('*')
+        pattern = re.compile(re.escape(head) + r'(\d{4})' + re.escape(tail) + '$')
+        candidates = []
+        for path in glob.glob(glob.escape(head) + '*' + glob.escape(tail)):
+            match = pattern.match(path)
+            if match:
+                candidates.append((int(match.group(1)), path))
+        if not candidates:
+            return None
+        end_year, path = max(candidates)
+        return path, end_year
+    
+    def update_bank_csv(self, bank_name, end=None, filename=None):
+        """
+        Mode incrémental : lit la dernière ligne du fichier existant, génère
+        uniquement les périodes postérieures à la dernière date enregistrée et
+        les ajoute en fin de fichier. Les écarts ne sont calculés que pour ces
+        nouvelles lignes. Renvoie le nombre de périodes ajoutées.
+        """
+        filename = filename or self._bank_filename(bank_name)
+        header, last_row = self._read_csv_tail(filename)
+        last_row = dict(zip(header, last_row))
+        
+        new_rows = self._generate_rows_after(bank_name, pd.Timestamp(last_row['Date']),
+                                             float(last_row[f'{bank_name} Assets (M€)']), end or self.end)
+        if new_rows.empty:
+            print(f"✅ {filename} déjà à jour ({last_row['Date']})")
+            return 0
+        
+        new_rows[header].to_csv(filename, mode='a', header=False, index=False)
+        print(f"➕ {len(new_rows)} périodes ajoutées à {filename}")
+        return len(new_rows)
+    
+    def update_bank_store(self, bank_name, end=None):
+        """
+        Mode incrémental du stockage partitionné : seules la dernière partition
+        annuelle est lue et les nouvelles périodes sont écrites dans de nouveaux
+        fichiers de partition. Renvoie le nombre de périodes ajoutées.
+        """
+        last_date, last_values = self.store.last_row(bank_name)
+        new_rows = self._generate_rows_after(bank_name, last_date, last_values['Assets (M€)'], end or self.end)
+        if new_rows.empty:
+            print(f"✅ {bank_name} déjà à jour ({last_date.date()})")
+            return 0
+        
+        self.store.write_bank_frame(new_rows, bank_name, mode='append')
+        print(f"➕ {len(new_rows)} périodes ajoutées pour {bank_name}")
+        return len(new_rows)
+    
+    def _generate_rows_after(self, bank_name, last_date, last_assets, end):
+        """Lignes (format large) des périodes postérieures à last_date, jusqu'à end"""
+        dates = self._dates(start=last_date + pd.Timedelta(days=1), end=end)
+        
+        # Taux des nouvelles périodes uniquement
+        values = self._simulate_rate_cube([bank_name], dates)[0]
+        
+        # Actifs : la croissance reprend à partir de la dernière valeur
+        assets = last_assets * np.cumprod(1 + self._asset_growth(bank_name, dates))
+        
+        # Indicateurs calculés pour les nouvelles lignes seulement
+        return self._rate_rows(bank_name, dates, values, assets)
+    
+    @staticmethod
+    def _read_csv_tail(filename, block_size=8192):
+        """En-tête et dernière ligne d'un CSV, sans lire tout le fichier"""
+        with open(filename, 'rb') as f:
+            header = next(csv.reader([f.readline().decode('utf-8')]))
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            
+            tail = b''
+            position = size
+            while position > 0 and tail.strip().count(b'\n') < 1:
+                position = max(0, position - block_size)
+                f.seek(position)
+                tail = f.read(size - position)
+        
+        last_line = tail.strip().split(b'\n')[-1].decode('utf-8')
+        return header, next(csv.reader([last_line]))
+    
+    def _process_banks_parallel(self, selected_banks, max_workers=None, incremental=False, end=None):
+        """
+        Répartit les banques sur un pool de processus. Le bruit d'une banque
+        vient de flux Philox à compteur de clés (graine, banque, flux), qui ne
+        dépendent ni des autres banques ni de l'ordre de traitement : le
+        résultat est identique à l'exécution séquentielle avec la même graine.
+        """
+        # Sans graine, une graine propre à cette exécution (l'instance reste non reproductible)
+        seed = self.seed
+        if seed is None:
+            seed = np.random.SeedSequence().entropy
+            print(f"🎲 Graine maîtresse générée: {seed}")
+        
+        max_workers = max_workers or os.cpu_count()
+        cache_dir = self.cache.directory if self.cache is not None else None
+        print(f"\n⚙️  Traitement parallèle de {len(selected_banks)} banques sur {max_workers} processus...")
+        
+        store_dir = self.store.root if self.store is not None else None
+        horizon = (self.start, self.end, self.freq)
+        tasks = [(seed, bank_name, cache_dir, self.output, store_dir, incremental, end, horizon, self.registry)
+                 for bank_name in selected_banks]
+        chunksize = max(1, len(tasks) // (max_workers * 4))
+        
+        all_banks_data = {}
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            for bank_name, (bank_data, filename) in zip(selected_banks,
+                                                         executor.map(_process_bank_worker, tasks, chunksize=chunksize)):
+                all_banks_data[bank_name] = bank_data
+                print(f"💾 Fichier sauvegardé: {filename}")
+        return all_banks_data
+    
+    def add_synthetic_banks(self, count, prefix='Banque Synthétique'):
+        """Ajoute des banques fictives à l'univers pour les tests de charge"""
+        width = len(str(count))
+        names = [f"{prefix} {i:0{width}d}" for i in range(1, count + 1)]
+        for bank_name in names:
+            self.banks[bank_name] = {
+                'website': None,
+                'type': 'Banque synthétique',
+                'founded': 2000
+            }
+        return names
+    
+    @traced('comparative.merge')
     def _create_comparative_dataframe(self, all_banks_data, selected_banks):
         """Crée un DataFrame combiné pour l'analyse comparative"""
-        # Prendre la première banque comme base
-        base_bank = selected_banks[0]
-        comparative_df = all_banks_data[base_bank][['Date']].copy()
+        # Prendre la première banque comme base : un seul index de dates
+        dates = pd.DatetimeIndex(all_banks_data[selected_banks[0]]['Date'])
+        columns = {'Date': dates}
         
-        # Ajouter les taux de dépôt de toutes les banques
+        # Ajouter les taux de dépôt, prêt et hypothécaires de toutes les banques
         for bank_name in selected_banks:
             bank_data = all_banks_data[bank_name]
-            comparative_df = pd.merge(comparative_df, bank_data[['Date', f'{bank_name} Deposit Rate']], on='Date', how='left')
-            comparative_df = pd.merge(comparative_df, bank_data[['Date', f'{bank_name} Lending Rate']], on='Date', how='left')
-            comparative_df = pd.merge(comparative_df, bank_data[['Date', f'{bank_name} Mortgage Rate']], on='Date', how='left')
+            names = [f'{bank_name} Deposit Rate', f'{bank_name} Lending Rate', f'{bank_name} Mortgage Rate']
+            if not self._has_dates(bank_data, dates):
+                bank_data = bank_data.set_index('Date')[names].reindex(dates)
+            for name in names:
+                columns[name] = bank_data[name].to_numpy()
+        
+        comparative_df = pd.DataFrame(columns)
         
         return comparative_df
     
-    def _create_comparative_visualizations(self, df, selected_banks):
-        """Crée des visualisations comparatives"""
-        plt.style.use('seaborn-v0_8')
-        
-        # 1. Graphique des taux de dépôt comparatifs
-        plt.figure(figsize=(15, 10))
-        
-        colors = plt.cm.Set3(np.linspace(0, 1, len(selected_banks)))
-        
-        for i, bank_name in enumerate(selected_banks):
-            plt.plot(df['Date'], df[f'{bank_name} Deposit Rate'], 
-                    label=bank_name, linewidth=2, color=colors[i])
-        
-        plt.title('Comparaison des Taux de Dépôt - Banques de La Réunion (2002-2025)', 
-                 fontsize=14, fontweight='bold')
-        plt.ylabel('Taux de Dépôt (%)')
-        plt.xlabel('Année')
-        plt.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
-        plt.grid(True, alpha=0.3)
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-        plt.savefig('comparaison_taux_depot_reunion.png', dpi=300, bbox_inches='tight')
-        plt.show()
-        
-        # 2. Graphique des taux de prêt comparatifs
-        plt.figure(figsize=(15, 10))
-        
-        for i, bank_name in enumerate(selected_banks):
-            plt.plot(df['Date'], df[f'{bank_name} Lending Rate'], 
-                    label=bank_name, linewidth=2, color=colors[i])
-        
-        plt.title('Comparaison des Taux de Prêt - Banques de La Réunion (2002-2025)', 
-                 fontsize=14, fontweight='bold')
-        plt.ylabel('Taux de Prêt (%)')
-        plt.xlabel('Année')
-        plt.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
-        plt.grid(True, alpha=0.3)
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-        plt.savefig('comparaison_taux_pret_reunion.png', dpi=300, bbox_inches='tight')
-        plt.show()
-        
-        # 3. Heatmap des taux 2024
-        current_rates_2024 = {}
-        for bank_name in selected_banks:
-            latest_data = df[df['Date'] >= '2024-01-01'].iloc[0]
-            current_rates_2024[bank_name] = {
-                'Dépôt': latest_data[f'{bank_name} Deposit Rate'],
-                'Prêt': latest_data[f'{bank_name} Lending Rate'],
-                'Hypothèque': latest_data[f'{bank_name} Mortgage Rate']
-            }
+    @traced('figures')
+    def _create_comparative_visualizations(self, df, selected_banks, render=None, report_year=2024,
+                                           as_of_index=None):
+        """Crée des visualisations comparatives (figures indépendantes)"""
+        def columns(rate_label):
+            # Les séries longues (quotidiennes, plusieurs décennies) sont moyennées par paquets
+            return _downsample_for_plot(df[['Date'] + [f'{bank_name} {rate_label}' for bank_name in selected_banks]])
         
-        heatmap_data = pd.DataFrame(current_rates_2024).T
-        plt.figure(figsize=(12, 8))
-        sns.heatmap(heatmap_data, annot=True, cmap='RdYlGn_r', center=2.5, 
-                   fmt='.2f', linewidths=0.5)
-        plt.title('Taux des Banques de La Réunion - Situation 2024', 
-                 fontsize=14, fontweight='bold')
-        plt.tight_layout()
-        plt.savefig('heatmap_taux_reunion_2024.png', dpi=300, bbox_inches='tight')
-        plt.show()
-    
-    def _generate_comparative_report(self, df, selected_banks):
+        period = f"{df['Date'].iloc[0].year}-{df['Date'].iloc[-1].year}"
+        
+        # Heatmap des taux de l'année de référence
+        as_of_index = as_of_index or AsOfIndex(df)
+        heatmap_data = as_of_index.snapshot(f'{report_year}-01-01', selected_banks).rename(columns=SNAPSHOT_LABELS_FR)
+        
+        jobs = [
+            (_plot_rate_comparison,
+             (columns('Deposit Rate'), selected_banks, 'Deposit Rate',
+              f'Comparaison des Taux de Dépôt - Banques de La Réunion ({period})', 'Taux de Dépôt (%)'),
+             'comparaison_taux_depot_reunion'),
+            (_plot_rate_comparison,
+             (columns('Lending Rate'), selected_banks, 'Lending Rate',
+              f'Comparaison des Taux de Prêt - Banques de La Réunion ({period})', 'Taux de Prêt (%)'),
+             'comparaison_taux_pret_reunion'),
+            (_plot_rates_heatmap,
+             (heatmap_data, f'Taux des Banques de La Réunion - Situation {report_year}'),
+             f'heatmap_taux_reunion_{report_year}')
+        ]
+        return render_figures(jobs, render)
+    
+    @traced('report')
+    def _generate_comparative_report(self, df, selected_banks, monte_carlo=None, report_year=2024,
+                                     as_of_index=None):
         """Génère un rapport comparatif complet"""
         print("\n" + "=" * 80)
         print("📊 RAPPORT COMPARATIF - BANQUES DE LA RÉUNION")
-        print("📅 Période: 2002-2025")
+        period = f"{df['Date'].iloc[0].year}-{df['Date'].iloc[-1].year}"
+        print(f"📅 Période: {period}")
         print("=" * 80)
         
-        # Analyse des taux 2024
-        print("\n🏆 CLASSEMENT 2024 - TAUX DE DÉPÔT:")
-        deposit_ranking = []
-        for bank_name in selected_banks:
-            latest_data = df[df['Date'] >= '2024-01-01'].iloc[0]
-            deposit_rate = latest_data[f'{bank_name} Deposit Rate']
-            deposit_ranking.append((bank_name, deposit_rate))
+        # Analyse des taux de l'année de référence : un seul instantané pour toutes les banques
+        as_of_index = as_of_index or AsOfIndex(df)
+        snapshot = as_of_index.snapshot(f'{report_year}-01-01', selected_banks)
         
-        deposit_ranking.sort(key=lambda x: x[1], reverse=True)
+        print(f"\n🏆 CLASSEMENT {report_year} - TAUX DE DÉPÔT:")
+        deposit_ranking = list(snapshot['Deposit Rate'].sort_values(ascending=False, kind='stable').items())
         for i, (bank, rate) in enumerate(deposit_ranking, 1):
             print(f"  {i}. {bank}: {rate:.2f}%")
         
-        print("\n🏆 CLASSEMENT 2024 - TAUX DE PRÊT (plus bas = mieux):")
-        lending_ranking = []
-        for bank_name in selected_banks:
-            latest_data = df[df['Date'] >= '2024-01-01'].iloc[0]
-            lending_rate = latest_data[f'{bank_name} Lending Rate']
-            lending_ranking.append((bank_name, lending_rate))
-        
-        lending_ranking.sort(key=lambda x: x[1])
+        print(f"\n🏆 CLASSEMENT {report_year} - TAUX DE PRÊT (plus bas = mieux):")
+        lending_ranking = list(snapshot['Lending Rate'].sort_values(kind='stable').items())
         for i, (bank, rate) in enumerate(lending_ranking, 1):
             print(f"  {i}. {bank}: {rate:.2f}%")
         
+        if monte_carlo is not None:
+            print(f"\n🎲 PROBABILITÉ D'ÊTRE PREMIER ({monte_carlo['n_paths']} trajectoires):")
+            probabilities = monte_carlo['rank_probabilities']
+            for bank_name in selected_banks:
+                print(f"  {bank_name}: dépôt {probabilities.loc[bank_name, 'First Deposit Probability']:.1%}, "
+                      f"prêt {probabilities.loc[bank_name, 'First Lending Probability']:.1%}")
+        
         # Évolution sur la période
-        print("\n📈 ÉVOLUTION 2002-2025:")
+        print(f"\n📈 ÉVOLUTION {period}:")
         for bank_name in selected_banks:
             initial_rate = df.iloc[0][f'{bank_name} Deposit Rate']
             final_rate = df.iloc[-1][f'{bank_name} Deposit Rate']
@@ -626,22 +1340,132 @@ class ReunionBanksInterestRates:
         
         # Recommandations
         print("\n💡 RECOMMANDATIONS:")
-        print("  • Meilleur taux dépôt 2024: {}".format(deposit_ranking[0][0]))
-        print("  • Meilleur taux prêt 2024: {}".format(lending_ranking[0][0]))
+        print("  • Meilleur taux dépôt {}: {}".format(report_year, deposit_ranking[0][0]))
+        print("  • Meilleur taux prêt {}: {}".format(report_year, lending_ranking[0][0]))
         print("  • Banques locales souvent plus compétitives sur les dépôts")
         print("  • Réseaux nationaux avantageux pour les services internationaux")
         print("  • Spécialistes immobiliers (CIOI) intéressants pour l'habitat")
         
         print("=" * 80)
 
+def _plot_rate_comparison(df, selected_banks, rate_label, title, ylabel):
+    """Graphique comparatif d'un type de taux pour les banques sélectionnées"""
+    import matplotlib.pyplot as plt
+    
+    plt.style.use('seaborn-v0_8')
+    fig = plt.figure(figsize=(15, 10))
+    
+    colors = plt.cm.Set3(np.linspace(0, 1, len(selected_banks)))
+    
+    for i, bank_name in enumerate(selected_banks):
+        plt.plot(df['Date'], df[f'{bank_name} {rate_label}'], 
+                label=bank_name, linewidth=2, color=colors[i])
+    
+    plt.title(title, fontsize=14, fontweight='bold')
+    plt.ylabel(ylabel)
+    plt.xlabel('Année')
+    plt.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
+    plt.grid(True, alpha=0.3)
+    plt.xticks(rotation=45)
+    plt.tight_layout()
+    return fig
+
+def _plot_rates_heatmap(heatmap_data, title):
+    """Heatmap des taux (banques × types de taux)"""
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    
+    plt.style.use('seaborn-v0_8')
+    fig = plt.figure(figsize=(12, 8))
+    sns.heatmap(heatmap_data, annot=True, cmap='RdYlGn_r', center=2.5, 
+               fmt='.2f', linewidths=0.5)
+    plt.title(title, fontsize=14, fontweight='bold')
+    plt.tight_layout()
+    return fig
+
+def _process_bank_worker(task):
+    """Point d'entrée des processus du pool : une banque, son propre flux aléatoire"""
+    seed, bank_name, cache_dir, output, store_dir, incremental, end, (start, horizon_end, freq), registry = task
+    cache = ResultCache(cache_dir) if cache_dir is not None else None
+    analyzer = ReunionBanksInterestRates(seed=seed, cache=cache, output=output, store_dir=store_dir,
+                                         start=start, end=horizon_end, freq=freq, registry=registry)
+    analyzer.build_rate_cube([bank_name])
+    return analyzer._process_bank(bank_name, incremental, end)
+
 def main():
+    parser = argparse.ArgumentParser(description="Analyse des taux d'intérêt des banques de La Réunion")
+    parser.add_argument('--seed', type=int, default=None,
+                        help="Graine maîtresse (rend les séries reproductibles et active le cache)")
+    parser.add_argument('--cache-dir', default='.cache_banques',
+                        help="Répertoire du cache de résultats")
+    parser.add_argument('--parallel', action='store_true',
+                        help="Traite les banques dans un pool de processus")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Nombre de processus du pool (par défaut: nombre de cœurs)")
+    parser.add_argument('--output', choices=['store', 'csv'], default='store',
+                        help="Stockage colonnaire partitionné (défaut) ou fichiers CSV individuels")
+    parser.add_argument('--store-dir', default='donnees_banques',
+                        help="Racine du stockage partitionné")
+    parser.add_argument('--no-plots', action='store_true',
+                        help="Exécution données seules : ni graphiques ni import de matplotlib")
+    parser.add_argument('--headless', action='store_true',
+                        help="Rendu batch sans affichage (backend Agg, jamais de plt.show)")
+    parser.add_argument('--dpi', type=int, default=300, help="Résolution des figures")
+    parser.add_argument('--format', choices=['png', 'svg'], default='png', help="Format des figures")
+    parser.add_argument('--render-workers', type=int, default=1,
+                        help="Processus de rendu en mode headless")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Complète les séries existantes au lieu de les réécrire")
+    parser.add_argument('--start', default='2002-01-01',
+                        help="Première date des séries (AAAA-MM-JJ)")
+    parser.add_argument('--end', default='2025-12-31',
+                        help="Dernière date des séries, et cible du mode incrémental (AAAA-MM-JJ)")
+    parser.add_argument('--freq', default='M',
+                        help="Fréquence des séries : M (mensuelle), D (quotidienne), B (jours ouvrés), W…")
+    parser.add_argument('--stream', action='store_true',
+                        help="Pipeline en flux sur tout l'univers (mémoire bornée, agrégats en ligne)")
+    parser.add_argument('--synthetic-banks', type=int, default=0,
+                        help="Banques synthétiques ajoutées à l'univers du pipeline en flux")
+    parser.add_argument('--chunk-mb', type=int, default=64,
+                        help="Taille maximale d'un groupe de banques du pipeline en flux (Mo)")
+    parser.add_argument('--rolling-window', type=int, default=None,
+                        help="Ajoute au rapport le suivi glissant sur ce nombre de périodes")
+    parser.add_argument('--compact', action='store_true',
+                        help="Représentation compacte : float32, index de dates partagé, écarts à la demande")
+    parser.add_argument('--report-year', type=int, default=2024,
+                        help="Année des classements, de la heatmap et de l'aperçu")
+    parser.add_argument('--banks-file', default=None,
+                        help="Registre des banques à utiliser à la place de data/banks.json")
+    parser.add_argument('--trace', default=None,
+                        help="Chronomètre chaque étape et exporte la trace dans ce fichier")
+    parser.add_argument('--trace-format', choices=['chrome', 'json'], default='chrome',
+                        help="Format de la trace : Chrome trace (chrome://tracing, Perfetto) ou JSON")
+    args = parser.parse_args()
+    if args.compact and (args.parallel or args.incremental):
+        parser.error("--compact ne se combine pas avec --parallel ni --incremental")
+    if args.trace:
+        instrumentation.enable()
+    
     # Initialiser l'analyse des banques de La Réunion
-    reunion_banks = ReunionBanksInterestRates()
+    cache = ResultCache(args.cache_dir) if args.seed is not None else None
+    reunion_banks = ReunionBanksInterestRates(seed=args.seed, cache=cache,
+                                              output=args.output, store_dir=args.store_dir,
+                                              start=args.start, end=args.end, freq=args.freq,
+                                              registry=BankRegistry.load(args.banks_file) if args.banks_file else None)
     
     print("🏦 ANALYSE DES TAUX D'INTÉRÊT - BANQUES DE LA RÉUNION")
-    print("📅 Période: 2002-2025")
+    print(f"📅 Période: {reunion_banks.start_year}-{reunion_banks.end_year} (fréquence {args.freq})")
     print("=" * 50)
     
+    if args.stream:
+        reunion_banks.create_streaming_analysis(synthetic_banks=args.synthetic_banks,
+                                                report_year=args.report_year,
+                                                max_chunk_bytes=args.chunk_mb * 1024 ** 2)
+        if args.trace:
+            instrumentation.TRACER.print_report()
+            instrumentation.TRACER.export(args.trace, args.trace_format)
+        return
+    
     # Afficher les banques analysées
     print("\n📋 BANQUES INCLUSES DANS L'ANALYSE:")
     for i, bank_name in enumerate(reunion_banks.banks.keys(), 1):
@@ -659,22 +1483,40 @@ def main():
     ]
     
     # Lancer l'analyse comparative
-    comparative_data, all_banks_data = reunion_banks.create_comparative_analysis(selected_banks)
+    comparative_data, all_banks_data = reunion_banks.create_comparative_analysis(
+        selected_banks, parallel=args.parallel, max_workers=args.workers,
+        incremental=args.incremental,
+        render=RenderOptions(headless=args.headless, dpi=args.dpi, format=args.format,
+                             workers=args.render_workers),
+        plots=not args.no_plots, report_year=args.report_year, rolling_window=args.rolling_window,
+        compact=args.compact)
     
     print(f"\n✅ Analyse terminée avec succès!")
     print(f"📊 {len(selected_banks)} banques analysées")
     print("📁 Fichiers générés:")
-    print("   - Fichiers CSV individuels pour chaque banque")
-    print("   - comparaison_taux_depot_reunion.png")
-    print("   - comparaison_taux_pret_reunion.png")
-    print("   - heatmap_taux_reunion_2024.png")
+    if args.output == 'store':
+        print(f"   - Stockage partitionné {args.store_dir}/ (banque, année)")
+    else:
+        print("   - Fichiers CSV individuels pour chaque banque")
+    if not args.no_plots:
+        print(f"   - comparaison_taux_depot_reunion.{args.format}")
+        print(f"   - comparaison_taux_pret_reunion.{args.format}")
+        print(f"   - heatmap_taux_reunion_{args.report_year}.{args.format}")
     print("   - Rapport comparatif complet")
     
     # Aperçu des données
-    print("\n👀 APERÇU DES DONNÉES (2024):")
-    latest_data = comparative_data[comparative_data['Date'] >= '2024-01-01'].iloc[0]
+    print(f"\n👀 APERÇU DES DONNÉES ({args.report_year}):")
+    latest_data = AsOfIndex(comparative_data).snapshot(f'{args.report_year}-01-01', selected_banks[:3])
     for bank in selected_banks[:3]:  # Afficher les 3 premières
-        print(f"  {bank}: Dépôt {latest_data[f'{bank} Deposit Rate']:.2f}%, Prêt {latest_data[f'{bank} Lending Rate']:.2f}%")
+        print(f"  {bank}: Dépôt {latest_data.loc[bank, 'Deposit Rate']:.2f}%, Prêt {latest_data.loc[bank, 'Lending Rate']:.2f}%")
+    
+    if cache is not None:
+        stats = cache.stats()
+        print(f"\n🗄️  Cache: {stats['hits_memory'] + stats['hits_disk']} succès, {stats['misses']} échecs")
+    
+    if args.trace:
+        instrumentation.TRACER.print_report()
+        instrumentation.TRACER.export(args.trace, args.trace_format)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
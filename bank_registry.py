@@ -0,0 +1,143 @@
+"""
+Registre des banques de La Réunion chargé une fois depuis data/banks.json
+
+Chaque banque est repérée par un indice : un index des noms normalisés
+(minuscules, sans accents ni ponctuation) et des alias fait correspondre les
+différentes graphies d'une même banque, et les paramètres numériques (taux
+actuels, actifs initiaux, ajustements par type de taux) sont rangés dans des
+tableaux. Une recherche est un accès dictionnaire puis un accès tableau ; les
+banques inconnues (synthétiques notamment) prennent la ligne par défaut.
+"""
+import copy
+import hashlib
+import json
+import os
+import re
+import unicodedata
+from functools import lru_cache
+
+import numpy as np
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'banks.json')
+
+CURRENT_RATE_TYPES = ('deposit', 'lending')
+
+
+def normalize_name(name):
+    """Forme canonique d'un nom : « Caisse d'Épargne » et « caisse d epargne » coïncident"""
+    decomposed = unicodedata.normalize('NFKD', name)
+    ascii_name = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return ' '.join(re.sub(r'[^0-9a-z]+', ' ', ascii_name.lower()).split())
+
+
+class BankRegistry:
+    def __init__(self, banks, default):
+        self.default = default
+        self.records = list(banks)
+        self.names = [record['name'] for record in self.records]
+
+        # Empreinte du registre, incluse dans les clés du cache de résultats
+        content = json.dumps({'banks': self.records, 'default': default}, sort_keys=True, ensure_ascii=False)
+        self.version = hashlib.sha256(content.encode('utf-8')).hexdigest()[:12]
+
+        # Index des noms normalisés et des alias ; la ligne par défaut est la dernière
+        self._index = {}
+        for i, record in enumerate(self.records):
+            for name in [record['name']] + record.get('aliases', []):
+                key = normalize_name(name)
+                if key in self._index and self._index[key] != i:
+                    raise ValueError(f"Alias ambigu: {name}")
+                self._index[key] = i
+        self.default_index = len(self.records)
+
+        rows = self.records + [default]
+        self.current_rates = np.array([[row['current_rates'][rate_type] for rate_type in CURRENT_RATE_TYPES]
+                                       for row in rows], dtype=float)
+        self.base_assets = np.array([row['base_assets'] for row in rows], dtype=float)
+        rate_types = sorted({rate_type for row in rows for rate_type in row.get('adjustments', {})})
+        self.adjustments = {
+            rate_type: np.array([row.get('adjustments', {}).get(rate_type, 0.0) for row in rows])
+            for rate_type in rate_types
+        }
+
+    @classmethod
+    def load(cls, path=DEFAULT_PATH):
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data['banks'], data['default'])
+
+    def __contains__(self, bank_name):
+        return normalize_name(bank_name) in self._index
+
+    def __len__(self):
+        return len(self.records)
+
+    def index(self, bank_name):
+        """Indice d'une banque (nom ou alias), ou l'indice de la ligne par défaut"""
+        return self._index.get(normalize_name(bank_name), self.default_index)
+
+    def indices(self, bank_names):
+        return np.array([self.index(bank_name) for bank_name in bank_names], dtype=np.intp)
+
+    def resolve(self, bank_name):
+        """Nom canonique d'une banque connue, ou None"""
+        i = self._index.get(normalize_name(bank_name))
+        return None if i is None else self.names[i]
+
+    def record(self, bank_name):
+        """Fiche complète (copie) d'une banque, ou la fiche par défaut"""
+        i = self.index(bank_name)
+        return copy.deepcopy(self.records[i] if i < self.default_index else self.default)
+
+    def bank_info(self):
+        """{banque: {'website', 'type', 'founded'}} dans l'ordre du fichier"""
+        return {record['name']: {'website': record.get('website'), 'type': record['type'],
+                                 'founded': record['founded']}
+                for record in self.records}
+
+    def current_rate_pair(self, bank_name):
+        """(taux de dépôt, taux de prêt) actuels"""
+        deposit_rate, lending_rate = self.current_rates[self.index(bank_name)]
+        return float(deposit_rate), float(lending_rate)
+
+    def base_asset_value(self, bank_name):
+        return float(self.base_assets[self.index(bank_name)])
+
+    def adjustment(self, bank_name, rate_type):
+        """Ajustement d'une banque pour un type de taux (0 si aucun)"""
+        vector = self.adjustments.get(rate_type)
+        return 0.0 if vector is None else float(vector[self.index(bank_name)])
+
+    def adjustment_matrix(self, bank_names, rate_types):
+        """Ajustements (banque × type de taux) d'une liste de banques"""
+        rows = self.indices(bank_names)
+        matrix = np.zeros((len(rows), len(rate_types)))
+        for t, rate_type in enumerate(rate_types):
+            vector = self.adjustments.get(rate_type)
+            if vector is not None:
+                matrix[:, t] = vector[rows]
+        return matrix
+
+    def adjustment_range(self, rate_types):
+        """Ajustements minimal et maximal par type de taux, ligne par défaut comprise"""
+        matrix = np.zeros((len(rate_types), self.default_index + 1))
+        for t, rate_type in enumerate(rate_types):
+            if rate_type in self.adjustments:
+                matrix[t] = self.adjustments[rate_type]
+        return matrix.min(axis=1), matrix.max(axis=1)
+
+    def finance_config(self, bank_name):
+        """Configuration de l'analyse financière (Ru.py), ou celle par défaut"""
+        i = self.index(bank_name)
+        config = self.records[i].get('finance') if i < self.default_index else None
+        return copy.deepcopy(config or self.default['finance'])
+
+    def finance_banks(self):
+        """Banques disposant d'une configuration financière propre"""
+        return [record['name'] for record in self.records if 'finance' in record]
+
+
+@lru_cache(maxsize=None)
+def load_registry(path=DEFAULT_PATH):
+    """Registre partagé, chargé une seule fois par fichier et par processus"""
+    return BankRegistry.load(path)
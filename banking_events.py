@@ -0,0 +1,87 @@
+"""
+Scénario d'événements économiques de La Réunion chargé depuis data/evenements_reunion.csv
+
+Chaque ligne (événement, début, fin, colonne, multiplicateur) multiplie une
+colonne des données financières sur une plage d'années ; une fin vide laisse
+l'événement ouvert. Le scénario s'applique en une seule matrice de
+multiplicateurs (année × colonne), produit des événements actifs de chaque
+cellule : remplacer le fichier suffit à simuler un autre scénario.
+"""
+import hashlib
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'evenements_reunion.csv')
+
+EVENT_COLUMNS = ('evenement', 'debut', 'fin', 'colonne', 'multiplicateur')
+
+
+class EventTable:
+    def __init__(self, events):
+        missing = [column for column in EVENT_COLUMNS if column not in events.columns]
+        if missing:
+            raise ValueError(f"Colonnes manquantes dans le scénario d'événements: {', '.join(missing)}")
+        self.events = events.loc[:, list(EVENT_COLUMNS)].reset_index(drop=True)
+        self.starts = self.events['debut'].to_numpy(dtype=float)
+        self.ends = self.events['fin'].fillna(np.inf).to_numpy(dtype=float)
+        self.factors = self.events['multiplicateur'].to_numpy(dtype=float)
+
+        # Empreinte du scénario, incluse dans les clés du cache de résultats
+        content = self.events.to_csv(index=False).encode('utf-8')
+        self.version = hashlib.sha256(content).hexdigest()[:12]
+        self._matrices = {}
+
+    @classmethod
+    def load(cls, path=DEFAULT_PATH):
+        return cls(pd.read_csv(path, encoding='utf-8'))
+
+    def multipliers(self, years, columns):
+        """
+        Matrice (année × colonne) des multiplicateurs, 1 là où aucun événement
+        ne s'applique ; calculée une fois par (années, colonnes), à ne pas modifier
+        """
+        key = (tuple(np.asarray(years).tolist()), tuple(columns))
+        if key not in self._matrices:
+            self._matrices[key] = self._multipliers(np.asarray(years, dtype=float), columns)
+        return self._matrices[key]
+
+    def _multipliers(self, years, columns):
+        years = years[:, None]
+        positions = {column: c for c, column in enumerate(columns)}
+        unknown = sorted(set(self.events['colonne']) - set(positions))
+        if unknown:
+            raise ValueError(f"Colonnes inconnues dans le scénario d'événements: {', '.join(unknown)}")
+
+        # Facteur de chaque événement pour chaque année (année × événement)
+        active = (years >= self.starts) & (years <= self.ends)
+        factors = np.where(active, self.factors, 1.0)
+
+        # Produit des événements d'une même colonne (indices répétés compris)
+        matrix = np.ones((len(years), len(columns)))
+        targets = self.events['colonne'].map(positions).to_numpy()
+        np.multiply.at(matrix.T, targets, factors.T)
+        matrix.setflags(write=False)
+        return matrix
+
+    def periods(self):
+        """Libellés « début-fin: événement » dans l'ordre du scénario, un par événement"""
+        labels = []
+        for name, group in self.events.groupby('evenement', sort=False):
+            start, end = int(group['debut'].min()), group['fin'].max()
+            if group['fin'].isna().any():
+                span = f"{start}+"
+            elif int(end) == start:
+                span = f"{start}"
+            else:
+                span = f"{start}-{int(end)}"
+            labels.append(f"{span}: {name}")
+        return labels
+
+
+@lru_cache(maxsize=None)
+def load_events(path=DEFAULT_PATH):
+    """Scénario partagé, chargé une seule fois par fichier et par processus"""
+    return EventTable.load(path)
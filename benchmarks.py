@@ -0,0 +1,474 @@
+"""
+Benchmarks des générateurs de séries des banques de La Réunion
+"""
+import argparse
+import contextlib
+import itertools
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from bank_registry import load_registry
+from compact_frames import frame_nbytes
+from Run import (ReunionBanksInterestRates, RATE_TYPES, BASE_RATE_HISTORY, SNAPSHOT_LABELS,
+                 DEFAULT_BASE_RATES, RATE_NOISE_STD, RATE_FLOORS, HISTORY_START_YEAR)
+
+
+def legacy_rate_loops(analyzer, bank_names, start='2002-01-01', end='2025-12-31'):
+    """Référence : boucles mensuelles d'origine (une recherche dict et un tirage par mois)"""
+    dates = pd.date_range(start=start, end=end, freq='M')
+    results = {}
+    for bank_name in bank_names:
+        for t, rate_type in enumerate(RATE_TYPES):
+            base_history = {str(HISTORY_START_YEAR + i): rate
+                            for i, rate in enumerate(BASE_RATE_HISTORY[t])}
+            # Dictionnaire {année: ajustement} reconstruit à chaque série, comme à l'origine
+            adjustment = analyzer.registry.adjustment(bank_name, rate_type)
+            bank_adjustments = {str(year): adjustment for year in range(2002, 2026)} if adjustment else {}
+            rates = []
+            for date in dates:
+                year = str(date.year)
+                base_rate = base_history.get(year, DEFAULT_BASE_RATES[t])
+                adjustment = bank_adjustments.get(year, 0)
+                monthly_variation = np.random.normal(0, RATE_NOISE_STD[t])
+                rates.append(max(RATE_FLOORS[t], base_rate + adjustment + monthly_variation))
+            results[(bank_name, rate_type)] = rates
+    return results
+
+
+def _best_time(func, repeat):
+    """Meilleur temps d'exécution sur plusieurs répétitions"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def bench_rate_engine(n_banks=10, repeat=5):
+    """Compare les boucles mensuelles d'origine au moteur vectorisé"""
+    analyzer = ReunionBanksInterestRates()
+    bank_names = list(analyzer.banks.keys())
+    bank_names = [bank_names[i % len(bank_names)] + ('' if i < len(bank_names) else f' #{i}')
+                  for i in range(n_banks)]
+
+    legacy = _best_time(lambda: legacy_rate_loops(analyzer, bank_names), repeat)
+    vectorized = _best_time(lambda: analyzer.build_rate_cube(bank_names), repeat)
+
+    print(f"⏱️  Moteur de taux ({n_banks} banques × {len(RATE_TYPES)} types × 288 mois)")
+    print(f"  Boucles d'origine : {legacy * 1000:.1f} ms")
+    print(f"  Moteur vectorisé  : {vectorized * 1000:.1f} ms")
+    print(f"  Accélération      : ×{legacy / vectorized:.0f}")
+    return {'legacy_s': legacy, 'vectorized_s': vectorized, 'speedup': legacy / vectorized}
+
+
+NATIVE_YEARS = 2025 - HISTORY_START_YEAR + 1
+RATE_FREQS = ('M', 'W', 'B', 'D')
+
+
+class UnsupportedCase(Exception):
+    """Combinaison (banques, horizon, fréquence) non prise en charge par un cas"""
+
+
+def _rate_universe(n_banks, years=NATIVE_YEARS, freq='M', seed=0, output='csv'):
+    """Analyseur de taux sur l'horizon demandé et n_banks banques (réelles puis synthétiques)"""
+    analyzer = ReunionBanksInterestRates(seed=seed, output=output, start=f'{HISTORY_START_YEAR}-01-01',
+                                         end=f'{HISTORY_START_YEAR + years - 1}-12-31', freq=freq)
+    bank_names = list(analyzer.banks.keys())[:n_banks]
+    if n_banks > len(bank_names):
+        bank_names += analyzer.add_synthetic_banks(n_banks - len(bank_names))
+    return analyzer, bank_names
+
+
+def _finance_universe(n_banks):
+    """Banques configurées pour Ru.py puis banques synthétiques (configuration par défaut)"""
+    configured = load_registry().finance_banks()
+    return [configured[i] if i < len(configured) else f"Banque Synthétique {i + 1}"
+            for i in range(n_banks)]
+
+
+def _require(freq, freqs):
+    if freq not in freqs:
+        raise UnsupportedCase(f"fréquence {freq} (supportées: {', '.join(freqs)})")
+
+
+def case_financials(n_banks, years, freq):
+    """generate_financial_data pour chaque banque"""
+    from Ru import ReunionBankFinanceAnalyzer
+    from financial_kernel import PERIODS_PER_YEAR
+    _require(freq, tuple(PERIODS_PER_YEAR))
+
+    analyzers = []
+    for bank_name in _finance_universe(n_banks):
+        analyzer = ReunionBankFinanceAnalyzer(bank_name, seed=0, freq=freq)
+        analyzer.end_year = analyzer.start_year + years - 1
+        analyzers.append(analyzer)
+    return lambda: [analyzer.generate_financial_data() for analyzer in analyzers]
+
+
+def case_financial_kernel(n_banks, years, freq):
+    """Noyau financier vectorisé : toutes les banques en un seul tirage (banque × année × indicateur)"""
+    from financial_kernel import horizon_kernel
+    _require(freq, ('Y',))
+    registry = load_registry()
+    configs = [registry.finance_config(bank_name) for bank_name in _finance_universe(n_banks)]
+    kernel = horizon_kernel(2002, 2002 + years - 1)
+    rng = np.random.default_rng(0)
+    return lambda: kernel.simulate_banks(configs, rng)
+
+
+def case_stress(n_banks, years, freq):
+    """Tests de résistance Monte Carlo : 1000 tirages × banques × années, scénarios par défaut"""
+    from stress_testing import StressEngine, load_scenarios
+    _require(freq, ('Y',))
+    engine = StressEngine(_finance_universe(n_banks), end_year=2002 + years - 1, seed=0)
+    scenarios = load_scenarios()
+    return lambda: engine.run(scenarios, n_draws=1000)
+
+
+def case_rate_cube(n_banks, years, freq):
+    """Cube (banque × type de taux × période) du moteur vectorisé"""
+    _require(freq, RATE_FREQS)
+    analyzer, bank_names = _rate_universe(n_banks, years, freq)
+    return lambda: analyzer.build_rate_cube(bank_names)
+
+
+def case_bank_rates(n_banks, years, freq):
+    """get_all_bank_rates (taux, actifs, écarts) pour chaque banque"""
+    _require(freq, RATE_FREQS)
+    analyzer, bank_names = _rate_universe(n_banks, years, freq)
+    return lambda: [analyzer.get_all_bank_rates(bank_name) for bank_name in bank_names]
+
+
+def case_comparative_data(n_banks, years, freq):
+    """create_comparative_analysis sans graphiques (génération, CSV, rapport)"""
+    _require(freq, RATE_FREQS)
+    analyzer, bank_names = _rate_universe(n_banks, years, freq)
+    return lambda: analyzer.create_comparative_analysis(bank_names, plots=False)
+
+
+def case_comparative_plots(n_banks, years, freq):
+    """create_comparative_analysis avec rendu headless des figures"""
+    from rendering import RenderOptions
+    _require(freq, RATE_FREQS)
+    analyzer, bank_names = _rate_universe(n_banks, years, freq)
+    render = RenderOptions(headless=True, dpi=100)
+    return lambda: analyzer.create_comparative_analysis(bank_names, render=render)
+
+
+def case_streaming(n_banks, years, freq):
+    """create_streaming_analysis : agrégats en ligne sur tout l'univers, sans écriture"""
+    _require(freq, RATE_FREQS)
+    analyzer, bank_names = _rate_universe(n_banks, years, freq)
+    return lambda: analyzer.create_streaming_analysis(bank_names, write=False)
+
+
+def case_rolling(n_banks, years, freq):
+    """rolling_analytics : moyennes, volatilités, écarts au médian et corrélations glissantes"""
+    _require(freq, RATE_FREQS)
+    analyzer, bank_names = _rate_universe(n_banks, years, freq)
+    analyzer.build_rate_cube(bank_names)
+    return lambda: analyzer.rolling_analytics(bank_names, window=12)
+
+
+def case_csv_export(n_banks, years, freq):
+    """Export CSV des séries de taux et des données financières (annuelles) déjà générées"""
+    from Ru import ReunionBankFinanceAnalyzer
+    _require(freq, RATE_FREQS)
+    analyzer, bank_names = _rate_universe(n_banks, years, freq)
+    frames = [analyzer.get_all_bank_rates(bank_name) for bank_name in bank_names]
+    for bank_name in _finance_universe(n_banks):
+        finance = ReunionBankFinanceAnalyzer(bank_name, seed=0)
+        finance.end_year = finance.start_year + years - 1
+        frames.append(finance.generate_financial_data())
+    return lambda: [frame.to_csv(f'export_{i}.csv', index=False) for i, frame in enumerate(frames)]
+
+
+BENCHMARK_CASES = {
+    'financials': case_financials,
+    'financial-kernel': case_financial_kernel,
+    'stress': case_stress,
+    'rate-cube': case_rate_cube,
+    'bank-rates': case_bank_rates,
+    'comparative-data': case_comparative_data,
+    'comparative-plots': case_comparative_plots,
+    'streaming': case_streaming,
+    'rolling': case_rolling,
+    'csv-export': case_csv_export
+}
+
+
+def _peak_rss_mb():
+    """Pic de mémoire résidente du processus courant (Mo)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024
+
+
+def _measure_case(task):
+    """
+    Exécute un cas dans un processus neuf et un répertoire temporaire :
+    préparation non chronométrée, puis temps mural, temps CPU et pic RSS.
+    """
+    case, n_banks, years, freq = task
+    with tempfile.TemporaryDirectory() as workdir, open(os.devnull, 'w') as devnull:
+        os.chdir(workdir)
+        with contextlib.redirect_stdout(devnull):
+            try:
+                run = BENCHMARK_CASES[case](n_banks, years, freq)
+            except UnsupportedCase as e:
+                return {'status': 'skipped', 'reason': str(e)}
+            rss_before = _peak_rss_mb()
+            wall_start, cpu_start = time.perf_counter(), time.process_time()
+            run()
+            wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+    return {'status': 'ok', 'wall_s': wall, 'cpu_s': cpu,
+            'peak_rss_mb': _peak_rss_mb(), 'setup_rss_mb': rss_before}
+
+
+def run_suite(cases=None, banks=(6,), years=(NATIVE_YEARS,), freqs=('M', 'Y'), repeat=3):
+    """
+    Balaye cas × nombre de banques × horizon × fréquence. Chaque répétition
+    tourne dans un processus neuf ; on garde le meilleur temps et le pic RSS maximal.
+    """
+    results = []
+    for case, n_banks, n_years, freq in itertools.product(cases or list(BENCHMARK_CASES), banks, years, freqs):
+        runs = []
+        for _ in range(repeat):
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                runs.append(executor.submit(_measure_case, (case, n_banks, n_years, freq)).result())
+            if runs[-1]['status'] == 'skipped':
+                break
+
+        result = {'case': case, 'banks': n_banks, 'years': n_years, 'freq': freq}
+        if runs[-1]['status'] == 'skipped':
+            result.update(runs[-1])
+        else:
+            result.update({
+                'status': 'ok',
+                'wall_s': min(run['wall_s'] for run in runs),
+                'cpu_s': min(run['cpu_s'] for run in runs),
+                'peak_rss_mb': max(run['peak_rss_mb'] for run in runs),
+                'repeat': repeat
+            })
+            print(f"  {case:<18} {n_banks:>5} banques {n_years:>3} ans {freq}: "
+                  f"{result['wall_s'] * 1000:9.1f} ms mur, {result['cpu_s'] * 1000:9.1f} ms CPU, "
+                  f"{result['peak_rss_mb']:7.1f} Mo RSS")
+        results.append(result)
+
+    skipped = sum(result['status'] == 'skipped' for result in results)
+    if skipped:
+        print(f"  ⏭️  {skipped} combinaison(s) non prises en charge ignorées (voir 'reason' dans les résultats)")
+    return results
+
+
+def _measure_representation(task):
+    """
+    Construit le jeu de données de l'analyse comparative (séries de chaque
+    banque et DataFrame comparatif) dans un processus neuf : volume des
+    données et pic RSS, en représentation large (float64) ou compacte.
+    """
+    representation, n_banks, years, freq = task
+    with tempfile.TemporaryDirectory() as workdir, open(os.devnull, 'w') as devnull:
+        os.chdir(workdir)
+        with contextlib.redirect_stdout(devnull):
+            analyzer, bank_names = _rate_universe(n_banks, years, freq)
+            rss_before = _peak_rss_mb()
+            wall_start = time.perf_counter()
+            if representation == 'wide':
+                frames = {bank_name: analyzer.get_all_bank_rates(bank_name) for bank_name in bank_names}
+                comparative = analyzer._create_comparative_dataframe(frames, bank_names)
+                data_bytes = sum(frame_nbytes(frame) for frame in frames.values())
+            else:
+                compact = analyzer.compact_rates(bank_names)
+                comparative = compact.wide_frame(SNAPSHOT_LABELS)
+                data_bytes = compact.nbytes
+            wall = time.perf_counter() - wall_start
+    return {'representation': representation, 'banks': n_banks, 'years': years, 'freq': freq,
+            'series_mb': data_bytes / 1024 ** 2, 'comparative_mb': frame_nbytes(comparative) / 1024 ** 2,
+            'wall_s': wall, 'peak_rss_mb': _peak_rss_mb(), 'setup_rss_mb': rss_before}
+
+
+def bench_memory(n_banks=1000, years=NATIVE_YEARS, freq='D'):
+    """Mémoire des représentations large (float64) et compacte d'un même univers"""
+    print(f"🧮 Mémoire: {n_banks} banques, {years} ans, fréquence {freq}")
+    results = []
+    for representation in ('wide', 'compact'):
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            result = executor.submit(_measure_representation, (representation, n_banks, years, freq)).result()
+        results.append(result)
+        print(f"  {representation:<8} séries {result['series_mb']:9.1f} Mo, comparatif {result['comparative_mb']:8.1f} Mo, "
+              f"pic RSS {result['peak_rss_mb']:8.1f} Mo ({result['wall_s']:.1f} s)")
+
+    wide, compact = results
+    print(f"  Réduction: séries ×{wide['series_mb'] / compact['series_mb']:.1f}, "
+          f"comparatif ×{wide['comparative_mb'] / compact['comparative_mb']:.1f}, "
+          f"pic RSS ×{wide['peak_rss_mb'] / compact['peak_rss_mb']:.1f}")
+    return results
+
+
+def _git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def write_results(results, path):
+    """Enregistre les résultats et le contexte d'exécution (JSON)"""
+    payload = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'revision': _git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'results': results
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, indent=2, ensure_ascii=False)
+    print(f"💾 Résultats sauvegardés: {path}")
+
+
+def compare_results(baseline_path, current_path, threshold=0.10, rss_threshold=0.10, min_delta_ms=5.0):
+    """
+    Compare deux fichiers de résultats cas par cas. Une régression est un
+    temps mural au-delà de (1 + threshold) fois la référence (et d'au moins
+    min_delta_ms) ou un pic RSS au-delà de (1 + rss_threshold) fois la référence.
+    """
+    def load(path):
+        with open(path, encoding='utf-8') as f:
+            return {(r['case'], r['banks'], r['years'], r['freq']): r
+                    for r in json.load(f)['results'] if r['status'] == 'ok'}
+
+    baseline, current = load(baseline_path), load(current_path)
+    regressions = []
+    print(f"📊 {baseline_path} → {current_path}")
+    for key in sorted(baseline.keys() & current.keys()):
+        before, after = baseline[key], current[key]
+        wall_ratio = after['wall_s'] / before['wall_s']
+        rss_ratio = after['peak_rss_mb'] / before['peak_rss_mb']
+        slower = (wall_ratio > 1 + threshold
+                  and (after['wall_s'] - before['wall_s']) * 1000 >= min_delta_ms)
+        heavier = rss_ratio > 1 + rss_threshold
+
+        status = '❌' if slower or heavier else ('🚀' if wall_ratio < 1 - threshold else '✅')
+        case, n_banks, n_years, freq = key
+        print(f"  {status} {case:<18} {n_banks:>5} banques {n_years:>3} ans {freq}: "
+              f"{before['wall_s'] * 1000:9.1f} → {after['wall_s'] * 1000:9.1f} ms (×{wall_ratio:.2f}), "
+              f"RSS {before['peak_rss_mb']:.0f} → {after['peak_rss_mb']:.0f} Mo")
+        if slower or heavier:
+            regressions.append(key)
+
+    missing = sorted(baseline.keys() - current.keys())
+    if missing:
+        print(f"  ⚠️  {len(missing)} cas de référence absents des résultats courants")
+    print(f"{'❌' if regressions else '✅'} {len(regressions)} régression(s)")
+    return regressions
+
+
+# Modules qu'un import de Run.py ou Ru.py ne doit jamais charger
+LAZY_MODULES = ('matplotlib', 'seaborn', 'requests', 'bs4', 'aiohttp', 'pyarrow.dataset')
+
+# Budget du temps d'import cumulé de Run.py et Ru.py
+IMPORT_BUDGET_MS = 1500
+
+
+def measure_import_time(module):
+    """Temps d'import cumulé (µs) par module d'après python -X importtime"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True, check=True,
+        cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, total, name = line[len('import time:'):].split('|')
+        cumulative[name.strip()] = int(total)
+    return cumulative
+
+
+def check_import_time(modules=('Run', 'Ru'), budget_ms=IMPORT_BUDGET_MS):
+    """
+    Garde-fou du démarrage rapide : échoue si un module de graphiques ou de
+    récupération web est importé au chargement, ou si le budget est dépassé.
+    """
+    ok = True
+    for module in modules:
+        cumulative = measure_import_time(module)
+        total_ms = cumulative[module] / 1000
+        eager = sorted(name for name in cumulative
+                       if any(name == lazy or name.startswith(lazy + '.') for lazy in LAZY_MODULES))
+
+        status = '✅' if not eager and total_ms <= budget_ms else '❌'
+        print(f"{status} import {module}: {total_ms:.0f} ms (budget {budget_ms} ms)")
+        if eager:
+            print(f"   Modules chargés à tort: {', '.join(eager)}")
+        ok = ok and status == '✅'
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks des banques de La Réunion")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    engine = subparsers.add_parser('rate-engine', help="Boucles d'origine vs moteur vectorisé")
+    engine.add_argument('--banks', type=int, default=10)
+    engine.add_argument('--repeat', type=int, default=5)
+
+    importtime = subparsers.add_parser('importtime', help="Garde-fou du temps d'import de Run.py et Ru.py")
+    importtime.add_argument('--budget-ms', type=int, default=IMPORT_BUDGET_MS)
+
+    suite = subparsers.add_parser('suite', help="Balayage banques × horizon × fréquence des étapes du pipeline")
+    suite.add_argument('--cases', nargs='+', choices=list(BENCHMARK_CASES), default=None)
+    suite.add_argument('--banks', nargs='+', type=int, default=[6])
+    suite.add_argument('--years', nargs='+', type=int, default=[NATIVE_YEARS])
+    suite.add_argument('--freq', nargs='+', default=['M', 'Y'])
+    suite.add_argument('--repeat', type=int, default=3)
+    suite.add_argument('--output', default='benchmarks.json')
+
+    memory = subparsers.add_parser('memory', help="Représentation large vs compacte (mémoire)")
+    memory.add_argument('--banks', type=int, default=1000)
+    memory.add_argument('--years', type=int, default=NATIVE_YEARS)
+    memory.add_argument('--freq', default='D')
+    memory.add_argument('--output', default=None)
+
+    compare = subparsers.add_parser('compare', help="Signale les régressions par rapport à une référence")
+    compare.add_argument('baseline')
+    compare.add_argument('current')
+    compare.add_argument('--threshold', type=float, default=0.10,
+                         help="Ralentissement relatif toléré du temps mural")
+    compare.add_argument('--rss-threshold', type=float, default=0.10,
+                         help="Hausse relative tolérée du pic RSS")
+
+    args = parser.parse_args()
+    if args.command == 'rate-engine':
+        bench_rate_engine(args.banks, args.repeat)
+    elif args.command == 'suite':
+        print("⏱️  Suite de benchmarks")
+        write_results(run_suite(args.cases, args.banks, args.years, args.freq, args.repeat), args.output)
+    elif args.command == 'memory':
+        results = bench_memory(args.banks, args.years, args.freq)
+        if args.output:
+            write_results(results, args.output)
+    elif args.command == 'compare':
+        regressions = compare_results(args.baseline, args.current, args.threshold, args.rss_threshold)
+        sys.exit(1 if regressions else 0)
+    elif args.command == 'importtime':
+        sys.exit(0 if check_import_time(budget_ms=args.budget_ms) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Représentation compacte des séries de taux et des données financières
+
+Mode optionnel : valeurs en float32 lorsque la précision le permet, dimension
+banque catégorielle dans un format long (lignes (banque, date)) qui partage un
+seul index de dates, et écarts calculés à la demande au lieu d'être stockés.
+"""
+import numpy as np
+import pandas as pd
+
+# Écart relatif maximal accepté pour passer une colonne en float32
+FLOAT32_RTOL = 1e-6
+
+
+def fits_float32(values, rtol=FLOAT32_RTOL):
+    """Vrai si les valeurs survivent à un aller-retour float32 à rtol près"""
+    values = np.asarray(values, dtype=np.float64)
+    with np.errstate(over='ignore', invalid='ignore'):
+        compact = values.astype(np.float32)
+    return bool(np.allclose(compact, values, rtol=rtol, atol=0.0, equal_nan=True))
+
+
+def downcast_frame(df, rtol=FLOAT32_RTOL):
+    """
+    Copie compacte d'un DataFrame : float64 → float32 là où la précision le
+    permet, entiers au plus petit type, chaînes répétées en catégories.
+    """
+    columns = {}
+    for column in df.columns:
+        series = df[column]
+        if series.dtype == np.float64 and fits_float32(series.to_numpy(), rtol):
+            series = series.astype(np.float32)
+        elif pd.api.types.is_integer_dtype(series.dtype):
+            series = pd.to_numeric(series, downcast='integer')
+        elif series.dtype == object and series.nunique() < len(series) // 2:
+            series = series.astype('category')
+        columns[column] = series
+    return pd.DataFrame(columns, index=df.index)
+
+
+def frame_nbytes(df):
+    """Mémoire occupée par un DataFrame, index et chaînes compris (octets)"""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+class CompactRates:
+    """
+    Séries de plusieurs banques : un tableau float32 (série × banque × période)
+    sur un index de dates unique. Le format long, les vues larges par banque et
+    les écarts (spreads = {libellé: (série diminuée, série retranchée)}) sont
+    construits à la demande, sans dupliquer les dates.
+    """
+    def __init__(self, dates, banks, labels, values, spreads=None):
+        self.dates = pd.DatetimeIndex(dates, name='Date')
+        self.banks = pd.CategoricalIndex(banks, categories=banks, name='Bank')
+        self.labels = tuple(labels)
+        self.values = np.asarray(values, dtype=np.float32)
+        self.spreads = dict(spreads or {})
+        self._bank_index = {bank_name: b for b, bank_name in enumerate(banks)}
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes + self.dates.nbytes
+
+    def _row(self, bank_name):
+        try:
+            return self._bank_index[bank_name]
+        except KeyError:
+            raise KeyError(f"Banque absente de la représentation compacte: {bank_name}") from None
+
+    def array(self, label, rows=slice(None)):
+        """Tableau (banque × période) d'une série stockée ou d'un écart calculé, pour les lignes rows"""
+        if label in self.spreads:
+            minuend, subtrahend = self.spreads[label]
+            return self.array(minuend, rows) - self.array(subtrahend, rows)
+        return self.values[self.labels.index(label), rows]
+
+    def series(self, bank_name, label):
+        return pd.Series(self.array(label, self._row(bank_name)), index=self.dates, name=f'{bank_name} {label}')
+
+    def frame(self):
+        """
+        Format long : index (Bank catégoriel, Date) dont les niveaux ne sont
+        stockés qu'une fois, une colonne float32 par série stockée (vues de
+        self.values, sans copie : modifier le DataFrame modifie le tableau)
+        """
+        n_banks, n_dates = len(self.banks), len(self.dates)
+        index = pd.MultiIndex(levels=[self.banks, self.dates],
+                              codes=[np.repeat(np.arange(n_banks), n_dates), np.tile(np.arange(n_dates), n_banks)],
+                              names=['Bank', 'Date'])
+        return pd.DataFrame({label: self.values[t].reshape(-1) for t, label in enumerate(self.labels)}, index=index,
+                            copy=False)
+
+    def bank_frame(self, bank_name):
+        """Vue large d'une banque (Date + « {banque} {série} »), écarts compris, pour l'écriture"""
+        b = self._row(bank_name)
+        columns = {'Date': self.dates}
+        for label in self.labels + tuple(self.spreads):
+            columns[f'{bank_name} {label}'] = self.array(label, b)
+        return pd.DataFrame(columns)
+
+    def wide_frame(self, labels):
+        """DataFrame comparatif (Date + « {banque} {série} » pour chaque banque et série demandée)"""
+        columns = {'Date': self.dates}
+        arrays = {label: self.array(label) for label in labels}
+        for b, bank_name in enumerate(self.banks):
+            for label in labels:
+                columns[f'{bank_name} {label}'] = arrays[label][b]
+        return pd.DataFrame(columns)
@@ -0,0 +1,66 @@
+"""
+Générateur aléatoire à compteur (Philox) : accès direct à n'importe quelle période
+
+Le tirage d'une période ne dépend que de la clé (graine maîtresse, banque,
+flux) et du numéro absolu de la période (ordinal de la fréquence, compté
+depuis 1970) : une tranche (banque, série, dates) se génère seule, dans
+n'importe quel ordre, et donne toujours les mêmes valeurs. Le coût est
+proportionnel à la tranche, jamais à l'historique ni au nombre de banques.
+"""
+import zlib
+
+import numpy as np
+import pandas as pd
+
+# Décalage des compteurs : reste positif pour les dates antérieures à 1970
+COUNTER_OFFSET = 1 << 40
+
+# Fréquences dont l'ordinal pandas est utilisé tel quel ; les autres comptent en jours
+PERIOD_ORDINAL_FREQS = {'W': 'W', 'M': 'M', 'Q': 'Q', 'Y': 'Y', 'A': 'Y'}
+
+
+def stream_key(seed, *names):
+    """Clé Philox (2 × 64 bits) dérivée de la graine maîtresse et des noms (banque, flux)"""
+    spawn_key = tuple(zlib.crc32(name.encode('utf-8')) for name in names)
+    return np.random.SeedSequence(seed, spawn_key=spawn_key).generate_state(2, dtype=np.uint64)
+
+
+def period_ordinals(dates, freq):
+    """Numéros absolus des périodes : consécutifs pour des dates consécutives de la fréquence"""
+    dates = pd.DatetimeIndex(dates)
+    base = freq.lstrip('0123456789')[:1].upper()
+    if base == 'B':
+        return np.busday_count(np.datetime64('1970-01-01'), dates.values.astype('datetime64[D]'))
+    if base in PERIOD_ORDINAL_FREQS:
+        return dates.to_period(PERIOD_ORDINAL_FREQS[base]).asi8
+    return dates.values.astype('datetime64[D]').astype(np.int64)
+
+
+def counter_uniforms(key, ordinals, n_values):
+    """
+    Tirages uniformes [0, 1) (période × n_values) : chaque période lit ses
+    propres blocs Philox (compteur = ordinal). Seule la plage [min, max] des
+    ordinaux demandés est générée.
+    """
+    ordinals = np.asarray(ordinals, dtype=np.int64)
+    if ordinals.size == 0:
+        return np.empty((0, n_values))
+
+    blocks = -(-n_values // 4)  # Un bloc Philox = 4 entiers de 64 bits
+    first = int(ordinals.min())
+    n_periods = int(ordinals.max()) - first + 1
+
+    bit_generator = np.random.Philox(key=key, counter=(first + COUNTER_OFFSET) * blocks)
+    raw = bit_generator.random_raw(n_periods * blocks * 4).reshape(n_periods, blocks * 4)
+    return (raw[ordinals - first, :n_values] >> np.uint64(11)) * 2.0 ** -53
+
+
+def counter_normals(key, ordinals, n_values):
+    """Tirages normaux (période × n_values) : uniformes à compteur convertis par Box-Muller"""
+    pairs = -(-n_values // 2)
+    uniforms = counter_uniforms(key, ordinals, 2 * pairs)
+
+    radius = np.sqrt(-2.0 * np.log1p(-uniforms[:, 0::2]))
+    angle = 2.0 * np.pi * uniforms[:, 1::2]
+    normals = np.stack([radius * np.cos(angle), radius * np.sin(angle)], axis=-1)
+    return normals.reshape(len(uniforms), 2 * pairs)[:, :n_values]
@@ -0,0 +1,200 @@
+"""
+Noyau vectorisé des données financières simulées (Ru.py)
+
+Chaque indicateur est une ligne de FINANCIAL_METRICS : base (part des actifs,
+du PNB ou valeur absolue), croissance linéaire, écart-type du bruit et régime
+annuel (crise, fiscalité, réglementation). Les tendances et multiplicateurs
+sont des matrices (année × indicateur) calculées une fois par horizon ; une
+banque, ou un lot de banques, se simule en un seul tirage de bruit
+(… × année × indicateur) et quelques produits de tableaux.
+"""
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# Années de crise (crise financière, COVID-19)
+CRISIS_YEARS = (2008, 2009, 2020, 2021)
+
+# Régimes annuels : masque des années concernées
+YEAR_REGIMES = {
+    'crise': lambda years: np.isin(years, CRISIS_YEARS),
+    'crise_immobiliere': lambda years: np.isin(years, (2008, 2009)),
+    'covid': lambda years: np.isin(years, (2020, 2021)),
+    'fiscalite_2018': lambda years: years >= 2018,
+    'bale3_2014': lambda years: years >= 2014,
+    'bale3_2015': lambda years: years >= 2015,
+    'taux_bas_2015': lambda years: years >= 2015,
+}
+
+# (colonne, base de la configuration (None = valeur absolue), part de la base,
+#  croissance annuelle, écart-type du bruit, régime, multiplicateur du régime)
+FINANCIAL_METRICS = (
+    # Bilan
+    ('Total_Actifs', 'assets_base', 1.0, 0.048, 0.06, None, 1.0),
+    ('Fonds_Propres', 'assets_base', 0.085, 0.052, 0.05, None, 1.0),
+    ('Depots_Clients', 'assets_base', 0.65, 0.045, 0.04, None, 1.0),
+    ('Credits_Clients', 'assets_base', 0.58, 0.055, 0.07, None, 1.0),
+    # Compte de résultat
+    ('Produit_Net_Bancaire', 'revenue_base', 1.0, 0.048, 0.08, None, 1.0),
+    ('Resultat_Net', 'revenue_base', 0.22, 0.045, 0.12, 'crise', 0.75),
+    ('Charges_Exploitation', 'revenue_base', 0.62, 0.042, 0.05, None, 1.0),
+    ('Dotations_Provisions', 'revenue_base', 0.08, 0.035, 0.20, 'crise', 1.8),
+    ('Impots', 'revenue_base', 0.05, 0.04, 0.10, 'fiscalite_2018', 1.15),
+    # Rentabilité
+    ('ROE', None, 0.125, 0.002, 0.08, 'crise', 0.65),
+    ('ROA', None, 0.0085, 0.0015, 0.07, 'crise', 0.60),
+    ('Marge_Interet', None, 0.018, 0.0, 0.05, 'taux_bas_2015', 0.92),
+    ('Cout_Risque', None, 0.0040, 0.0, 0.15, 'crise', 2.5),
+    # Solidité
+    ('Ratio_CET1', None, 0.125, 0.008, 0.04, 'bale3_2014', 1.12),
+    ('Ratio_Liquidite', None, 1.15, 0.0, 0.03, 'bale3_2015', 1.08),
+    ('Ratio_Solvabilite', None, 0.145, 0.006, 0.04, 'bale3_2014', 1.10),
+    ('Creances_Douteuses', None, 0.032, -0.005, 0.12, 'crise', 1.9),
+    # Crédit par secteur (spécifique à la Réunion)
+    ('Credits_Particuliers', 'assets_base', 0.25, 0.05, 0.08, None, 1.0),
+    ('Credits_Entreprises', 'assets_base', 0.20, 0.048, 0.10, None, 1.0),
+    ('Credits_Immobilier', 'assets_base', 0.18, 0.052, 0.09, 'crise_immobiliere', 0.7),
+    ('Credits_Agriculture', 'assets_base', 0.06, 0.04, 0.11, None, 1.0),
+    ('Credits_Tourisme', 'assets_base', 0.05, 0.046, 0.13, 'covid', 0.6),
+    ('Credits_Commerce', 'assets_base', 0.04, 0.044, 0.10, None, 1.0),
+    ('Credits_EC', 'assets_base', 0.03, 0.08, 0.14, None, 1.0),
+)
+
+# Croissance selon le type de banque (remplace la croissance par défaut du tableau)
+TYPE_GROWTH = {
+    'Total_Actifs': {'cooperative': 0.065, 'mutualiste': 0.055},
+    'Produit_Net_Bancaire': {'cooperative': 0.058, 'mutualiste': 0.052},
+}
+
+# Pondération selon les spécialités : (spécialité, avec, sans)
+SPECIALITY_WEIGHTS = {
+    'Credits_Particuliers': ('particuliers', 1.4, 0.8),
+    'Credits_Entreprises': ('entreprises', 1.5, 0.9),
+    'Credits_Immobilier': ('immobilier', 1.6, 0.85),
+    'Credits_Agriculture': ('agriculture', 2.0, 0.7),
+    'Credits_Tourisme': ('tourisme', 1.8, 0.8),
+    'Credits_Commerce': ('commerce', 1.7, 0.9),
+}
+
+# Croissance comptée à partir d'une année donnée plutôt que de la première année
+GROWTH_ORIGINS = {'Credits_EC': 2015}
+
+FINANCIAL_COLUMNS = tuple(metric[0] for metric in FINANCIAL_METRICS)
+
+# Flux de l'exercice (somme des sous-périodes = total annuel) ; les autres
+# indicateurs sont des encours ou des ratios observés en fin de période
+FLOW_COLUMNS = ('Produit_Net_Bancaire', 'Resultat_Net', 'Charges_Exploitation', 'Dotations_Provisions', 'Impots')
+
+# Fréquences prises en charge : nombre de sous-périodes par année
+PERIODS_PER_YEAR = {'Y': 1, 'Q': 4, 'M': 12}
+
+
+class FinancialKernel:
+    """
+    Simulation matricielle des indicateurs sur un horizon d'années : temps
+    écoulé et multiplicateurs de régime (année × indicateur) précalculés,
+    paramètres par banque (base, croissance) en vecteurs (indicateur).
+    """
+    def __init__(self, years):
+        self.years = np.asarray(years, dtype=np.int64)
+        self.columns = FINANCIAL_COLUMNS
+        self.sigmas = np.array([metric[4] for metric in FINANCIAL_METRICS])
+
+        self.elapsed = self._elapsed(self.years)
+        # Temps écoulé l'année précédant l'horizon et masque des flux (découpage en sous-périodes)
+        self.elapsed_before = self._elapsed(self.years[:1] - 1)
+        self.flows = np.isin(self.columns, FLOW_COLUMNS)
+
+        # Multiplicateurs de régime, 1 hors des années concernées
+        masks = {name: regime(self.years) for name, regime in YEAR_REGIMES.items()}
+        self.regimes = np.ones_like(self.elapsed)
+        for m, (_, _, _, _, _, regime, multiplier) in enumerate(FINANCIAL_METRICS):
+            if regime is not None:
+                self.regimes[masks[regime], m] = multiplier
+
+    def _elapsed(self, years):
+        """Années écoulées depuis l'origine de la croissance de chaque indicateur (année × indicateur)"""
+        elapsed = np.empty((len(years), len(self.columns)))
+        for m, column in enumerate(self.columns):
+            if column in GROWTH_ORIGINS:
+                elapsed[:, m] = np.maximum(years - GROWTH_ORIGINS[column], 0)
+            else:
+                elapsed[:, m] = years - self.years[0]
+        return elapsed
+
+    def parameters(self, config):
+        """Vecteurs (base, croissance) d'une banque à partir de sa configuration financière"""
+        scale = np.empty(len(self.columns))
+        growth = np.empty(len(self.columns))
+        for m, (column, base, share, default_growth, _, _, _) in enumerate(FINANCIAL_METRICS):
+            scale[m] = share * (config[base] if base else 1.0)
+            if column in SPECIALITY_WEIGHTS:
+                speciality, weight, otherwise = SPECIALITY_WEIGHTS[column]
+                scale[m] *= weight if speciality in config['specialites'] else otherwise
+            growth[m] = TYPE_GROWTH.get(column, {}).get(config['type'], default_growth)
+        return scale, growth
+
+    def noise(self, rng, n_banks=None):
+        """Bruit multiplicatif N(1, σ) en un seul tirage : (année × indicateur) ou (banque × année × indicateur)"""
+        shape = (len(self.years), len(self.columns))
+        return 1.0 + self.sigmas * rng.standard_normal(shape if n_banks is None else (n_banks,) + shape)
+
+    def simulate(self, scale, growth, noise):
+        """
+        Valeurs simulées : base × (1 + croissance × temps écoulé) × régime × bruit.
+        scale et growth (…, indicateur) se diffusent sur noise (…, année × indicateur).
+        """
+        scale, growth = np.asarray(scale)[..., None, :], np.asarray(growth)[..., None, :]
+        return scale * (1.0 + growth * self.elapsed) * self.regimes * noise
+
+    def period_ends(self, periods):
+        """Dates de fin des sous-périodes (mois, trimestre ou année) de l'horizon, en arithmétique datetime64"""
+        months = 12 // periods
+        first = np.datetime64(f'{self.years[0]}-01', 'M')
+        starts = first + months * np.arange(1, len(self.years) * periods + 1)
+        return pd.DatetimeIndex(starts.astype('datetime64[D]') - np.timedelta64(1, 'D')).as_unit('ns')
+
+    def disaggregate(self, annual, growth, noise):
+        """
+        Découpe des valeurs annuelles (année × indicateur) en sous-périodes
+        (année × période × indicateur), avec noise (année × période × indicateur)
+        tiré de N(0, 1) :
+        - flux : parts de l'année ∝ tendance au milieu de la sous-période ×
+          bruit (σ / √périodes), normalisées, d'où une somme égale au total annuel ;
+        - encours et ratios : interpolation entre deux fins d'année et bruit en
+          pont brownien, nul en fin d'année où la valeur annuelle est retrouvée.
+        """
+        periods = noise.shape[-2]
+        ends = np.arange(1, periods + 1) / periods
+        middles = ends - 0.5 / periods
+        growth = np.asarray(growth)[..., None, None, :]
+        elapsed = self.elapsed[:, None, :]
+
+        # Flux : profil intra-annuel de la tendance, bruité puis normalisé
+        profile = 1.0 + growth * (elapsed - 1.0 + middles[:, None])
+        shares = profile * np.maximum(1.0 + self.sigmas / np.sqrt(periods) * noise, 1e-3)
+        flow_values = annual[..., None, :] * shares / shares.sum(axis=-2, keepdims=True)
+
+        # Encours et ratios : fin d'année précédente (extrapolée par la tendance avant la première année)
+        first = (annual[..., :1, :] * (1.0 + growth[..., 0, :] * self.elapsed_before)
+                 / (1.0 + growth[..., 0, :] * self.elapsed[:1]))
+        previous = np.concatenate([first, annual[..., :-1, :]], axis=-2)[..., None, :]
+        # Pont brownien sur l'année (variance σ² f (1 - f)) : trajectoire continue, nulle en fin d'année
+        fraction = ends[:, None]
+        walk = np.cumsum(noise, axis=-2) / np.sqrt(periods)
+        bridge = 1.0 + self.sigmas * (walk - fraction * walk[..., -1:, :])
+        stock_values = (previous + (annual[..., None, :] - previous) * fraction) * bridge
+
+        return np.where(self.flows, flow_values, stock_values)
+
+    def simulate_banks(self, configs, rng):
+        """Lot de banques (banque × année × indicateur) : paramètres empilés, un seul tirage de bruit"""
+        scales, growths = zip(*(self.parameters(config) for config in configs))
+        return self.simulate(np.stack(scales), np.stack(growths), self.noise(rng, len(configs)))
+
+
+@lru_cache(maxsize=None)
+def horizon_kernel(start_year, end_year):
+    """Noyau partagé d'un horizon [start_year, end_year], construit une seule fois par processus"""
+    return FinancialKernel(np.arange(start_year, end_year + 1))
@@ -0,0 +1,184 @@
+"""
+Instrumentation légère des pipelines : étapes chronométrées, compteurs et mémoire
+
+Les étapes sont délimitées par span() (gestionnaire de contexte) ou @traced
+(décorateur). Désactivée, l'instrumentation se réduit à un test de booléen et
+au renvoi d'un contexte vide partagé. Activée, chaque étape est enregistrée
+(début, durée, thread, attributs) et peut être exportée en JSON ou au format
+Chrome trace (chrome://tracing, Perfetto).
+"""
+import functools
+import json
+import os
+import resource
+import sys
+import threading
+import time
+from collections import defaultdict
+
+
+def current_rss_mb():
+    """Mémoire résidente actuelle (Mo), ou None si /proc n'est pas disponible"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 ** 2
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def peak_rss_mb():
+    """Pic de mémoire résidente du processus (Mo)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer._record(self.name, self.start, time.perf_counter(), self.args)
+        return False
+
+
+class Tracer:
+    def __init__(self):
+        self.enabled = False
+        self.memory = False
+        self.reset()
+
+    def reset(self):
+        self.events = []
+        self.counters = defaultdict(float)
+        self.memory_samples = []
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def count(self, name, value=1):
+        if self.enabled:
+            with self._lock:
+                self.counters[name] += value
+
+    def _record(self, name, start, end, args):
+        event = {'name': name, 'start_s': start - self._origin, 'duration_s': end - start,
+                 'tid': threading.get_ident(), 'args': args}
+        if self.memory:
+            event['rss_mb'] = current_rss_mb()
+            event['peak_rss_mb'] = peak_rss_mb()
+        with self._lock:
+            self.events.append(event)
+            if self.memory:
+                self.memory_samples.append((end - self._origin, event['rss_mb'], event['peak_rss_mb']))
+
+    def summary(self):
+        """Agrégats par étape : nombre d'appels, temps total et maximal"""
+        stages = {}
+        for event in self.events:
+            stage = stages.setdefault(event['name'], {'calls': 0, 'total_s': 0.0, 'max_s': 0.0})
+            stage['calls'] += 1
+            stage['total_s'] += event['duration_s']
+            stage['max_s'] = max(stage['max_s'], event['duration_s'])
+        return stages
+
+    def export_json(self, path):
+        payload = {
+            'pid': os.getpid(),
+            'stages': self.summary(),
+            'counters': dict(self.counters),
+            'peak_rss_mb': peak_rss_mb(),
+            'events': self.events
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, indent=2, ensure_ascii=False, default=str)
+
+    def export_chrome_trace(self, path):
+        """Événements complets ('X') et courbe mémoire ('C') au format Trace Event"""
+        pid = os.getpid()
+        trace_events = [{
+            'name': event['name'], 'cat': event['name'].split('.')[0], 'ph': 'X', 'pid': pid,
+            'tid': event['tid'], 'ts': event['start_s'] * 1e6, 'dur': event['duration_s'] * 1e6,
+            'args': {key: str(value) for key, value in event['args'].items()}
+        } for event in self.events]
+        trace_events += [{
+            'name': 'memory', 'ph': 'C', 'pid': pid, 'ts': ts * 1e6,
+            'args': {'rss_mb': rss or 0.0, 'peak_rss_mb': peak}
+        } for ts, rss, peak in self.memory_samples]
+        payload = {'traceEvents': trace_events, 'displayTimeUnit': 'ms',
+                   'otherData': {'counters': dict(self.counters)}}
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False)
+
+    def export(self, path, format='chrome'):
+        if format == 'chrome':
+            self.export_chrome_trace(path)
+        else:
+            self.export_json(path)
+        print(f"🧭 Trace sauvegardée: {path}")
+
+    def print_report(self):
+        """Temps par étape, du plus coûteux au moins coûteux, et compteurs"""
+        print("\n⏱️  ÉTAPES DU PIPELINE:")
+        stages = sorted(self.summary().items(), key=lambda item: item[1]['total_s'], reverse=True)
+        for name, stage in stages:
+            print(f"  {name:<32} {stage['total_s'] * 1000:9.1f} ms  "
+                  f"({stage['calls']} appel(s), max {stage['max_s'] * 1000:.1f} ms)")
+        for name, value in sorted(self.counters.items()):
+            print(f"  #{name:<31} {value:g}")
+        if self.memory:
+            print(f"  Pic RSS: {peak_rss_mb():.1f} Mo")
+
+
+TRACER = Tracer()
+
+
+def enable(memory=True):
+    """Active l'instrumentation du processus courant (et repart de zéro)"""
+    TRACER.reset()
+    TRACER.memory = memory
+    TRACER.enabled = True
+    return TRACER
+
+
+def disable():
+    TRACER.enabled = False
+
+
+def span(name, **args):
+    """Délimite une étape : with span('rates.align', bank=bank_name): ..."""
+    if not TRACER.enabled:
+        return _NULL_SPAN
+    return _Span(TRACER, name, args)
+
+
+def count(name, value=1):
+    TRACER.count(name, value)
+
+
+def traced(name):
+    """Décorateur : enregistre chaque appel de la fonction comme une étape"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not TRACER.enabled:
+                return func(*args, **kwargs)
+            with _Span(TRACER, name, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,396 @@
+"""
+Service HTTP local (asyncio, aiohttp) d'interrogation des taux et des données financières
+
+Les jeux de données sont générés au premier accès (hors de la boucle
+d'événements, une seule fois même sous requêtes concurrentes), puis gardés en
+mémoire et indexés par date. Les réponses JSON sont mises en cache (LRU) avec
+un ETag : un client qui renvoie If-None-Match reçoit 304 sans corps.
+
+    GET /banks
+    GET /rates?bank=BNP&types=deposit,lending&start=2024-01&end=2024-03
+    GET /snapshot?date=2024-01-01&banks=BNP,BLR&types=deposit
+    GET /rankings?date=2024-01-01&type=lending&limit=5
+    GET /financials?bank=BNP&metrics=ROE,Ratio_CET1&start=2015&end=2020
+    GET /stats
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import time
+from collections import Counter, OrderedDict
+from urllib.parse import quote
+
+import numpy as np
+from aiohttp import web
+
+from bank_registry import BankRegistry, load_registry
+from Run import ReunionBanksInterestRates, RATE_TYPES, RATE_LABELS, STREAM_METRICS
+
+
+class QueryError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _normalize_label(label):
+    return label.strip().lower().replace('_', ' ')
+
+
+# Noms acceptés pour les séries : clés des types de taux ('corporate_deposit') ou libellés ('Retail Spread')
+SERIES_ALIASES = {_normalize_label(label): label for label in STREAM_METRICS}
+SERIES_ALIASES.update({_normalize_label(rate_type): RATE_LABELS[rate_type] for rate_type in RATE_TYPES})
+
+
+class QueryService:
+    def __init__(self, seed=0, start='2002-01-01', end='2025-12-31', freq='M', registry=None,
+                 max_responses=4096):
+        self.registry = registry or load_registry()
+        self.seed = seed
+        self.analyzer = ReunionBanksInterestRates(seed=seed, output='csv', start=start, end=end,
+                                                  freq=freq, registry=self.registry)
+        self.max_responses = max_responses
+
+        self._datasets = {}
+        self._pending = {}
+        self._responses = OrderedDict()
+        self.stats = Counter()
+
+    # Jeux de données en mémoire
+
+    async def _dataset(self, key, build):
+        """Jeu de données gardé en mémoire, généré une seule fois (dans un thread) au premier accès"""
+        if key in self._datasets:
+            return self._datasets[key]
+        future = self._pending.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().run_in_executor(None, build)
+            self._pending[key] = future
+            try:
+                self._datasets[key] = await future
+                self.stats['generated'] += 1
+            finally:
+                del self._pending[key]
+            return self._datasets[key]
+        return await future
+
+    async def rates(self):
+        """Taux de toutes les banques du registre (représentation compacte, index de dates trié)"""
+        return await self._dataset('rates', lambda: self.analyzer.compact_rates(self.registry.names))
+
+    async def financials(self, bank_name):
+        """Données financières annuelles d'une banque, indexées par année"""
+        def build():
+            from Ru import ReunionBankFinanceAnalyzer
+            analyzer = ReunionBankFinanceAnalyzer(bank_name, seed=self.seed, registry=self.registry)
+            return analyzer.generate_financial_data().set_index('Annee')
+        return await self._dataset(('financials', bank_name), build)
+
+    async def warm(self):
+        """Génère à l'avance les taux et les données financières de toutes les banques"""
+        await asyncio.gather(self.rates(), *[self.financials(bank_name) for bank_name in self.registry.finance_banks()])
+
+    # Paramètres
+
+    def _bank(self, name):
+        bank_name = self.registry.resolve(name or '')
+        if bank_name is None:
+            raise QueryError(404, f"Banque inconnue: {name}")
+        return bank_name
+
+    @staticmethod
+    def _series(types, default=None):
+        if not types:
+            return list(default or (RATE_LABELS[rate_type] for rate_type in RATE_TYPES))
+        labels = []
+        for name in types.split(','):
+            label = SERIES_ALIASES.get(_normalize_label(name))
+            if label is None:
+                raise QueryError(400, f"Série inconnue: {name} (disponibles: {', '.join(STREAM_METRICS)})")
+            labels.append(label)
+        return labels
+
+    @staticmethod
+    def _timestamp(value, side='start'):
+        try:
+            return ReunionBanksInterestRates._slice_bound(value, side)
+        except ValueError:
+            raise QueryError(400, f"Date invalide: {value}") from None
+
+    @staticmethod
+    def _int(value, name, default=None):
+        if value is None:
+            return default
+        try:
+            return int(value)
+        except ValueError:
+            raise QueryError(400, f"Entier attendu pour {name}: {value}") from None
+
+    @staticmethod
+    def _as_of_position(dates, value):
+        """Première date >= à la date demandée, la dernière au-delà de l'horizon (comme AsOfIndex)"""
+        return min(dates.searchsorted(QueryService._timestamp(value)), len(dates) - 1)
+
+    # Requêtes
+
+    async def query_banks(self, query):
+        return {'banks': [{'name': record['name'], 'aliases': record.get('aliases', []),
+                           'type': record['type'], 'finance': 'finance' in record}
+                          for record in self.registry.records]}
+
+    async def query_rates(self, query):
+        bank_name = self._bank(query.get('bank'))
+        labels = self._series(query.get('types'))
+        rates = await self.rates()
+        dates = rates.dates
+        first = dates.searchsorted(self._timestamp(query['start'])) if query.get('start') else 0
+        last = dates.searchsorted(self._timestamp(query['end'], 'end'), side='right') if query.get('end') else len(dates)
+        row = rates.banks.get_loc(bank_name)
+        return {
+            'bank': bank_name,
+            'dates': [str(date.date()) for date in dates[first:last]],
+            'series': {label: rates.array(label, row)[first:last].astype(float).round(6).tolist() for label in labels}
+        }
+
+    async def query_snapshot(self, query):
+        rates = await self.rates()
+        position = self._as_of_position(rates.dates, query.get('date', rates.dates[-1]))
+        bank_names = [self._bank(name) for name in query['banks'].split(',')] if query.get('banks') else list(rates.banks)
+        labels = self._series(query.get('types'))
+        rows = [rates.banks.get_loc(bank_name) for bank_name in bank_names]
+        return {
+            'date': str(rates.dates[position].date()),
+            'banks': {bank_name: {label: round(float(rates.array(label, row)[position]), 6) for label in labels}
+                      for bank_name, row in zip(bank_names, rows)}
+        }
+
+    async def query_rankings(self, query):
+        rates = await self.rates()
+        position = self._as_of_position(rates.dates, query.get('date', rates.dates[-1]))
+        label = self._series(query.get('type'), ['Deposit Rate'])[0]
+        order = query.get('order') or ('asc' if 'Lending' in label else 'desc')
+        if order not in ('asc', 'desc'):
+            raise QueryError(400, f"Ordre invalide: {order} (asc ou desc)")
+        limit = self._int(query.get('limit'), 'limit', len(rates.banks))
+
+        values = rates.array(label)[:, position]
+        ranking = np.argsort(values if order == 'asc' else -values, kind='stable')[:limit]
+        return {
+            'date': str(rates.dates[position].date()),
+            'series': label,
+            'order': order,
+            'ranking': [{'rank': i, 'bank': rates.banks[b], 'value': round(float(values[b]), 6)}
+                        for i, b in enumerate(ranking, 1)]
+        }
+
+    async def query_financials(self, query):
+        bank_name = self._bank(query.get('bank'))
+        df = await self.financials(bank_name)
+        metrics = query['metrics'].split(',') if query.get('metrics') else list(df.columns)
+        unknown = [metric for metric in metrics if metric not in df.columns]
+        if unknown:
+            raise QueryError(400, f"Métrique inconnue: {', '.join(unknown)} (disponibles: {', '.join(df.columns)})")
+        start = self._int(query.get('start'), 'start', int(df.index[0]))
+        end = self._int(query.get('end'), 'end', int(df.index[-1]))
+        rows = df.loc[start:end, metrics]
+        return {
+            'bank': bank_name,
+            'years': [int(year) for year in rows.index],
+            'metrics': {metric: rows[metric].astype(float).round(6).tolist() for metric in metrics}
+        }
+
+    async def query_stats(self, query):
+        return {'stats': dict(self.stats), 'datasets': len(self._datasets), 'cached_responses': len(self._responses)}
+
+    # HTTP
+
+    async def respond(self, request, query_function, cacheable=True):
+        """Réponse JSON depuis le cache (clé = chemin + paramètres triés), avec ETag et 304"""
+        self.stats['requests'] += 1
+        key = (request.path, tuple(sorted(request.query.items())))
+        cached = self._responses.get(key) if cacheable else None
+        if cached is not None:
+            self._responses.move_to_end(key)
+            self.stats['cache_hits'] += 1
+            body, etag = cached
+        else:
+            try:
+                payload = await query_function(request.query)
+            except QueryError as e:
+                self.stats['errors'] += 1
+                return web.json_response({'error': e.message}, status=e.status,
+                                         dumps=lambda payload: json.dumps(payload, ensure_ascii=False))
+            body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+            if cacheable:
+                self._responses[key] = (body, etag)
+                if len(self._responses) > self.max_responses:
+                    self._responses.popitem(last=False)
+
+        if request.headers.get('If-None-Match') == etag:
+            self.stats['not_modified'] += 1
+            return web.Response(status=304, headers={'ETag': etag})
+        return web.Response(body=body, content_type='application/json', charset='utf-8', headers={'ETag': etag})
+
+    def application(self):
+        app = web.Application()
+        routes = {
+            '/banks': self.query_banks,
+            '/rates': self.query_rates,
+            '/snapshot': self.query_snapshot,
+            '/rankings': self.query_rankings,
+            '/financials': self.query_financials
+        }
+        for path, query_function in routes.items():
+            app.router.add_get(path, self._handler(query_function))
+        app.router.add_get('/stats', self._handler(self.query_stats, cacheable=False))
+        return app
+
+    def _handler(self, query_function, cacheable=True):
+        """Gestionnaire aiohttp (coroutine) d'une requête"""
+        async def handler(request):
+            return await self.respond(request, query_function, cacheable)
+        return handler
+
+
+async def start_server(service, host='127.0.0.1', port=0):
+    """Démarre le service dans la boucle courante ; renvoie (runner, URL de base)"""
+    runner = web.AppRunner(service.application(), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    port = runner.addresses[0][1]
+    return runner, f"http://{host}:{port}"
+
+
+def default_load_paths(registry, years=range(2005, 2026, 4)):
+    """Mélange de requêtes représentatif : séries, instantanés, classements et données financières"""
+    paths = ['/banks']
+    for bank_name in registry.names:
+        alias = quote((registry.record(bank_name).get('aliases') or [bank_name])[0])
+        paths.append(f"/rates?bank={alias}&types=deposit,lending")
+        for year in years:
+            paths.append(f"/rates?bank={alias}&types=mortgage,retail_spread&start={year}&end={year}")
+    for year in years:
+        paths.append(f"/snapshot?date={year}-01-01")
+        paths.append(f"/rankings?date={year}-01-01&type=deposit&limit=5")
+        paths.append(f"/rankings?date={year}-01-01&type=lending&limit=5")
+    for bank_name in map(quote, registry.finance_banks()):
+        paths.append(f"/financials?bank={bank_name}&metrics=ROE,Ratio_CET1,Resultat_Net")
+        paths.append(f"/financials?bank={bank_name}&start=2015&end=2020")
+    return paths
+
+
+async def run_load_test(base_url, paths, clients=50, requests_per_client=40, revalidate=True, seed=0):
+    """
+    Clients concurrents tirant des requêtes au hasard dans paths. Chaque
+    client garde les ETag reçus et revalide (If-None-Match) si revalidate.
+    Renvoie les percentiles de latence, le débit et les statuts HTTP.
+    """
+    import aiohttp
+
+    latencies = []
+    statuses = Counter()
+
+    async def client(session, client_id):
+        rng = random.Random(seed * 100003 + client_id)
+        etags = {}
+        for _ in range(requests_per_client):
+            path = rng.choice(paths)
+            headers = {'If-None-Match': etags[path]} if revalidate and path in etags else {}
+            started = time.perf_counter()
+            async with session.get(base_url + path, headers=headers) as response:
+                await response.read()
+                if 'ETag' in response.headers:
+                    etags[path] = response.headers['ETag']
+                statuses[response.status] += 1
+            latencies.append(time.perf_counter() - started)
+
+    connector = aiohttp.TCPConnector(limit=clients)
+    started = time.perf_counter()
+    async with aiohttp.ClientSession(connector=connector) as session:
+        await asyncio.gather(*[client(session, client_id) for client_id in range(clients)])
+    elapsed = time.perf_counter() - started
+
+    latencies_ms = np.array(latencies) * 1000
+    latency = {f'p{q}': float(np.percentile(latencies_ms, q)) for q in (50, 90, 95, 99)}
+    latency.update({'max': float(latencies_ms.max()), 'mean': float(latencies_ms.mean())})
+    return {
+        'clients': clients,
+        'requests': len(latencies),
+        'elapsed_s': elapsed,
+        'throughput_rps': len(latencies) / elapsed,
+        'latency_ms': latency,
+        'statuses': {str(status): count for status, count in sorted(statuses.items())}
+    }
+
+
+def print_load_report(title, report):
+    latency = report['latency_ms']
+    print(f"\n{title}: {report['requests']} requêtes, {report['clients']} clients, "
+          f"{report['throughput_rps']:.0f} req/s")
+    print(f"  Latence: p50 {latency['p50']:.1f} ms, p90 {latency['p90']:.1f} ms, "
+          f"p99 {latency['p99']:.1f} ms, max {latency['max']:.1f} ms")
+    print(f"  Statuts: {', '.join(f'{status}×{count}' for status, count in report['statuses'].items())}")
+
+
+async def load_test(service, clients, requests_per_client, output=None):
+    """Serveur local et clients dans la même boucle : passe à froid (génération paresseuse) puis à chaud"""
+    runner, base_url = await start_server(service)
+    try:
+        paths = default_load_paths(service.registry)
+        print(f"🌐 Service de test: {base_url} ({len(paths)} requêtes distinctes)")
+        reports = {}
+        for phase, title in (('cold', '❄️  À froid'), ('warm', '🔥 À chaud')):
+            reports[phase] = await run_load_test(base_url, paths, clients, requests_per_client)
+            print_load_report(title, reports[phase])
+        print(f"\n📊 Service: {dict(service.stats)}")
+    finally:
+        await runner.cleanup()
+
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(reports, f, indent=2)
+        print(f"💾 Résultats sauvegardés: {output}")
+    return reports
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Service HTTP local des taux et données financières des banques de La Réunion")
+    parser.add_argument('command', choices=['serve', 'loadtest'])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--seed', type=int, default=0, help="Graine maîtresse des jeux de données servis")
+    parser.add_argument('--start', default='2002-01-01')
+    parser.add_argument('--end', default='2025-12-31')
+    parser.add_argument('--freq', default='M')
+    parser.add_argument('--banks-file', default=None,
+                        help="Registre des banques à utiliser à la place de data/banks.json")
+    parser.add_argument('--warm', action='store_true', help="Génère tous les jeux de données au démarrage")
+    parser.add_argument('--clients', type=int, default=50, help="Clients concurrents du test de charge")
+    parser.add_argument('--requests', type=int, default=40, help="Requêtes par client du test de charge")
+    parser.add_argument('--output', default=None, help="Résultats du test de charge (JSON)")
+    args = parser.parse_args()
+
+    service = QueryService(seed=args.seed, start=args.start, end=args.end, freq=args.freq,
+                           registry=BankRegistry.load(args.banks_file) if args.banks_file else None)
+
+    if args.command == 'loadtest':
+        asyncio.run(load_test(service, args.clients, args.requests, args.output))
+        return
+
+    app = service.application()
+    if args.warm:
+        async def warm(app):
+            print("🔥 Préchargement des jeux de données...")
+            await service.warm()
+        app.on_startup.append(warm)
+    print(f"🌐 Service sur http://{args.host}:{args.port} (graine {args.seed}, fréquence {args.freq})")
+    web.run_app(app, host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
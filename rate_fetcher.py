@@ -0,0 +1,186 @@
+"""
+Récupération asynchrone des taux publiés sur les sites des banques de La Réunion
+
+Un client HTTP mutualisé (aiohttp) interroge tous les sites en parallèle avec
+une limite de connexions par hôte et un intervalle minimal entre deux requêtes
+vers le même hôte. Les pages sont revalidées par GET conditionnel
+(ETag / Last-Modified) à partir d'un cache local, puis analysées avec lxml.
+Les tests interrogent des pages de test servies en local (tests/conftest.py).
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import re
+import time
+from urllib.parse import urlsplit
+
+# Mots-clés repérant les taux de dépôt et de prêt dans le texte des pages
+DEPOSIT_KEYWORDS = ('livret', 'épargne', 'epargne', 'dépôt', 'depot')
+LENDING_KEYWORDS = ('prêt', 'pret', 'crédit', 'credit', 'immobilier')
+PERCENT_PATTERN = re.compile(r'(\d{1,2}(?:[.,]\d{1,3})?)\s*%')
+
+
+def parse_rates(html):
+    """
+    Extrait (taux de dépôt, taux de prêt) d'une page, ou None si introuvables.
+    Les attributs data-rate="deposit|lending" sont prioritaires sur la
+    recherche par mots-clés dans le texte.
+    """
+    from lxml import html as lxml_html
+
+    document = lxml_html.fromstring(html)
+    rates = {}
+
+    for element in document.xpath('//*[@data-rate]'):
+        value = _parse_percent(element.text_content())
+        if value is not None:
+            rates.setdefault(element.get('data-rate'), value)
+
+    if 'deposit' not in rates or 'lending' not in rates:
+        for text in document.xpath('//body//text()'):
+            lowered = text.lower()
+            value = _parse_percent(text)
+            if value is None:
+                continue
+            if 'deposit' not in rates and any(keyword in lowered for keyword in DEPOSIT_KEYWORDS):
+                rates['deposit'] = value
+            elif 'lending' not in rates and any(keyword in lowered for keyword in LENDING_KEYWORDS):
+                rates['lending'] = value
+
+    if 'deposit' in rates and 'lending' in rates:
+        return rates['deposit'], rates['lending']
+    return None
+
+
+def _parse_percent(text):
+    """Premier pourcentage plausible (0-20 %) d'un texte"""
+    match = PERCENT_PATTERN.search(text)
+    if match is None:
+        return None
+    value = float(match.group(1).replace(',', '.'))
+    return value if 0 < value < 20 else None
+
+
+class ResponseCache:
+    """Cache local des pages : corps et validateurs (ETag, Last-Modified)"""
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, url):
+        return os.path.join(self.directory, hashlib.sha256(url.encode('utf-8')).hexdigest() + '.json')
+
+    def get(self, url):
+        try:
+            with open(self._path(url), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, url, body, etag=None, last_modified=None):
+        entry = {'url': url, 'body': body, 'etag': etag, 'last_modified': last_modified}
+        tmp_path = f"{self._path(url)}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, self._path(url))
+
+
+class HostRateLimiter:
+    """Impose un intervalle minimal entre deux requêtes vers un même hôte"""
+    def __init__(self, min_interval):
+        self.min_interval = min_interval
+        self._locks = {}
+        self._last_request = {}
+
+    async def wait(self, host):
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            elapsed = time.monotonic() - self._last_request.get(host, float('-inf'))
+            if elapsed < self.min_interval:
+                await asyncio.sleep(self.min_interval - elapsed)
+            self._last_request[host] = time.monotonic()
+
+
+class LiveRateFetcher:
+    def __init__(self, headers=None, cache_dir='.cache_banques/http', max_connections=20,
+                 per_host=2, min_interval=0.5, timeout=10):
+        self.headers = headers or {}
+        self.cache = ResponseCache(cache_dir)
+        self.max_connections = max_connections
+        self.per_host = per_host
+        self.limiter = HostRateLimiter(min_interval)
+        self.timeout = timeout
+
+        self.stats = {'fetched': 0, 'not_modified': 0, 'fallback': 0}
+
+    async def fetch_page(self, session, url):
+        """GET conditionnel : renvoie le corps, à jour ou revalidé depuis le cache"""
+        cached = self.cache.get(url)
+        headers = {}
+        if cached is not None:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+
+        await self.limiter.wait(urlsplit(url).netloc)
+        async with session.get(url, headers=headers) as response:
+            if response.status == 304 and cached is not None:
+                self.stats['not_modified'] += 1
+                return cached['body']
+            response.raise_for_status()
+            body = await response.text()
+
+        self.stats['fetched'] += 1
+        self.cache.put(url, body, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+        return body
+
+    async def fetch_bank_rates(self, session, bank_name, url, fallback):
+        """(dépôt, prêt, source) d'une banque ; repli sur la simulation en cas d'échec"""
+        try:
+            if not url:
+                raise ValueError("pas de site web")
+            rates = parse_rates(await self.fetch_page(session, url))
+            if rates is None:
+                raise ValueError("taux introuvables dans la page")
+            return rates[0], rates[1], 'live'
+        except Exception as e:
+            print(f"❌ Erreur taux en ligne {bank_name}: {e}")
+            self.stats['fallback'] += 1
+            deposit_rate, lending_rate = fallback(bank_name)
+            return deposit_rate, lending_rate, 'simulation'
+
+    async def fetch_all(self, urls, fallback):
+        """Récupère toutes les banques en parallèle : {banque: (dépôt, prêt, source)}"""
+        import aiohttp
+
+        connector = aiohttp.TCPConnector(limit=self.max_connections, limit_per_host=self.per_host)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=self.headers) as session:
+            results = await asyncio.gather(*[
+                self.fetch_bank_rates(session, bank_name, url, fallback)
+                for bank_name, url in urls.items()
+            ])
+        return dict(zip(urls.keys(), results))
+
+    def refresh(self, urls, fallback):
+        """Version synchrone de fetch_all"""
+        return asyncio.run(self.fetch_all(urls, fallback))
+
+
+def main():
+    from Run import ReunionBanksInterestRates
+
+    parser = argparse.ArgumentParser(description="Récupération des taux en ligne des banques de La Réunion")
+    parser.add_argument('--cache-dir', default='.cache_banques/http')
+    args = parser.parse_args()
+
+    results = ReunionBanksInterestRates().refresh_live_rates(cache_dir=args.cache_dir)
+    for bank_name, (deposit_rate, lending_rate, source) in results.items():
+        print(f"  {bank_name}: Dépôt {deposit_rate:.2f}%, Prêt {lending_rate:.2f}% ({source})")
+
+
+if __name__ == "__main__":
+    main()
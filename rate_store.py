@@ -0,0 +1,170 @@
+"""
+Stockage colonnaire partitionné des séries des banques de La Réunion
+
+Format long (date, banque, type de série, valeur) partitionné par banque et
+par année (partitionnement « hive »). Les filtres sur la banque et l'année
+éliminent les fichiers sans les lire, les autres filtres et la projection des
+colonnes sont appliqués à la lecture. Le format Arrow IPC est lu en mémoire
+projetée (mmap), sans copie lorsque les types le permettent.
+"""
+import os
+import uuid
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+from pyarrow import fs
+
+PARTITIONING = ds.partitioning(pa.schema([('bank', pa.string()), ('year', pa.int32())]), flavor='hive')
+
+
+class RateStore:
+    def __init__(self, root='donnees_banques', format='ipc', series_column='rate_type'):
+        self.root = root
+        self.format = format
+        self.series_column = series_column
+        self.filesystem = fs.LocalFileSystem(use_mmap=True)
+
+    def write_bank_frame(self, df, bank_name, mode='overwrite'):
+        """
+        Écrit un DataFrame large d'une banque (colonne Date + colonnes
+        « {banque} {série} ») au format long. En mode 'overwrite' les
+        partitions existantes de la banque sont remplacées ; en mode 'append'
+        les lignes sont ajoutées dans de nouveaux fichiers de partition.
+        """
+        if mode == 'overwrite':
+            self.delete_bank(bank_name)
+
+        dates = pd.DatetimeIndex(df['Date'])
+        value_columns = [column for column in df.columns if column != 'Date']
+        prefix = f'{bank_name} '
+        series_names = [column[len(prefix):] if column.startswith(prefix) else column
+                        for column in value_columns]
+
+        n_dates, n_series = len(dates), len(value_columns)
+        values = df[value_columns].to_numpy(dtype=np.float64).T.ravel()
+        series = pa.DictionaryArray.from_arrays(
+            pa.array(np.repeat(np.arange(n_series, dtype=np.int32), n_dates)),
+            pa.array(series_names)
+        )
+        table = pa.Table.from_arrays([
+            pa.array(np.tile(dates.values.astype('datetime64[ns]'), n_series)),
+            pa.array(np.full(n_dates * n_series, bank_name, dtype=object), type=pa.string()),
+            pa.array(np.tile(dates.year.values.astype(np.int32), n_series)),
+            series,
+            pa.array(values)
+        ], names=['date', 'bank', 'year', self.series_column, 'value'])
+
+        ds.write_dataset(
+            table, self.root, format=self.format, partitioning=PARTITIONING,
+            basename_template=f"part-{uuid.uuid4().hex}-{{i}}.{self.format}",
+            existing_data_behavior='overwrite_or_ignore', filesystem=self.filesystem
+        )
+        return len(table)
+
+    def delete_bank(self, bank_name):
+        """Supprime tous les fichiers de partition d'une banque"""
+        dataset = self._dataset(bank_name)
+        if dataset is None:
+            return
+        for fragment in dataset.get_fragments():
+            os.remove(fragment.path)
+            # Retire les répertoires year=… puis bank=… devenus vides
+            year_dir = os.path.dirname(fragment.path)
+            for directory in (year_dir, os.path.dirname(year_dir)):
+                if os.path.isdir(directory) and not os.listdir(directory):
+                    os.rmdir(directory)
+
+    def read(self, banks=None, series=None, start=None, end=None, columns=None):
+        """
+        Lit le format long en ne chargeant que les partitions et colonnes utiles.
+        banks et series sont des listes de valeurs, start et end des dates incluses.
+        Les lignes sont triées par banque, série et date (parmi les colonnes
+        lues), quel que soit l'ordre des fichiers de partition.
+        """
+        dataset = self._dataset()
+        columns = columns or ['date', 'bank', self.series_column, 'value']
+        if dataset is None:
+            return pd.DataFrame(columns=columns)
+
+        table = dataset.to_table(columns=columns, filter=self._filter(banks, series, start, end))
+        return self._sorted(table).to_pandas(split_blocks=True, self_destruct=True)
+
+    def _sorted(self, table):
+        """
+        Table triée par banque, série et date : après un ajout ('append'), une
+        partition contient plusieurs fichiers lus dans l'ordre de leurs noms
+        aléatoires. La série (dictionnaire) est comparée sur ses libellés.
+        """
+        names = [name for name in ('bank', self.series_column, 'date') if name in table.column_names]
+        if not names or table.num_rows == 0:
+            return table
+        keys = pa.table({name: (table[name].cast(pa.string()) if pa.types.is_dictionary(table[name].type)
+                                else table[name]) for name in names})
+        return table.take(pc.sort_indices(keys, sort_keys=[(name, 'ascending') for name in names]))
+
+    def read_bank_frame(self, bank_name, start=None, end=None):
+        """Reconstitue le DataFrame large d'une banque (Date + « {banque} {série} »)"""
+        long = self.read(banks=[bank_name], start=start, end=end,
+                         columns=['date', self.series_column, 'value'])
+        wide = long.pivot_table(index='date', columns=self.series_column, values='value',
+                                aggfunc='last', observed=True)
+        wide.columns = [f'{bank_name} {series}' for series in wide.columns]
+        return wide.rename_axis('Date').reset_index()
+
+    def last_row(self, bank_name):
+        """(date, {série: valeur}) de la dernière date enregistrée pour une banque, ou None"""
+        dataset = self._dataset(bank_name)
+        if dataset is None:
+            return None
+
+        # Années connues d'après les chemins de partition ; seule la plus récente est lue
+        years = [ds.get_partition_keys(fragment.partition_expression)['year']
+                 for fragment in dataset.get_fragments()]
+        if not years:
+            return None
+        last_year = max(years)
+        table = dataset.to_table(columns=['date', self.series_column, 'value'],
+                                 filter=ds.field('year') == last_year)
+        rows = table.to_pandas()
+        last_date = rows['date'].max()
+        last = rows[rows['date'] == last_date]
+        return last_date, dict(zip(last[self.series_column].astype(str), last['value']))
+
+    def _dataset(self, bank_name=None):
+        """
+        Jeu de données complet, ou limité au répertoire d'une banque : les
+        fichiers des autres banques (éventuellement en cours d'écriture par
+        d'autres processus) ne sont alors pas ouverts.
+        """
+        path = self.root if bank_name is None else self._bank_dir(bank_name)
+        if not os.path.isdir(path):
+            return None
+        return ds.dataset(path, format=self.format, partitioning=PARTITIONING,
+                          partition_base_dir=self.root, filesystem=self.filesystem)
+
+    def _bank_dir(self, bank_name):
+        """Répertoire de partition d'une banque (valeur encodée comme par write_dataset)"""
+        return os.path.join(self.root, f"bank={quote(bank_name, safe='')}")
+
+    def _filter(self, banks, series, start, end):
+        """Expression de filtre : banque et année élaguent les partitions"""
+        expression = None
+
+        def combine(condition):
+            return condition if expression is None else expression & condition
+
+        if banks is not None:
+            expression = combine(ds.field('bank').isin(list(banks)))
+        if series is not None:
+            expression = combine(ds.field(self.series_column).isin(list(series)))
+        if start is not None:
+            start = pd.Timestamp(start)
+            expression = combine((ds.field('year') >= start.year) & (ds.field('date') >= pa.scalar(start, pa.timestamp('ns'))))
+        if end is not None:
+            end = pd.Timestamp(end)
+            expression = combine((ds.field('year') <= end.year) & (ds.field('date') <= pa.scalar(end, pa.timestamp('ns'))))
+        return expression
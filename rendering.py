@@ -0,0 +1,84 @@
+"""
+Rendu des figures : mode interactif ou mode batch sans affichage
+
+En mode headless le backend non interactif Agg est imposé et plt.show()
+n'est jamais appelé. Les figures indépendantes peuvent être rendues dans des
+processus séparés ; chaque rendu est chronométré (construction / export).
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from instrumentation import span
+
+
+class RenderOptions:
+    def __init__(self, headless=False, dpi=300, format='png', workers=1, output_dir='.'):
+        self.headless = headless
+        self.dpi = dpi
+        self.format = format
+        self.workers = workers
+        self.output_dir = output_dir
+
+
+def use_headless_backend():
+    """Impose le backend Agg (à appeler avant toute figure)"""
+    import matplotlib
+    matplotlib.use('Agg', force=True)
+
+
+def render_figure(builder, args, basename, options):
+    """Construit une figure, l'exporte et renvoie son chronométrage"""
+    if options.headless:
+        use_headless_backend()
+    import matplotlib.pyplot as plt
+
+    start = time.perf_counter()
+    with span('figure.build', figure=basename):
+        fig = builder(*args)
+    built = time.perf_counter()
+
+    path = os.path.normpath(os.path.join(options.output_dir, f"{basename}.{options.format}"))
+    with span('figure.save', figure=basename):
+        fig.savefig(path, dpi=options.dpi, format=options.format, bbox_inches='tight')
+    saved = time.perf_counter()
+
+    if options.headless:
+        plt.close(fig)
+    else:
+        plt.show()
+
+    return {'figure': basename, 'path': path, 'build_s': built - start, 'save_s': saved - built}
+
+
+def _render_worker(job):
+    builder, args, basename, options = job
+    return render_figure(builder, args, basename, options)
+
+
+def render_figures(jobs, options=None):
+    """
+    Rend une liste de figures (builder, args, nom de fichier sans extension).
+    Les figures sont réparties sur options.workers processus en mode headless.
+    """
+    options = options or RenderOptions()
+    os.makedirs(options.output_dir, exist_ok=True)
+
+    if options.headless and options.workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=min(options.workers, len(jobs))) as executor:
+            timings = list(executor.map(_render_worker, [(builder, args, basename, options)
+                                                         for builder, args, basename in jobs]))
+    else:
+        timings = [render_figure(builder, args, basename, options) for builder, args, basename in jobs]
+
+    print_render_report(timings)
+    return timings
+
+
+def print_render_report(timings):
+    """Rapport de temps par figure : construction et export (rastérisation)"""
+    print("\n⏱️  RENDU DES FIGURES:")
+    for timing in timings:
+        total = timing['build_s'] + timing['save_s']
+        print(f"  {timing['path']}: {total:.2f}s "
+              f"(construction {timing['build_s']:.2f}s, export {timing['save_s']:.2f}s)")
@@ -0,0 +1,154 @@
+"""
+Cache persistant des jeux de données générés (taux et données financières)
+
+Deux niveaux : un LRU en mémoire pour le processus courant et un répertoire
+sur disque (pickle binaire) borné en taille, dont les entrées les moins
+récemment utilisées sont supprimées en premier.
+"""
+import contextlib
+import copy
+import hashlib
+import os
+import pickle
+from collections import OrderedDict
+
+
+def source_version(*paths):
+    """
+    Empreinte courte du code source d'un ou plusieurs modules (le script et
+    ceux qui produisent ses valeurs), utilisée comme version du code
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()[:12]
+
+
+class ResultCache:
+    def __init__(self, directory='.cache_banques', max_memory_items=64, max_disk_bytes=512 * 1024 ** 2):
+        self.directory = directory
+        self.max_memory_items = max_memory_items
+        self.max_disk_bytes = max_disk_bytes
+
+        self._memory = OrderedDict()
+        self.hits_memory = 0
+        self.hits_disk = 0
+        self.misses = 0
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(bank, kind, start, end, params, seed, version):
+        """Clé (banque, type de jeu, période, paramètres, graine, version du code)"""
+        parts = repr((bank, kind, str(start), str(end), sorted(params.items()), seed, version))
+        return hashlib.sha256(parts.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """Renvoie la valeur en cache (copie) ou None"""
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self.hits_memory += 1
+            return copy.copy(self._memory[key])
+
+        path = self._path(key)
+        if path is not None and os.path.exists(path):
+            try:
+                with open(path, 'rb') as f:
+                    value = pickle.load(f)
+            except (OSError, pickle.UnpicklingError, EOFError):
+                # Entrée corrompue ou tronquée, peut-être déjà supprimée par un autre processus
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(path)
+            else:
+                with contextlib.suppress(FileNotFoundError):
+                    os.utime(path)  # Marque l'entrée comme récemment utilisée
+                self._remember(key, value)
+                self.hits_disk += 1
+                return copy.copy(value)
+
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        """Enregistre une valeur dans les deux niveaux"""
+        self._remember(key, value)
+
+        path = self._path(key)
+        if path is None:
+            return
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        self._evict_disk()
+
+    def get_or_compute(self, key, compute):
+        """Renvoie la valeur en cache, sinon la calcule et la met en cache"""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+            value = copy.copy(value)
+        return value
+
+    def stats(self):
+        """Compteurs de succès et d'échecs du cache"""
+        hits = self.hits_memory + self.hits_disk
+        total = hits + self.misses
+        return {
+            'hits_memory': self.hits_memory,
+            'hits_disk': self.hits_disk,
+            'misses': self.misses,
+            'hit_rate': hits / total if total else 0.0,
+            'memory_items': len(self._memory),
+            'disk_bytes': self._disk_usage()
+        }
+
+    def clear(self):
+        """Vide les deux niveaux du cache"""
+        self._memory.clear()
+        for path, _, _ in self._disk_entries():
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+
+    def _remember(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+
+    def _path(self, key):
+        if self.directory is None:
+            return None
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def _disk_entries(self):
+        """(chemin, taille, dernier accès) des entrées sur disque"""
+        if self.directory is None:
+            return []
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.pkl'):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((entry.path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _disk_usage(self):
+        return sum(size for _, size, _ in self._disk_entries())
+
+    def _evict_disk(self):
+        """Supprime les entrées les moins récemment utilisées au-delà de la taille maximale"""
+        entries = self._disk_entries()
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in sorted(entries, key=lambda entry: entry[2]):
+            if total <= self.max_disk_bytes:
+                break
+            # Un autre processus partageant le répertoire a pu la supprimer avant nous
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+            total -= size
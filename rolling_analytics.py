@@ -0,0 +1,115 @@
+"""
+Statistiques glissantes vectorisées sur toutes les banques à la fois
+
+Les séries sont des tableaux (..., période) : moyenne et écart-type glissants
+par sommes cumulées (une passe, quelle que soit la fenêtre), corrélations entre
+banques par fenêtres glissantes (vues à pas, sans copie) traitées par lots de
+taille bornée, et écart au médian inter-banques. Les premières fenêtre - 1
+périodes, incomplètes, valent NaN comme avec pandas.rolling.
+"""
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def _window_sums(values, window):
+    """Sommes sur les fenêtres [t - window + 1, t] le long du dernier axe, forme (..., période - window + 1)"""
+    cumulative = np.cumsum(values, axis=-1)
+    sums = cumulative[..., window - 1:].copy()
+    sums[..., 1:] -= cumulative[..., :-window]
+    return sums
+
+
+def _pad(result, window):
+    """Réaligne un résultat sur les périodes d'origine (NaN avant la première fenêtre complète)"""
+    padding = np.full(result.shape[:-1] + (window - 1,), np.nan)
+    return np.concatenate([padding, result], axis=-1)
+
+
+def rolling_mean(values, window):
+    """Moyenne glissante par différence de sommes cumulées"""
+    values = np.asarray(values, dtype=float)
+    if window > values.shape[-1]:
+        return np.full(values.shape, np.nan)
+    return _pad(_window_sums(values, window) / window, window)
+
+
+def rolling_std(values, window, ddof=1):
+    """
+    Écart-type glissant par sommes cumulées de x et x² ; les séries sont
+    centrées au préalable pour limiter les pertes de précision.
+    """
+    values = np.asarray(values, dtype=float)
+    if window > values.shape[-1] or window <= ddof:
+        return np.full(values.shape, np.nan)
+    centered = values - values.mean(axis=-1, keepdims=True)
+    sums = _window_sums(centered, window)
+    squares = _window_sums(centered ** 2, window)
+    variance = (squares - sums ** 2 / window) / (window - ddof)
+    return _pad(np.sqrt(np.maximum(variance, 0.0)), window)
+
+
+def rolling_volatility(values, window):
+    """Écart-type glissant des variations d'une période à l'autre (même longueur que values)"""
+    values = np.asarray(values, dtype=float)
+    volatility = rolling_std(np.diff(values, axis=-1), window)
+    return np.concatenate([np.full(values.shape[:-1] + (1,), np.nan), volatility], axis=-1)
+
+
+def window_ends(n_periods, window, step=1):
+    """Indices des dernières périodes des fenêtres évaluées, la dernière période toujours comprise"""
+    first = window - 1 + (n_periods - window) % step
+    return np.arange(first, n_periods, step)
+
+
+def iter_rolling_correlation(values, window, step=1, max_chunk_bytes=64 * 1024 ** 2):
+    """
+    Matrices de corrélation (banque × banque) glissantes d'un tableau
+    (banque × période), une fenêtre toutes les step périodes. Générateur de
+    lots (indices de fin de fenêtre, matrices fenêtre × banque × banque) dont
+    le volume reste sous max_chunk_bytes.
+    """
+    values = np.asarray(values, dtype=float)
+    n_banks, n_periods = values.shape
+    ends = window_ends(n_periods, window, step)
+    if len(ends) == 0:
+        return
+    # Vue (banque × fenêtre × période), sans copie
+    windows = sliding_window_view(values, window, axis=-1)[:, ends[0] - window + 1::step]
+
+    # Fenêtres centrées-réduites et matrices du lot coexistent
+    per_window = 8 * n_banks * (2 * window + n_banks)
+    chunk = max(1, max_chunk_bytes // per_window)
+    for start in range(0, len(ends), chunk):
+        block = windows[:, start:start + chunk].transpose(1, 0, 2)
+        centered = block - block.mean(axis=-1, keepdims=True)
+        norms = np.sqrt(np.einsum('wbp,wbp->wb', centered, centered))
+        centered /= np.where(norms > 0, norms, np.nan)[..., None]
+        yield ends[start:start + chunk], centered @ centered.transpose(0, 2, 1)
+
+
+def rolling_correlation(values, window, step=1, max_chunk_bytes=64 * 1024 ** 2):
+    """Toutes les matrices de iter_rolling_correlation en un tableau (fenêtre × banque × banque)"""
+    chunks = list(iter_rolling_correlation(values, window, step, max_chunk_bytes))
+    if not chunks:
+        n_banks = np.shape(values)[0]
+        return np.empty(0, dtype=np.intp), np.empty((0, n_banks, n_banks))
+    return np.concatenate([ends for ends, _ in chunks]), np.concatenate([matrices for _, matrices in chunks])
+
+
+def median_zscores(values, axis=0):
+    """
+    Écart de chaque banque au médian inter-banques, en écarts-types inter-banques
+    de la même période : (x - médiane) / σ le long de axis (l'axe des banques).
+    """
+    values = np.asarray(values, dtype=float)
+    median = np.median(values, axis=axis, keepdims=True)
+    dispersion = values.std(axis=axis, keepdims=True)
+    return (values - median) / np.where(dispersion > 0, dispersion, np.nan)
+
+
+def most_correlated_pairs(matrix, labels, top=5):
+    """Paires (banque, banque, corrélation) les plus corrélées d'une matrice"""
+    rows, columns = np.triu_indices(len(labels), k=1)
+    correlations = matrix[rows, columns]
+    order = np.argsort(-np.nan_to_num(correlations, nan=-np.inf))[:top]
+    return [(labels[rows[i]], labels[columns[i]], float(correlations[i])) for i in order]
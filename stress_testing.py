@@ -0,0 +1,234 @@
+"""
+Tests de résistance Monte Carlo vectorisés des données financières (Ru.py)
+
+Un scénario de stress a le format du scénario économique (événement, début,
+fin, colonne, multiplicateur) avec une colonne « scenario » en plus
+(data/scenarios_stress.csv) : chocs sur Resultat_Net, Dotations_Provisions,
+Cout_Risque et Creances_Douteuses sur une plage d'années. Chaque tirage
+redessine la trajectoire de toutes les banques (bruit du noyau financier) et
+l'intensité du choc, commune aux banques d'une même économie insulaire. Les
+chocs se propagent au résultat net, au ROE et aux ratios de fonds propres.
+Tirages × banques × années sont traités par lots de taille bornée.
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from bank_registry import BankRegistry, load_registry
+from banking_events import EventTable, load_events
+from financial_kernel import horizon_kernel
+
+DEFAULT_SCENARIOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'scenarios_stress.csv')
+
+# Seuils réglementaires : ratio minimal sous lequel un tirage est en brèche
+REGULATORY_THRESHOLDS = {'Ratio_CET1': 0.105, 'Ratio_Solvabilite': 0.13}
+
+# Indicateurs utilisés par la propagation des chocs
+STRESS_COLUMNS = ('Fonds_Propres', 'Credits_Clients', 'Resultat_Net', 'Dotations_Provisions', 'ROE',
+                  'Cout_Risque', 'Ratio_CET1', 'Ratio_Solvabilite', 'Creances_Douteuses')
+STRESS_INDEX = {column: c for c, column in enumerate(STRESS_COLUMNS)}
+
+# Les pertes supplémentaires réduisent l'impôt
+TAX_RATE = 0.25
+# Surpondération des créances douteuses dans les actifs pondérés (150 % au lieu de 100 %)
+NPL_RISK_WEIGHT_UPLIFT = 0.5
+
+
+def load_scenarios(path=DEFAULT_SCENARIOS):
+    """Scénarios {nom: EventTable} d'un fichier (scenario, evenement, debut, fin, colonne, multiplicateur)"""
+    table = pd.read_csv(path, encoding='utf-8')
+    if 'scenario' not in table.columns:
+        raise ValueError("Colonne manquante dans le fichier de scénarios: scenario")
+    return {name: EventTable(group) for name, group in table.groupby('scenario', sort=False)}
+
+
+def propagate_shocks(paths, multipliers):
+    """
+    Propage les chocs multiplicatifs à des trajectoires (… × année × indicateur
+    de STRESS_COLUMNS) :
+    - surcoût du risque = provisions supplémentaires + hausse du coût du risque
+      × encours de crédits, déduit du résultat net après impôt ;
+    - les écarts de résultat s'accumulent dans les fonds propres d'une année à l'autre ;
+    - la hausse des créances douteuses alourdit les actifs pondérés.
+    Renvoie les indicateurs stressés (… × année).
+    """
+    c = STRESS_INDEX
+    shocked = paths * multipliers
+    equity, loans = paths[..., c['Fonds_Propres']], paths[..., c['Credits_Clients']]
+
+    extra_cost = (shocked[..., c['Dotations_Provisions']] - paths[..., c['Dotations_Provisions']]
+                  + (shocked[..., c['Cout_Risque']] - paths[..., c['Cout_Risque']]) * loans)
+    net_income = shocked[..., c['Resultat_Net']] - extra_cost * (1.0 - TAX_RATE)
+    income_gap = net_income - paths[..., c['Resultat_Net']]
+    capital_hit = np.cumsum(income_gap, axis=-1)
+
+    # Actifs pondérés implicites (fonds propres / CET1), alourdis par les créances douteuses
+    risk_weighted = equity / paths[..., c['Ratio_CET1']]
+    stressed_weighted = risk_weighted + ((shocked[..., c['Creances_Douteuses']] - paths[..., c['Creances_Douteuses']])
+                                         * loans * NPL_RISK_WEIGHT_UPLIFT)
+    total_capital = paths[..., c['Ratio_Solvabilite']] * risk_weighted
+
+    return {
+        'Resultat_Net': net_income,
+        'ROE': paths[..., c['ROE']] + income_gap / equity,
+        'Ratio_CET1': (equity + capital_hit) / stressed_weighted,
+        'Ratio_Solvabilite': (total_capital + capital_hit) / stressed_weighted
+    }
+
+
+class StressEngine:
+    """
+    Trajectoires attendues (banque × année × indicateur) calculées une fois,
+    puis tirages Monte Carlo par lots : bruit (tirage × banque × année ×
+    indicateur) et intensité du choc (tirage), partagés par tous les scénarios.
+    """
+    def __init__(self, bank_names=None, registry=None, events=None, start_year=2002, end_year=2025, seed=None):
+        self.registry = registry or load_registry()
+        self.bank_names = ([self.registry.resolve(name) or name for name in bank_names] if bank_names
+                           else self.registry.finance_banks())
+        self.events = events or load_events()
+        self.years = np.arange(start_year, end_year + 1)
+        self.seed = seed
+
+        kernel = horizon_kernel(start_year, end_year)
+        columns = [kernel.columns.index(column) for column in STRESS_COLUMNS]
+        scales, growths = zip(*(kernel.parameters(self.registry.finance_config(bank_name))
+                                for bank_name in self.bank_names))
+        # Espérance du noyau (bruit = 1), tendances du scénario économique comprises
+        expected = kernel.simulate(np.stack(scales), np.stack(growths), 1.0)
+        expected = expected * self.events.multipliers(self.years, kernel.columns)
+        self.expected = expected[..., columns]
+        self.sigmas = kernel.sigmas[columns]
+
+    def _window(self, shock):
+        """Années évaluées : à partir de la première année choquée (tout l'horizon sans choc)"""
+        shocked_years = np.flatnonzero((shock != 1.0).any(axis=1))
+        first = shocked_years[0] if len(shocked_years) else 0
+        return np.arange(len(self.years)) >= first
+
+    def run(self, scenarios, n_draws=10000, thresholds=None, severity_sd=0.35, reference=True,
+            max_chunk_bytes=64 * 1024 ** 2):
+        """
+        Évalue les scénarios {nom: EventTable} sur n_draws tirages. Renvoie un
+        DataFrame (scénario, banque) : probabilités de passer sous chaque seuil
+        réglementaire et de perte sur la fenêtre du scénario, distribution du
+        CET1 minimal et ROE moyen stressé ; une ligne « Système » donne la
+        probabilité qu'au moins une banque soit en brèche dans le même tirage.
+        """
+        thresholds = thresholds or REGULATORY_THRESHOLDS
+        rng = np.random.default_rng(self.seed)
+        n_banks, n_years, n_columns = self.expected.shape
+
+        shocks = {name: scenario.multipliers(self.years, STRESS_COLUMNS) for name, scenario in scenarios.items()}
+        windows = {name: self._window(shock) for name, shock in shocks.items()}
+        first = min((window.argmax() for window in windows.values()), default=0)
+        if reference:
+            shocks = {'reference': np.ones((n_years, n_columns)), **shocks}
+            windows['reference'] = np.arange(n_years) >= first
+
+        # Avant la première année choquée rien n'est évalué ni cumulé : seules les années suivantes sont tirées
+        expected = self.expected[:, first:]
+        n_years = n_years - first
+        shocks = {name: shock[first:] for name, shock in shocks.items()}
+        evaluated = {name: window[first:] for name, window in windows.items()}
+
+        # Trajectoires, trajectoires choquées et indicateurs propagés coexistent
+        per_draw = 8 * n_banks * n_years * (2 * n_columns + 8)
+        chunk = max(1, max_chunk_bytes // per_draw)
+
+        stats = {name: {'breaches': {metric: np.zeros(n_banks) for metric in thresholds},
+                        'system': {metric: 0 for metric in thresholds},
+                        'losses': np.zeros(n_banks), 'roe': np.zeros(n_banks),
+                        'min_cet1': np.empty((n_draws, n_banks))} for name in shocks}
+
+        for start in range(0, n_draws, chunk):
+            size = min(chunk, n_draws - start)
+            paths = expected * (1.0 + self.sigmas * rng.standard_normal((size, n_banks, n_years, n_columns)))
+            severity = rng.lognormal(0.0, severity_sd, size=(size, 1, 1, 1))
+
+            for name, shock in shocks.items():
+                window, stat = evaluated[name], stats[name]
+                stressed = propagate_shocks(paths, 1.0 + (shock - 1.0) * severity)
+                for metric, threshold in thresholds.items():
+                    breached = (stressed[metric][..., window] < threshold).any(axis=-1)
+                    stat['breaches'][metric] += breached.sum(axis=0)
+                    stat['system'][metric] += int(breached.any(axis=1).sum())
+                stat['losses'] += (stressed['Resultat_Net'][..., window] < 0).any(axis=-1).sum(axis=0)
+                stat['roe'] += stressed['ROE'][..., window].mean(axis=-1).sum(axis=0)
+                stat['min_cet1'][start:start + size] = stressed['Ratio_CET1'][..., window].min(axis=-1)
+
+        rows = []
+        for name, stat in stats.items():
+            window_years = self.years[windows[name]]
+            common = {'Scenario': name, 'Annees': f"{window_years[0]}-{window_years[-1]}", 'Tirages': n_draws}
+            for b, bank_name in enumerate(self.bank_names):
+                row = dict(common, Banque=bank_name)
+                for metric, threshold in thresholds.items():
+                    row[f'P({metric} < {threshold:.1%})'] = stat['breaches'][metric][b] / n_draws
+                row['P(Perte)'] = stat['losses'][b] / n_draws
+                row['CET1_Min_Median'] = float(np.median(stat['min_cet1'][:, b]))
+                row['CET1_Min_P5'] = float(np.percentile(stat['min_cet1'][:, b], 5))
+                row['ROE_Moyen'] = stat['roe'][b] / n_draws
+                rows.append(row)
+            system = dict(common, Banque='Système (au moins une banque)')
+            for metric, threshold in thresholds.items():
+                system[f'P({metric} < {threshold:.1%})'] = stat['system'][metric] / n_draws
+            rows.append(system)
+        return pd.DataFrame(rows)
+
+
+def print_stress_report(results, thresholds=None):
+    """Probabilités de brèche par scénario et par banque"""
+    thresholds = thresholds or REGULATORY_THRESHOLDS
+    columns = [f'P({metric} < {threshold:.1%})' for metric, threshold in thresholds.items()] + ['P(Perte)']
+    print("\n🧪 TESTS DE RÉSISTANCE:")
+    for name, group in results.groupby('Scenario', sort=False):
+        print(f"\n  Scénario {name} ({group['Annees'].iloc[0]}, {group['Tirages'].iloc[0]} tirages):")
+        for _, row in group.iterrows():
+            probabilities = ', '.join(f"{column} {row[column]:.1%}" for column in columns if pd.notna(row.get(column)))
+            cet1 = f", CET1 min P5 {row['CET1_Min_P5']:.2%}" if pd.notna(row.get('CET1_Min_P5')) else ''
+            print(f"    {row['Banque']}: {probabilities}{cet1}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tests de résistance Monte Carlo des banques de La Réunion")
+    parser.add_argument('--banks', nargs='+', default=None, metavar='BANQUE',
+                        help="Banques (noms ou alias), par défaut toutes les banques configurées")
+    parser.add_argument('--draws', type=int, default=10000, help="Nombre de tirages Monte Carlo")
+    parser.add_argument('--seed', type=int, default=None, help="Graine des tirages")
+    parser.add_argument('--scenarios', default=DEFAULT_SCENARIOS,
+                        help="Fichier des scénarios de stress (scenario, evenement, debut, fin, colonne, multiplicateur)")
+    parser.add_argument('--events-file', default=None,
+                        help="Scénario d'événements à utiliser à la place de data/evenements_reunion.csv")
+    parser.add_argument('--banks-file', default=None,
+                        help="Registre des banques à utiliser à la place de data/banks.json")
+    parser.add_argument('--severity', type=float, default=0.35,
+                        help="Dispersion (log-normale) de l'intensité des chocs d'un tirage à l'autre")
+    parser.add_argument('--cet1-threshold', type=float, default=REGULATORY_THRESHOLDS['Ratio_CET1'])
+    parser.add_argument('--solvency-threshold', type=float, default=REGULATORY_THRESHOLDS['Ratio_Solvabilite'])
+    parser.add_argument('--chunk-mb', type=int, default=64, help="Volume maximal d'un lot de tirages (Mo)")
+    parser.add_argument('--output', default='stress_tests_reunion.csv', help="Résultats (CSV)")
+    args = parser.parse_args()
+
+    registry = BankRegistry.load(args.banks_file) if args.banks_file else load_registry()
+    events = EventTable.load(args.events_file) if args.events_file else load_events()
+    thresholds = {'Ratio_CET1': args.cet1_threshold, 'Ratio_Solvabilite': args.solvency_threshold}
+
+    engine = StressEngine(args.banks, registry=registry, events=events, seed=args.seed)
+    print(f"🧪 {args.draws} tirages × {len(engine.bank_names)} banques × {len(engine.years)} années")
+    start = time.perf_counter()
+    results = engine.run(load_scenarios(args.scenarios), args.draws, thresholds, severity_sd=args.severity,
+                         max_chunk_bytes=args.chunk_mb * 1024 ** 2)
+    elapsed = time.perf_counter() - start
+
+    print_stress_report(results, thresholds)
+    results.to_csv(args.output, index=False)
+    print(f"\n⏱️  Tests de résistance en {elapsed:.2f} s")
+    print(f"💾 Résultats sauvegardés: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
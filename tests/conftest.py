@@ -0,0 +1,96 @@
+"""
+Configuration commune des tests : les modules du dépôt (Run.py, Ru.py…) sont
+des modules de premier niveau, importés depuis la racine du dépôt, et les
+sites des banques sont remplacés par des serveurs HTTP locaux (FixtureServer).
+"""
+import hashlib
+import os
+import sys
+import threading
+import time
+from contextlib import ExitStack
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+class FixtureServer:
+    """
+    Serveur HTTP local servant des pages de test, avec ETag / Last-Modified,
+    réponses 304 et délai optionnel par page pour simuler des sites lents.
+    """
+    def __init__(self, pages, delays=None, host='127.0.0.1', port=0):
+        self.pages = pages
+        self.delays = delays or {}
+        self.requests = []
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests.append((self.path, self.headers.get('If-None-Match')))
+                time.sleep(server.delays.get(self.path, 0))
+                body = server.pages.get(self.path)
+                if body is None:
+                    self.send_error(404)
+                    return
+
+                payload = body.encode('utf-8')
+                etag = '"' + hashlib.sha1(payload).hexdigest() + '"'
+                if self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(payload)))
+                self.send_header('ETag', etag)
+                self.send_header('Last-Modified', formatdate(usegmt=True))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._thread = threading.Thread(target=self._httpd.serve_forever, kwargs={'poll_interval': 0.01}, daemon=True)
+
+    def url(self, path):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}{path}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+def bank_page(bank_name, deposit_rate, lending_rate):
+    """Page de test au format des pages de tarifs des banques"""
+    return (f"<html><head><title>{bank_name}</title></head><body>"
+            f"<h1>Nos taux - {bank_name}</h1>"
+            f"<p>Livret épargne : {deposit_rate:.2f} %</p>"
+            f"<p>Prêt immobilier 20 ans : {lending_rate:.2f} %</p>"
+            f"</body></html>")
+
+
+@pytest.fixture
+def fixture_page():
+    return bank_page
+
+
+@pytest.fixture
+def fixture_server():
+    """Démarre des serveurs de test (un hôte distinct par appel), arrêtés en fin de test"""
+    with ExitStack() as stack:
+        yield lambda pages, delays=None: stack.enter_context(FixtureServer(pages, delays))
@@ -0,0 +1,48 @@
+"""
+Garde-fou du démarrage rapide : un import de Run.py ou Ru.py dans un
+interpréteur neuf ne doit charger aucun module de graphiques ni de
+récupération web (benchmarks.LAZY_MODULES), et son temps d'import cumulé
+mesuré par python -X importtime doit tenir dans benchmarks.IMPORT_BUDGET_MS.
+"""
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks import IMPORT_BUDGET_MS, LAZY_MODULES, check_import_time, measure_import_time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def loaded_modules(module):
+    """Modules présents dans sys.modules après « import module » dans un processus neuf"""
+    code = f"import json, sys; import {module}; print(json.dumps(sorted(sys.modules)))"
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def eager_modules(names):
+    return [name for name in names if any(name == lazy or name.startswith(lazy + '.') for lazy in LAZY_MODULES)]
+
+
+@pytest.mark.parametrize('module', ['Run', 'Ru'])
+def test_import_loads_no_lazy_module(module):
+    eager = eager_modules(loaded_modules(module))
+    assert not eager, f"import {module} charge à tort: {', '.join(eager)}"
+
+
+@pytest.mark.parametrize('module', ['Run', 'Ru'])
+def test_import_time_within_budget(module):
+    cumulative = measure_import_time(module)
+    assert module in cumulative and 'numpy' in cumulative
+
+    eager = eager_modules(cumulative)
+    assert not eager, f"import {module} charge à tort: {', '.join(eager)}"
+    total_ms = cumulative[module] / 1000
+    assert total_ms <= IMPORT_BUDGET_MS, f"import {module}: {total_ms:.0f} ms (budget {IMPORT_BUDGET_MS} ms)"
+
+
+def test_check_import_time():
+    assert check_import_time() is True
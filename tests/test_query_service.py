@@ -0,0 +1,94 @@
+"""
+Service HTTP local : test de charge concurrent (statuts, revalidation ETag,
+percentiles de latence), génération unique des jeux de données sous requêtes
+concurrentes à froid et réponses d'erreur 4xx.
+"""
+import asyncio
+
+import aiohttp
+import pytest
+
+from query_service import QueryService, default_load_paths, run_load_test, start_server
+
+
+def serve(service, scenario):
+    """Exécute scenario(base_url) contre le service démarré sur un port libre"""
+    async def main():
+        runner, base_url = await start_server(service)
+        try:
+            return await scenario(base_url)
+        finally:
+            await runner.cleanup()
+    return asyncio.run(main())
+
+
+@pytest.fixture
+def service():
+    return QueryService(seed=0, end='2005-12-31')
+
+
+def test_load_test_many_clients(service):
+    paths = default_load_paths(service.registry)
+    report = serve(service, lambda base_url: run_load_test(base_url, paths, clients=20, requests_per_client=30))
+
+    assert report['requests'] == 20 * 30
+    assert not [status for status in report['statuses'] if status.startswith('5')]
+    assert report['statuses'].get('304', 0) > 0
+    assert service.stats['generated'] == len(service._datasets)
+    assert {'p50', 'p90', 'p95', 'p99', 'max', 'mean'} <= set(report['latency_ms'])
+    assert report['latency_ms']['p50'] <= report['latency_ms']['p99']
+
+
+def test_concurrent_cold_requests_build_dataset_once(service):
+    builds = []
+    compact_rates = service.analyzer.compact_rates
+
+    def counting_compact_rates(bank_names):
+        builds.append(bank_names)
+        return compact_rates(bank_names)
+    service.analyzer.compact_rates = counting_compact_rates
+
+    async def scenario(base_url):
+        async with aiohttp.ClientSession() as session:
+            async def get(path):
+                async with session.get(base_url + path) as response:
+                    return response.status
+            return await asyncio.gather(*[get(f'/snapshot?date=2003-0{month}-01') for month in range(1, 10)])
+
+    assert serve(service, scenario) == [200] * 9
+    assert len(builds) == 1
+    assert service.stats['generated'] == 1
+
+
+def test_if_none_match_returns_304(service):
+    async def scenario(base_url):
+        async with aiohttp.ClientSession() as session:
+            async with session.get(base_url + '/banks') as response:
+                etag = response.headers['ETag']
+            async with session.get(base_url + '/banks', headers={'If-None-Match': etag}) as response:
+                return response.status, await response.read(), response.headers['ETag']
+
+    status, body, etag = serve(service, scenario)
+    assert (status, body) == (304, b'')
+    assert etag.startswith('"')
+
+
+@pytest.mark.parametrize('path, status', [
+    ('/rates?bank=BNP&types=deposit,inconnu', 400),
+    ('/rates?bank=Banque%20inconnue', 404),
+    ('/rankings?type=lending&limit=cinq', 400),
+    ('/rankings?type=lending&order=haut', 400),
+    ('/snapshot?date=pas-une-date', 400),
+    ('/financials?bank=BNP&metrics=ROE,Inconnu', 400),
+])
+def test_error_responses(service, path, status):
+    async def scenario(base_url):
+        async with aiohttp.ClientSession() as session:
+            async with session.get(base_url + path) as response:
+                return response.status, response.content_type, await response.json()
+
+    response_status, content_type, payload = serve(service, scenario)
+    assert response_status == status
+    assert content_type == 'application/json'
+    assert set(payload) == {'error'} and payload['error']
+    assert service.stats['errors'] == 1
@@ -0,0 +1,92 @@
+"""
+Récupération des taux en ligne, hors réseau : analyse des pages, repli sur la
+simulation, revalidation ETag et requêtes parallèles contre des serveurs locaux.
+"""
+import time
+
+import aiohttp  # noqa: F401 (importé avant les mesures de durée)
+import pytest
+
+from rate_fetcher import LiveRateFetcher, parse_rates
+from Run import ReunionBanksInterestRates
+
+
+@pytest.fixture
+def reunion_banks():
+    return ReunionBanksInterestRates()
+
+
+def make_fetcher(tmp_path, min_interval=0.0):
+    return LiveRateFetcher(cache_dir=str(tmp_path / 'http'), min_interval=min_interval)
+
+
+def test_parse_rates_keywords(fixture_page):
+    assert parse_rates(fixture_page('BLR', 1.25, 3.9)) == (1.25, 3.9)
+
+
+def test_parse_rates_data_rate_has_priority():
+    html = ("<html><body><p>Livret épargne : 1,10 %</p><p>Prêt immobilier : 3,20 %</p>"
+            "<span data-rate='lending'>4,05 %</span><span data-rate='deposit'>2,50 %</span></body></html>")
+    assert parse_rates(html) == (2.5, 4.05)
+
+
+def test_parse_rates_completes_data_rate_with_keywords():
+    html = "<html><body><span data-rate='deposit'>2,00 %</span><p>Crédit auto : 5,5 %</p></body></html>"
+    assert parse_rates(html) == (2.0, 5.5)
+
+
+def test_parse_rates_without_rates():
+    assert parse_rates("<html><body><p>Nos agences sont ouvertes.</p></body></html>") is None
+
+
+def test_refresh_reads_live_rates(tmp_path, fixture_server, fixture_page, reunion_banks):
+    bank_name = next(iter(reunion_banks.banks))
+    server = fixture_server({'/taux': fixture_page(bank_name, 1.75, 4.1)})
+    fetcher = make_fetcher(tmp_path)
+
+    results = fetcher.refresh({bank_name: server.url('/taux')}, reunion_banks._simulated_bank_rates)
+    assert results == {bank_name: (1.75, 4.1, 'live')}
+    assert fetcher.stats == {'fetched': 1, 'not_modified': 0, 'fallback': 0}
+
+
+@pytest.mark.parametrize('case', ['404', 'illisible', 'sans_url'])
+def test_refresh_falls_back_to_simulation(tmp_path, fixture_server, reunion_banks, case):
+    bank_name = next(iter(reunion_banks.banks))
+    server = fixture_server({'/illisible': "<html><body><p>Page en maintenance</p></body></html>"})
+    url = {'404': server.url('/absente'), 'illisible': server.url('/illisible'), 'sans_url': None}[case]
+    fetcher = make_fetcher(tmp_path)
+
+    results = fetcher.refresh({bank_name: url}, reunion_banks._simulated_bank_rates)
+    assert results == {bank_name: (*reunion_banks._simulated_bank_rates(bank_name), 'simulation')}
+    assert fetcher.stats['fallback'] == 1
+
+
+def test_second_refresh_revalidates_with_etag(tmp_path, fixture_server, fixture_page, reunion_banks):
+    bank_name = next(iter(reunion_banks.banks))
+    server = fixture_server({'/taux': fixture_page(bank_name, 1.5, 3.8)})
+    urls = {bank_name: server.url('/taux')}
+
+    first = make_fetcher(tmp_path).refresh(urls, reunion_banks._simulated_bank_rates)
+    fetcher = make_fetcher(tmp_path)
+    second = fetcher.refresh(urls, reunion_banks._simulated_bank_rates)
+
+    assert first == second == {bank_name: (1.5, 3.8, 'live')}
+    assert fetcher.stats == {'fetched': 0, 'not_modified': 1, 'fallback': 0}
+    assert server.requests[0][1] is None and server.requests[1][1] is not None
+
+
+def test_refresh_fetches_banks_in_parallel(tmp_path, fixture_server, fixture_page, reunion_banks):
+    # Un serveur par banque : chaque site est un hôte distinct, comme en production
+    delays, urls = [], {}
+    for i, bank_name in enumerate(reunion_banks.banks):
+        delays.append(0.2 + 0.05 * i)
+        page = fixture_page(bank_name, *reunion_banks._simulated_bank_rates(bank_name))
+        urls[bank_name] = fixture_server({'/taux': page}, {'/taux': delays[-1]}).url('/taux')
+
+    started = time.perf_counter()
+    results = reunion_banks.refresh_live_rates(urls=urls, cache_dir=str(tmp_path / 'http'))
+    elapsed = time.perf_counter() - started
+
+    assert {source for _, _, source in results.values()} == {'live'}
+    # Durée de l'ordre du site le plus lent, loin de la somme des délais
+    assert max(delays) <= elapsed < max(delays) + 0.5 < sum(delays)
@@ -0,0 +1,31 @@
+"""
+Stockage partitionné : ordre des lignes lues après des ajouts successifs dans
+une même partition annuelle.
+"""
+import numpy as np
+import pandas as pd
+
+from rate_store import RateStore
+
+BANK = 'BNP Paribas Réunion'
+
+
+def bank_frame(dates):
+    values = np.arange(len(dates), dtype=float)
+    return pd.DataFrame({'Date': dates, f'{BANK} Deposit Rate': values, f'{BANK} Lending Rate': values + 2.0})
+
+
+def test_read_sorted_after_appends(tmp_path):
+    store = RateStore(str(tmp_path / 'store'))
+    dates = pd.date_range('2023-01-31', '2024-12-31', freq='M')
+    store.write_bank_frame(bank_frame(dates[:13]), BANK)
+    # Un fichier de partition par mois ajouté, tous dans year=2024
+    for month in range(13, len(dates)):
+        store.write_bank_frame(bank_frame(dates[month:month + 1]), BANK, mode='append')
+
+    rows = store.read(start='2024-01-01')
+    expected = pd.DataFrame({'rate_type': np.repeat(['Deposit Rate', 'Lending Rate'], 12),
+                             'date': np.tile(dates[12:], 2)})
+    assert rows['rate_type'].astype(str).tolist() == expected['rate_type'].tolist()
+    assert rows['date'].tolist() == expected['date'].tolist()
+    assert store.read(columns=['date', 'value'])['date'].is_monotonic_increasing
@@ -0,0 +1,74 @@
+"""
+Génération des taux (Run.py) : équivalence des exécutions parallèle et
+séquentielle à graine égale, sans effet de bord sur l'instance, données de
+repli reproductibles avec une graine, et mise à jour incrémentale identique
+à une génération complète (CSV et stockage partitionné).
+"""
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from Run import ReunionBanksInterestRates
+
+BANKS = ['Banque de La Réunion (BLR)', 'BNP Paribas Réunion', 'Crédit Agricole de La Réunion']
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def analyzer(seed=7, output='csv', end='2006-12-31', **kwargs):
+    return ReunionBanksInterestRates(seed=seed, output=output, end=end, **kwargs)
+
+
+def test_parallel_matches_serial(workdir):
+    serial = {bank_name: analyzer()._process_bank(bank_name)[0] for bank_name in BANKS}
+    parallel = analyzer()._process_banks_parallel(BANKS, max_workers=2)
+
+    assert list(parallel) == BANKS
+    for bank_name in BANKS:
+        assert_frame_equal(parallel[bank_name], serial[bank_name])
+
+
+def test_parallel_without_seed_leaves_instance_unseeded(workdir):
+    reunion_banks = analyzer(seed=None)
+    all_banks_data = reunion_banks._process_banks_parallel(BANKS[:2], max_workers=2)
+
+    assert reunion_banks.seed is None
+    assert set(all_banks_data) == set(BANKS[:2])
+    assert all(isinstance(bank_data, pd.DataFrame) and not bank_data.empty for bank_data in all_banks_data.values())
+
+
+def test_fallback_series_reproducible_with_seed(monkeypatch):
+    def failing_rate_frame(self, bank_name, rate_types):
+        raise RuntimeError("cube indisponible")
+    monkeypatch.setattr(ReunionBanksInterestRates, '_bank_rate_frame', failing_rate_frame)
+
+    def fallback_frames(seed):
+        reunion_banks = analyzer(seed=seed)
+        return [reunion_banks.get_historical_deposit_rates(BANKS[0]), reunion_banks.get_mortgage_rates(BANKS[0]),
+                reunion_banks.get_corporate_rates(BANKS[0])]
+
+    for first, second in zip(fallback_frames(7), fallback_frames(7)):
+        assert_frame_equal(first, second)
+    assert not fallback_frames(7)[0].equals(fallback_frames(8)[0])
+
+
+@pytest.mark.parametrize('output', ['csv', 'store'])
+def test_incremental_refresh_matches_full_run(workdir, output):
+    bank_name = BANKS[1]
+    store_dir = str(workdir / 'store')
+    analyzer(output=output, end='2024-06-30', store_dir=store_dir)._process_bank(bank_name)
+
+    refreshed, destination = analyzer(output=output, end='2025-12-31', store_dir=store_dir)._process_bank(
+        bank_name, incremental=True)
+    full = analyzer(output=output, end='2025-12-31', store_dir=str(workdir / 'full')).get_all_bank_rates(bank_name)
+
+    if output == 'csv':
+        # Le fichier de l'exécution précédente est complété puis renommé selon le nouvel horizon
+        assert destination == 'BNP_Paribas_Réunion_rates_2002_2025.csv'
+        assert sorted(path.name for path in workdir.glob('*.csv')) == [destination]
+        refreshed = pd.read_csv(destination, parse_dates=['Date'])
+    assert_frame_equal(refreshed[full.columns], full, check_exact=False, rtol=1e-10)